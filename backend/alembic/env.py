@@ -10,7 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 # Import models
 from app.database import Base
-from app.models import user, check_object, check_item, sync_log, system_config
+from app.models import user, check_object, check_item, sync_log, system_config, distributed_lock
 
 # this is the Alembic Config object
 config = context.config
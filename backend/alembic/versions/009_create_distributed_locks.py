@@ -0,0 +1,29 @@
+"""Create distributed_locks table
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'distributed_locks',
+        sa.Column('name', sa.String(100), primary_key=True),  # Lock name
+        sa.Column('owner', sa.String(200), nullable=False),  # host:pid:token of the holder
+        sa.Column('acquired_at', sa.TIMESTAMP, nullable=False),
+        sa.Column('expires_at', sa.TIMESTAMP, nullable=False),  # Lease end, renewed by heartbeat
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('distributed_locks')
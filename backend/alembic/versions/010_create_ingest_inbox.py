@@ -0,0 +1,39 @@
+"""Create ingest_inbox table
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingest_inbox',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('nonce', sa.String(100), nullable=False, unique=True),  # app_id:time:random_str of the push
+        sa.Column('payload', sa.Text, nullable=False),  # Raw biz JSON as received
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),  # 'pending', 'done', 'failed'
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('object_count', sa.Integer, nullable=True),
+        sa.Column('error_message', sa.Text, nullable=True),
+        sa.Column('received_at', sa.TIMESTAMP, nullable=False, server_default=func.now()),
+        sa.Column('processed_at', sa.TIMESTAMP, nullable=True),
+    )
+
+    # Pending rows are picked up oldest first
+    op.create_index('idx_ingest_inbox_status', 'ingest_inbox', ['status', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ingest_inbox_status', table_name='ingest_inbox')
+    op.drop_table('ingest_inbox')
@@ -0,0 +1,33 @@
+"""Add submit_payload_hash and submitted_at to check_objects
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SHA-256 of the feedback data last confirmed by the client API
+    op.add_column(
+        'check_objects',
+        sa.Column('submit_payload_hash', sa.String(64), nullable=True)
+    )
+
+    op.add_column(
+        'check_objects',
+        sa.Column('submitted_at', sa.TIMESTAMP, nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('check_objects', 'submitted_at')
+    op.drop_column('check_objects', 'submit_payload_hash')
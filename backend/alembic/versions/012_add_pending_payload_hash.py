@@ -0,0 +1,27 @@
+"""Add pending_payload_hash to check_objects
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SHA-256 of feedback data sent without a definite answer (e.g. timed out)
+    op.add_column(
+        'check_objects',
+        sa.Column('pending_payload_hash', sa.String(64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('check_objects', 'pending_payload_hash')
@@ -0,0 +1,202 @@
+"""
+Async Read API Endpoints
+Async variants of the read-heavy endpoints, served on the event loop with an
+AsyncSession instead of occupying threadpool workers:
+- GET /check-objects: Query filters, pagination
+- GET /check-objects/{id}: Detail retrieval
+- GET /sync/logs: Sync history with pagination
+- GET /reports/download/{check_no}: Download PDF report
+
+Included ahead of the sync routers when ASYNC_DB_ENABLED is set, so the same
+paths and response models are served; writes stay on the sync routers.
+"""
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+
+from app.api.check_objects import check_object_filters
+from app.api.deps import get_async_db, get_current_user_async
+from app.models.user import User
+from app.models.check_object import CheckObject
+from app.models.sync_log import SyncLog
+from app.schemas.check_object import (
+    CheckObjectList,
+    CheckObjectResponse,
+    CheckObjectDetailResponse,
+    CheckObjectItemResponse
+)
+from app.schemas.sync_log import SyncLogList, SyncLogResponse
+from app.services.file_service import FileService
+
+router = APIRouter()
+
+
+@router.get("/check-objects", response_model=CheckObjectList, tags=["check-objects"])
+async def get_check_objects(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    status: Optional[int] = None,
+    company: Optional[str] = None,
+    check_no: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    check_result: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get check objects with filters and pagination (async)
+
+    Same parameters and response as the sync endpoint in check_objects.py.
+    """
+    conditions = check_object_filters(
+        status=status,
+        company=company,
+        check_no=check_no,
+        start_date=start_date,
+        end_date=end_date,
+        check_result=check_result
+    )
+
+    total = await db.scalar(select(func.count(CheckObject.id)).where(*conditions))
+
+    # List rows do not include check items; skip loading them
+    result = await db.execute(
+        select(CheckObject)
+        .where(*conditions)
+        .options(noload(CheckObject.check_items))
+        .order_by(CheckObject.check_object_union_num.asc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+
+    items = [CheckObjectResponse.model_validate(obj) for obj in result.scalars().all()]
+
+    return CheckObjectList(
+        items=items,
+        total=total,
+        page=page,
+        page_size=page_size
+    )
+
+
+@router.get("/check-objects/{check_object_id}", response_model=CheckObjectDetailResponse, tags=["check-objects"])
+async def get_check_object_detail(
+    check_object_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get check object detail with check items (async)
+
+    Args:
+        check_object_id: ID of the check object
+    """
+    result = await db.execute(
+        select(CheckObject)
+        .options(selectinload(CheckObject.check_items))
+        .where(CheckObject.id == check_object_id)
+    )
+    check_object = result.scalars().first()
+
+    if not check_object:
+        raise HTTPException(status_code=404, detail="检测对象不存在")
+
+    check_items = [
+        CheckObjectItemResponse.model_validate(item)
+        for item in check_object.check_items if item.is_active
+    ]
+
+    response_data = CheckObjectDetailResponse.model_validate(check_object)
+    response_data.check_items = check_items
+
+    return response_data
+
+
+@router.get("/sync/logs", response_model=SyncLogList, tags=["sync"])
+async def get_sync_logs(
+    page: int = 1,
+    page_size: int = 20,
+    sync_type: Optional[str] = None,
+    status: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get sync logs with pagination and filters (async)
+
+    Args:
+        page: Page number (default: 1)
+        page_size: Items per page (default: 20)
+        sync_type: Filter by sync type ("manual" or "auto")
+        status: Filter by status ("success" or "error")
+    """
+    conditions = []
+    if sync_type:
+        conditions.append(SyncLog.sync_type == sync_type)
+    if status:
+        conditions.append(SyncLog.status == status)
+
+    total = await db.scalar(select(func.count(SyncLog.id)).where(*conditions))
+    result = await db.execute(
+        select(SyncLog)
+        .where(*conditions)
+        .order_by(SyncLog.start_time.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+
+    items = [SyncLogResponse.model_validate(log) for log in result.scalars().all()]
+
+    return SyncLogList(
+        items=items,
+        total=total,
+        page=page,
+        page_size=page_size
+    )
+
+
+@router.get("/reports/download/{check_no}", tags=["reports"])
+async def download_report(
+    check_no: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Download PDF report by check_no (async)
+
+    Args:
+        check_no: Check object number
+
+    Returns:
+        FileResponse with PDF file
+    """
+    result = await db.execute(
+        select(CheckObject.check_result_url)
+        .where(CheckObject.check_object_union_num == check_no)
+        .limit(1)
+    )
+    row = result.first()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail="检测对象不存在")
+
+    if not row.check_result_url:
+        raise HTTPException(status_code=404, detail="报告文件不存在")
+
+    # May extract the report from its month archive; keep disk I/O off the event loop
+    full_path = await run_in_threadpool(FileService().resolve_report_path, row.check_result_url)
+
+    if not full_path:
+        raise HTTPException(status_code=404, detail="报告文件未找到")
+
+    return FileResponse(
+        path=full_path,
+        filename=f"{check_no}_report.pdf",
+        media_type="application/pdf"
+    )
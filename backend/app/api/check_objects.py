@@ -4,14 +4,16 @@ T087, T088, T089: Implement check-objects endpoints
 - GET /check-objects: Query filters, pagination
 - GET /check-objects/{id}: Detail retrieval
 - PUT /check-objects/{id}: Update sample info
+- POST /check-objects/evaluate: Automatic result judgement of many samples
 """
-from typing import Optional
-from datetime import date
+from typing import List, Optional
+from datetime import date, datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import and_, or_
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_read_db, get_current_user
+from app.config import settings
 from app.models.user import User
 from app.models.check_object import CheckObject
 from app.models.check_item import CheckObjectItem
@@ -20,12 +22,59 @@ from app.schemas.check_object import (
     CheckObjectResponse,
     CheckObjectDetailResponse,
     CheckObjectUpdate,
-    CheckObjectItemResponse
+    CheckObjectItemResponse,
+    EvaluateRequest,
+    EvaluateResponse,
+    ItemJudgementResponse,
+    SampleJudgementResponse
 )
+from app.services.judgement_service import describe_rule, judge_items, sample_result
 
 router = APIRouter(prefix="/check-objects", tags=["check-objects"])
 
 
+def check_object_filters(
+    status: Optional[int] = None,
+    company: Optional[str] = None,
+    check_no: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    check_result: Optional[str] = None
+) -> List:
+    """
+    Build list filter conditions, shared by the sync and async list endpoints
+
+    Returns:
+        SQLAlchemy conditions for Query.filter(*conditions) or select().where(*conditions)
+    """
+    conditions = []
+
+    if status is not None:
+        conditions.append(CheckObject.status == status)
+
+    if company:
+        # Fuzzy search on company name
+        conditions.append(CheckObject.submission_person_company.ilike(f"%{company}%"))
+
+    if check_no:
+        # Exact match on check number
+        conditions.append(CheckObject.check_object_union_num == check_no)
+
+    if start_date:
+        conditions.append(CheckObject.check_start_time >= start_date)
+
+    if end_date:
+        # Include the entire end_date
+        end_datetime = datetime.combine(end_date, datetime.max.time())
+        conditions.append(CheckObject.check_start_time <= end_datetime)
+
+    # 需求2.3新增：检测结果筛选
+    if check_result:
+        conditions.append(CheckObject.check_result == check_result)
+
+    return conditions
+
+
 @router.get("", response_model=CheckObjectList)
 def get_check_objects(
     page: int = Query(1, ge=1),
@@ -36,7 +85,7 @@ def get_check_objects(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     check_result: Optional[str] = None,  # 需求2.3新增：检测结果筛选
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -56,32 +105,14 @@ def get_check_objects(
         end_date: Filter by sampling date end (采样结束时间)
         check_result: Filter by check result (合格/不合格) - 新增
     """
-    query = db.query(CheckObject)
-
-    # Apply filters
-    if status is not None:
-        query = query.filter(CheckObject.status == status)
-
-    if company:
-        # Fuzzy search on company name
-        query = query.filter(CheckObject.submission_person_company.ilike(f"%{company}%"))
-
-    if check_no:
-        # Exact match on check number
-        query = query.filter(CheckObject.check_object_union_num == check_no)
-
-    if start_date:
-        query = query.filter(CheckObject.check_start_time >= start_date)
-
-    if end_date:
-        # Include the entire end_date
-        from datetime import datetime, timedelta
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(CheckObject.check_start_time <= end_datetime)
-
-    # 需求2.3新增：检测结果筛选
-    if check_result:
-        query = query.filter(CheckObject.check_result == check_result)
+    query = db.query(CheckObject).filter(*check_object_filters(
+        status=status,
+        company=company,
+        check_no=check_no,
+        start_date=start_date,
+        end_date=end_date,
+        check_result=check_result
+    ))
 
     # Order by check_object_union_num ascending (检测编号升序)
     query = query.order_by(CheckObject.check_object_union_num.asc())
@@ -107,7 +138,7 @@ def get_check_objects(
 @router.get("/{check_object_id}", response_model=CheckObjectDetailResponse)
 def get_check_object_detail(
     check_object_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -127,7 +158,10 @@ def get_check_object_detail(
         raise HTTPException(status_code=404, detail="检测对象不存在")
 
     # Convert check items to response format using Pydantic's from_attributes
-    check_items = [CheckObjectItemResponse.model_validate(item) for item in check_object.check_items]
+    check_items = [
+        CheckObjectItemResponse.model_validate(item)
+        for item in check_object.check_items if item.is_active
+    ]
 
     # Convert check object to response format
     response_data = CheckObjectDetailResponse.model_validate(check_object)
@@ -279,3 +313,109 @@ def input_check_result(
     # Return updated detail
     return get_check_object_detail(check_object_id, db, current_user)
 
+
+def _conflicts(current: Optional[str], judged: Optional[str]) -> bool:
+    """Whether a stored (manual) result disagrees with the judged one"""
+    return judged is not None and bool(current and current.strip()) and current.strip() != judged
+
+
+def _fill_blank_results(check_object: CheckObject, items, item_judgements, check_result: Optional[str]):
+    """Write judged results into empty fields only, keeping manually entered values"""
+    for item, judgement in zip(items, item_judgements):
+        if judgement.result is not None and not (item.result and item.result.strip()):
+            item.result = judgement.result
+    if check_result is not None and not (check_object.check_result and check_object.check_result.strip()):
+        check_object.check_result = check_result
+        if not check_object.status:
+            check_object.status = 1
+
+
+@router.post("/evaluate", response_model=EvaluateResponse)
+def evaluate_check_results(
+    request: EvaluateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Judge item and sample results from the measured values
+
+    All items of the requested samples are judged in one batch against their
+    item_indicator/reference_value limits. With apply, determined results are
+    written into empty fields (item result, sample check_result, status
+    0 -> 1); existing values, undetermined results and submitted samples
+    (status 2) are left as they are. Stored values that disagree with the
+    judgement are reported as conflicts.
+
+    Args:
+        request: {"ids": [check object id, ...], "apply": bool}
+    """
+    if len(request.ids) > settings.JUDGEMENT_MAX_OBJECTS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"单次最多判定{settings.JUDGEMENT_MAX_OBJECTS}个检测对象"
+        )
+
+    check_objects = db.query(CheckObject).options(
+        selectinload(CheckObject.check_items)
+    ).filter(CheckObject.id.in_(request.ids)).order_by(CheckObject.id).all()
+    found = {check_object.id for check_object in check_objects}
+
+    items_by_object = [
+        [item for item in check_object.check_items if item.is_active]
+        for check_object in check_objects
+    ]
+    judgements = iter(judge_items([
+        (item.num, item.item_indicator, item.reference_value, item.detection_limit)
+        for items in items_by_object
+        for item in items
+    ]))
+
+    results = []
+    applied_count = 0
+    conflict_count = 0
+    for check_object, items in zip(check_objects, items_by_object):
+        item_judgements = [next(judgements) for _ in items]
+        check_result = sample_result([judgement.result for judgement in item_judgements])
+
+        # Built before applying, so current values are the stored ones
+        item_responses = [
+            ItemJudgementResponse(
+                id=item.id,
+                check_item_name=item.check_item_name,
+                num=item.num,
+                rule=describe_rule(judgement.rule),
+                result=judgement.result,
+                current_result=item.result,
+                conflict=_conflicts(item.result, judgement.result)
+            )
+            for item, judgement in zip(items, item_judgements)
+        ]
+        sample = SampleJudgementResponse(
+            id=check_object.id,
+            check_object_union_num=check_object.check_object_union_num,
+            status=check_object.status or 0,
+            check_result=check_result,
+            current_check_result=check_object.check_result,
+            conflict=_conflicts(check_object.check_result, check_result),
+            items=item_responses
+        )
+        if sample.conflict or any(item.conflict for item in item_responses):
+            conflict_count += 1
+
+        if request.apply and check_object.status != 2:
+            _fill_blank_results(check_object, items, item_judgements, check_result)
+            sample.status = check_object.status or 0
+            sample.applied = True
+            applied_count += 1
+
+        results.append(sample)
+
+    if applied_count:
+        db.commit()
+
+    return EvaluateResponse(
+        results=results,
+        not_found=[check_object_id for check_object_id in request.ids if check_object_id not in found],
+        applied_count=applied_count,
+        conflict_count=conflict_count
+    )
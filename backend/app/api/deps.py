@@ -1,9 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterator, Optional
 
-from app.database import get_db
+from app.database import get_db, get_async_db, get_replica_router
 from app.models.user import User
 from app.utils.security import decode_access_token
 
@@ -11,6 +13,24 @@ from app.utils.security import decode_access_token
 security = HTTPBearer()
 
 
+def get_read_db(db: Session = Depends(get_db)) -> Iterator[Session]:
+    """
+    Dependency for read-only endpoints: a read replica session when one is
+    configured and within DB_REPLICA_MAX_LAG_SECONDS, otherwise the primary
+    session (shared with get_current_user for the request).
+    """
+    session_factory = get_replica_router().choose()
+    if session_factory is None:
+        yield db
+        return
+
+    replica_db = session_factory()
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -28,30 +48,55 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    credentials_exception = HTTPException(
+    username = _username_from_token(credentials.credentials)
+
+    # Query user from database
+    user = db.query(User).filter(User.username == username).first()
+    if user is None:
+        raise _credentials_exception()
+
+    return user
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Async variant of get_current_user for endpoints using get_async_db,
+    so authentication does not occupy a threadpool worker.
+    """
+    username = _username_from_token(credentials.credentials)
+
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
+    if user is None:
+        raise _credentials_exception()
+
+    return user
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    # Decode token
-    token = credentials.credentials
+
+def _username_from_token(token: str) -> str:
+    """Decode a bearer token and return its subject, raising 401 if invalid"""
     payload = decode_access_token(token)
 
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     # Get username from token
     username: Optional[str] = payload.get("sub")
     if username is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    # Query user from database
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
-
-    return user
+    return username
 
 
 def require_admin(current_user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,59 @@
+"""
+Push Ingest API Endpoint
+- POST /ingest/check/data: Check objects pushed by the client API (signed
+  with INGEST_SECRET over biz), stored in the inbox and written asynchronously
+"""
+from fastapi import APIRouter, Depends, Form, HTTPException
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.deps import get_db
+from app.config import settings
+from app.schemas.ingest import IngestResponse
+from app.services.ingest_service import (
+    InvalidPush,
+    enqueue_push,
+    get_inbox_worker,
+    pushed_objects,
+    verify_push_signature,
+)
+
+router = APIRouter(prefix="/ingest", tags=["ingest"])
+
+
+@router.post("/check/data", response_model=IngestResponse, status_code=202)
+def push_check_data(
+    app_id: str = Form(""),
+    time: str = Form(""),
+    random_str: str = Form(""),
+    sign: str = Form(""),
+    biz: str = Form("{}"),
+    db: Session = Depends(get_db)
+):
+    """
+    Receive check objects pushed by the client API
+
+    Form fields are those of the client API's /admin/api/test/check/data
+    request, signed as described in ingest_service.push_signature; biz
+    carries the objects as "list" (or "data.list", the response shape). The push is stored durably and
+    acknowledged with 202; the objects are written in the background.
+    Redelivering the same signed push is acknowledged without storing it twice.
+    """
+    if not settings.INGEST_WEBHOOK_ENABLED:
+        raise HTTPException(status_code=404, detail="推送接收未启用")
+
+    try:
+        verify_push_signature(app_id, time, random_str, biz, sign)
+        pushed_objects(biz)
+    except InvalidPush as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    row, duplicate = enqueue_push(db, app_id, time, random_str, biz)
+    if not duplicate:
+        get_inbox_worker().notify(sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind()))
+
+    return IngestResponse(
+        inbox_id=row.id,
+        status=row.status,
+        duplicate=duplicate,
+        message="重复推送,已忽略" if duplicate else "接收成功"
+    )
@@ -3,10 +3,10 @@ Reports API Endpoints
 T109: POST /reports/upload - Upload PDF report
 T110, T111: File size and format validation
 T141: GET /reports/download/{check_no} - Download PDF report
+GET /reports/preview/{check_no} - First-page thumbnail of PDF report
 T142-T144: POST /reports/export-excel - Export to Excel
 需求2.4: POST /reports/batch-download - Batch download PDF reports
 """
-import os
 import io
 import zipfile
 import logging
@@ -14,11 +14,13 @@ from typing import List, Optional
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Body
 from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_read_db, get_current_user
 from app.services.file_service import FileService
+from app.services.preview_service import get_preview_service
 from app.services.excel_service import ExcelExportService, generate_export_filename
 from app.models.user import User
 from app.models.check_object import CheckObject
@@ -117,12 +119,11 @@ async def download_report(
     if not check_object.check_result_url:
         raise HTTPException(status_code=404, detail="报告文件不存在")
 
-    # Convert URL to file path
+    # Convert URL to file path (extracts from the month archive if archived)
     file_service = FileService()
-    file_path = check_object.check_result_url.replace("/reports/", "")
-    full_path = os.path.join(file_service.reports_dir, file_path)
+    full_path = file_service.resolve_report_path(check_object.check_result_url)
 
-    if not os.path.exists(full_path):
+    if not full_path:
         raise HTTPException(status_code=404, detail="报告文件未找到")
 
     return FileResponse(
@@ -132,6 +133,54 @@ async def download_report(
     )
 
 
+@router.get("/preview/{check_no}")
+async def preview_report(
+    check_no: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get first-page thumbnail of a PDF report by check_no
+
+    Thumbnails are generated in the background on upload and cached;
+    a cache miss renders the thumbnail on demand.
+
+    Args:
+        check_no: Check object number
+
+    Returns:
+        PNG thumbnail with the page count in the X-Page-Count header
+    """
+    check_object = db.query(CheckObject).filter(
+        CheckObject.check_object_union_num == check_no
+    ).first()
+
+    if not check_object:
+        raise HTTPException(status_code=404, detail="检测对象不存在")
+
+    if not check_object.check_result_url:
+        raise HTTPException(status_code=404, detail="报告文件不存在")
+
+    full_path = await run_in_threadpool(
+        FileService().resolve_report_path, check_object.check_result_url
+    )
+    if not full_path:
+        raise HTTPException(status_code=404, detail="报告文件未找到")
+
+    preview = await run_in_threadpool(get_preview_service().get_preview, full_path)
+    if not preview or not preview["thumbnail_path"]:
+        raise HTTPException(status_code=404, detail="报告预览不可用")
+
+    return FileResponse(
+        path=preview["thumbnail_path"],
+        media_type="image/png",
+        headers={
+            "X-Page-Count": str(preview["page_count"]),
+            "Cache-Control": "private, max-age=86400",
+        }
+    )
+
+
 class ExcelExportRequest(BaseModel):
     """Request model for Excel export"""
     check_object_ids: Optional[List[int]] = None
@@ -158,7 +207,7 @@ class BatchDownloadRequest(BaseModel):
 @router.post("/export-excel")
 async def export_excel(
     request: ExcelExportRequest,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -266,7 +315,7 @@ async def export_excel(
 @router.post("/batch-download")
 async def batch_download_reports(
     request: BatchDownloadRequest,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -329,11 +378,10 @@ async def batch_download_reports(
         pdf_files = []
         for obj in check_objects:
             if obj.check_result_url:
-                # Convert URL to file path
-                file_path = obj.check_result_url.replace("/reports/", "")
-                full_path = os.path.join(file_service.reports_dir, file_path)
+                # Convert URL to file path (extracts from the month archive if archived)
+                full_path = file_service.resolve_report_path(obj.check_result_url)
 
-                if os.path.exists(full_path):
+                if full_path:
                     pdf_files.append({
                         "path": full_path,
                         "filename": f"{obj.check_object_union_num}_report.pdf"
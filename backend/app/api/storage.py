@@ -0,0 +1,34 @@
+"""
+Storage API Endpoints
+- GET /storage/usage: Report storage breakdown, growth rate and projection (admin)
+"""
+from fastapi import APIRouter, Depends
+
+from app.api.deps import require_admin
+from app.services.storage_service import get_storage_accounting
+from app.schemas.storage import StorageUsageResponse
+from app.models.user import User
+
+router = APIRouter(prefix="/storage", tags=["storage"])
+
+
+@router.get("/usage", response_model=StorageUsageResponse)
+def get_storage_usage(
+    refresh: bool = False,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get report storage usage per year/month
+
+    Served from the incremental storage ledger. Pass refresh=true to
+    re-measure the reports directory before answering.
+
+    Args:
+        refresh: Rescan the reports directory first (default: False)
+    """
+    accounting = get_storage_accounting()
+
+    if refresh:
+        accounting.rescan()
+
+    return StorageUsageResponse(**accounting.get_usage())
@@ -3,7 +3,8 @@ Submit API Endpoint
 T126, T127: POST /submit/{check_object_id}
 - Call SubmitService
 - Update status to 2
-- Handle errors
+- Handle errors (409 while the same object is being submitted, 428 when
+  resending a payload whose last send had an unknown outcome needs confirm)
 """
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
@@ -18,6 +19,7 @@ router = APIRouter(prefix="/submit", tags=["submit"])
 @router.post("/{check_object_id}")
 def submit_check_result(
     check_object_id: int,
+    confirm: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -27,6 +29,7 @@ def submit_check_result(
 
     Args:
         check_object_id: ID of check object to submit
+        confirm: Resend although the last send of this result timed out
 
     Returns:
         Success message or error
@@ -34,19 +37,23 @@ def submit_check_result(
     submit_service = SubmitService(db)
 
     try:
-        result = submit_service.submit_check_object(check_object_id)
+        result = submit_service.submit_check_object(check_object_id, confirm=confirm)
 
         if not result["success"]:
             # T127: Return error with client error message
-            raise HTTPException(
-                status_code=400,
-                detail=result["message"]
-            )
+            if result.get("in_progress"):
+                status_code = 409
+            elif result.get("needs_confirmation"):
+                status_code = 428
+            else:
+                status_code = 400
+            raise HTTPException(status_code=status_code, detail=result["message"])
 
         return {
             "success": True,
             "message": result["message"],
-            "check_object_id": check_object_id
+            "check_object_id": check_object_id,
+            "duplicate": result.get("duplicate", False)
         }
 
     except HTTPException:
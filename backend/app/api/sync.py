@@ -1,22 +1,38 @@
 """
 Sync API Endpoints
 T085, T086: Implement sync endpoints
-- POST /sync/fetch: Manual trigger
+- POST /sync/fetch: Manual trigger, queued as a background job
+- GET /sync/jobs/{id}: Job progress
+- GET /sync/jobs/{id}/events: Job progress as server-sent events
 - GET /sync/logs: Sync history with pagination
 """
-from typing import Optional
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_read_db, get_current_user
+from app.services.lock_service import lease_is_held
 from app.services.sync_service import SyncService
-from app.schemas.sync_log import SyncResponse, SyncLogList, SyncLogResponse
+from app.services.sync_job_service import get_sync_job_manager, log_progress
+from app.schemas.sync_log import SyncJobResponse, SyncJobStatus, SyncLogList, SyncLogResponse
+from app.models.sync_log import SyncLog
 from app.models.user import User
 
 router = APIRouter(prefix="/sync", tags=["sync"])
 
+# Server-sent events: poll interval and maximum stream duration
+EVENT_POLL_SECONDS = 1.0
+EVENT_STREAM_MAX_SECONDS = 3600
+# A running job not tracked by this process, with nobody holding the sync
+# lease for this long, is reported as interrupted (its process died)
+EVENT_STALE_JOB_SECONDS = 60
 
-@router.post("/fetch", response_model=SyncResponse)
+
+@router.post("/fetch", response_model=SyncJobResponse, status_code=202)
 def manual_sync(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -24,33 +40,122 @@ def manual_sync(
     """
     Trigger manual data synchronization
 
-    Fetches check objects from client API and updates local database.
-    Only one sync can run at a time.
+    Queues a background job that fetches check objects from client API and
+    updates local database, and returns its job id immediately. Progress is
+    available from GET /sync/jobs/{job_id}. Only one sync can run at a time.
     """
-    sync_service = SyncService(db)
-
     try:
-        result = sync_service.sync_data(sync_type="manual")
-
-        if result["status"] == "error" and "同步正在进行中" in result.get("message", ""):
-            raise HTTPException(
-                status_code=400,
-                detail="同步正在进行中,请稍后再试"
-            )
-
-        return SyncResponse(
-            status=result["status"],
-            fetched_count=result["fetched_count"],
-            new_count=result.get("new_count", 0),
-            updated_count=result.get("updated_count", 0),
-            message=result["message"]
+        job = get_sync_job_manager().submit(
+            sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind()),
+            sync_type="manual",
+            operator=current_user.username
         )
-
     except Exception as e:
         if "同步正在进行中" in str(e):
             raise HTTPException(status_code=400, detail=str(e))
         raise HTTPException(status_code=500, detail=f"同步失败: {str(e)}")
 
+    return SyncJobResponse(job_id=job.job_id, status=job.status, message="同步任务已提交")
+
+
+def _job_status(job_id: int, db: Session) -> SyncJobStatus:
+    progress = get_sync_job_manager().get(job_id)
+    if progress is not None:
+        return SyncJobStatus(**progress.snapshot())
+
+    # Job queued by another worker (or before a restart): report the SyncLog
+    db.expire_all()
+    log = db.get(SyncLog, job_id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="同步任务不存在")
+    return SyncJobStatus(**log_progress(log))
+
+
+@router.get("/jobs/{job_id}", response_model=SyncJobStatus)
+def get_sync_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get progress of a sync job
+
+    Returns pages fetched, rows upserted, rate and ETA while running, and the
+    final counts once finished.
+    """
+    return _job_status(job_id, db)
+
+
+def _poll_job(job_id: int, session_factory: Callable[[], Session]) -> Tuple[SyncJobStatus, bool]:
+    """
+    Job status read with a short-lived session
+
+    Returns:
+        (status, alive): alive is False for a running job that is neither
+        tracked by this process nor holding the sync lease anywhere
+    """
+    db = session_factory()
+    try:
+        status = _job_status(job_id, db)
+        alive = (
+            status.status != "running"
+            or get_sync_job_manager().get(job_id) is not None
+            or lease_is_held("sync", db)
+        )
+        return status, alive
+    finally:
+        db.close()
+
+
+@router.get("/jobs/{job_id}/events")
+def stream_sync_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream progress of a sync job as server-sent events
+
+    Emits a "progress" event whenever the progress changes and a final
+    "done" event when the job has finished, or as an error once it is found
+    interrupted. The stream waits on the event loop and reads the job with a
+    short-lived session per poll, so open streams hold no thread or
+    connection between polls.
+    """
+    # Fail with 404 before the stream starts
+    _job_status(job_id, db)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    db.close()
+
+    async def events() -> AsyncIterator[str]:
+        deadline = time.monotonic() + EVENT_STREAM_MAX_SECONDS
+        last = None
+        dead_since = None
+        while time.monotonic() < deadline:
+            status, alive = await run_in_threadpool(_poll_job, job_id, session_factory)
+
+            if alive:
+                dead_since = None
+            else:
+                dead_since = dead_since or time.monotonic()
+                if time.monotonic() - dead_since >= EVENT_STALE_JOB_SECONDS:
+                    status = status.model_copy(update={"status": "error", "message": "同步任务已中断"})
+
+            payload = status.model_dump_json()
+            if status.status in ("success", "error"):
+                yield f"event: done\ndata: {payload}\n\n"
+                return
+            if payload != last:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last = payload
+            await asyncio.sleep(EVENT_POLL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 @router.get("/logs", response_model=SyncLogList)
 def get_sync_logs(
@@ -58,7 +163,7 @@ def get_sync_logs(
     page_size: int = 20,
     sync_type: Optional[str] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
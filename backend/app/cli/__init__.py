@@ -0,0 +1,6 @@
+"""
+Operational command line tools, run with `python -m app.cli.<command>`
+
+- backfill: ingest a historical date range, resumable
+- replay: re-derive check objects from the raw upstream payload archive
+"""
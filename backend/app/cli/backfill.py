@@ -0,0 +1,113 @@
+"""
+Backfill check objects for an arbitrary sampling-time range
+
+Splits [--start, --end] into --window-days windows, fetches them with
+--workers concurrent requests under the client API rate limit (--rate
+requests per second for this process), and upserts them through the sync
+pipeline's batched writes. Finished windows are recorded in a checkpoint
+file; re-running the same command resumes with the unfinished windows.
+Holds the sync lock while running and is recorded as a "backfill" sync log.
+
+Usage:
+    python -m app.cli.backfill --start 2024-01-01 --end 2024-12-31 [--window-days 7]
+        [--workers 8] [--rate 10] [--page-size 500] [--checkpoint FILE] [--restart]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.client_api_service import reset_client_api_guards
+from app.services.sync_pipeline import WindowCheckpoint
+from app.services.sync_service import SyncProgress, SyncService
+
+logger = logging.getLogger("app.cli.backfill")
+
+
+def parse_time(value: str, end_of_day: bool = False) -> datetime:
+    """YYYY-MM-DD or YYYY-MM-DD HH:MM:SS; a bare --end date covers the whole day"""
+    if len(value) == 10:
+        day = datetime.strptime(value, "%Y-%m-%d")
+        return day.replace(hour=23, minute=59, second=59) if end_of_day else day
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+
+
+def report_progress(progress: SyncProgress, stop: threading.Event, interval: float):
+    while not stop.wait(interval):
+        snapshot = progress.snapshot()
+        logger.info(
+            f"{snapshot['processed_count']}/{snapshot['total'] or '?'} objects, "
+            f"{snapshot['rate_per_second']}/s, ETA {snapshot['eta_seconds']}s"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", required=True, help="first sampling time (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--end", help="last sampling time (default: end of today)")
+    parser.add_argument("--window-days", type=float, default=7, help="root window size in days")
+    parser.add_argument("--workers", type=int, default=settings.SYNC_FETCH_WORKERS, help="concurrent requests")
+    parser.add_argument(
+        "--rate", type=float, default=settings.CLIENT_API_RATE_LIMIT_PER_SECOND,
+        help="upstream requests per second (0 = unlimited)"
+    )
+    parser.add_argument("--page-size", type=int, default=settings.SYNC_PAGE_SIZE, help="objects requested per window")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: backfill-START-END.json)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--progress-interval", type=float, default=10, help="seconds between progress lines")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    start_time = parse_time(args.start)
+    end_time = parse_time(args.end, end_of_day=True) if args.end else datetime.now().replace(
+        hour=23, minute=59, second=59, microsecond=0
+    )
+    if end_time < start_time:
+        parser.error("--end is before --start")
+
+    checkpoint_path = args.checkpoint or f"backfill-{start_time:%Y%m%d%H%M%S}-{end_time:%Y%m%d%H%M%S}.json"
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = WindowCheckpoint(checkpoint_path)
+    if len(checkpoint):
+        logger.info(f"Resuming from {checkpoint_path}: {len(checkpoint)} windows already done")
+
+    # The limiter is shared by every request of this process
+    settings.CLIENT_API_RATE_LIMIT_PER_SECOND = args.rate
+    settings.CLIENT_API_RATE_LIMIT_BURST = max(args.workers, 1)
+    reset_client_api_guards()
+
+    progress = SyncProgress(sync_type="backfill")
+    stop = threading.Event()
+    reporter = threading.Thread(
+        target=report_progress, args=(progress, stop, args.progress_interval), daemon=True
+    )
+    reporter.start()
+
+    db = SessionLocal()
+    try:
+        result = SyncService(db).backfill(
+            start_time,
+            end_time,
+            window=timedelta(days=args.window_days),
+            fetch_workers=args.workers,
+            page_size=args.page_size,
+            checkpoint=checkpoint,
+            progress=progress
+        )
+    finally:
+        stop.set()
+        db.close()
+
+    result["checkpoint"] = checkpoint_path
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if result["status"] == "success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Replay archived upstream pages through the current parser
+
+Reprocesses raw check object pages kept in the payload archive
+(SYNC_ARCHIVE_PATH) with the current parse_check_object and the sync's
+batched upsert, making no client API calls. Use it after fixing a field
+mapping to re-derive stored data. Holds the sync lock while running, so it
+never overlaps a live sync, and is recorded as a "replay" sync log.
+
+Usage:
+    python -m app.cli.replay [--since 2025-06-01] [--until 2025-06-30] [--archive-dir DIR]
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import date
+
+from app.database import SessionLocal
+from app.services.payload_archive import PayloadArchive
+from app.services.sync_service import SyncService
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=date.fromisoformat, help="first fetch day to replay (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, help="last fetch day to replay (YYYY-MM-DD)")
+    parser.add_argument("--archive-dir", help="archive directory (default: SYNC_ARCHIVE_PATH)")
+    parser.add_argument("--list", action="store_true", help="only list the archive files that would be replayed")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    archive = PayloadArchive(args.archive_dir)
+
+    if args.list:
+        for path in archive.files(args.since, args.until):
+            print(path)
+        return 0
+
+    db = SessionLocal()
+    try:
+        result = SyncService(db).replay_archive(archive, since=args.since, until=args.until)
+    finally:
+        db.close()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if result["status"] == "success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,9 @@
-from fastapi import FastAPI
+import hmac
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -8,6 +11,8 @@ import logging
 
 from app.config import settings
 from app.middleware.performance import PerformanceMiddleware
+from app.utils.static_files import ReportStaticFiles
+from app.utils.metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE
 from app.middleware.error_handler import (
     http_exception_handler,
     validation_exception_handler,
@@ -38,6 +43,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Page-Count"],
 )
 
 # Add custom middleware
@@ -54,17 +60,23 @@ app.add_exception_handler(Exception, general_exception_handler)
 import os
 reports_dir = os.path.join(os.path.dirname(__file__), "uploads", "reports")
 if os.path.exists(reports_dir):
-    app.mount("/reports", StaticFiles(directory=reports_dir), name="reports")
+    app.mount("/reports", ReportStaticFiles(directory=reports_dir), name="reports")
 
 
 # API routes
-from app.api import auth, sync, check_objects, reports, submit
+from app.api import auth, sync, check_objects, reports, submit, storage, async_reads, ingest
+
+# Async read endpoints share paths with the sync routers, so they must be registered first
+if settings.ASYNC_DB_ENABLED:
+    app.include_router(async_reads.router, prefix="/api/v1")
 
 app.include_router(auth.router, prefix="/api/v1", tags=["Authentication"])
 app.include_router(sync.router, prefix="/api/v1", tags=["Data Sync"])
 app.include_router(check_objects.router, prefix="/api/v1", tags=["Check Objects"])
 app.include_router(reports.router, prefix="/api/v1", tags=["Reports"])
 app.include_router(submit.router, prefix="/api/v1", tags=["Submit Results"])
+app.include_router(storage.router, prefix="/api/v1", tags=["Storage"])
+app.include_router(ingest.router, prefix="/api/v1", tags=["Push Ingest"])
 
 
 @app.get("/")
@@ -83,6 +95,20 @@ async def health_check():
     return {"status": "healthy"}
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(authorization: Optional[str] = Header(None)):
+        """Prometheus metrics endpoint, requires METRICS_TOKEN as a bearer token"""
+        scheme, _, token = (authorization or "").partition(" ")
+        if not (
+            settings.METRICS_TOKEN
+            and scheme.lower() == "bearer"
+            and hmac.compare_digest(token.strip().encode(), settings.METRICS_TOKEN.encode())
+        ):
+            raise HTTPException(status_code=401, detail="未授权", headers={"WWW-Authenticate": "Bearer"})
+        return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
@@ -101,3 +127,6 @@ async def shutdown_event():
     # Stop APScheduler
     from app.tasks.scheduler import shutdown_scheduler
     shutdown_scheduler()
+    # Close async database connections
+    from app.database import dispose_async_engine
+    await dispose_async_engine()
@@ -1,50 +1,136 @@
 import time
 import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import REGISTRY, DEFAULT_SIZE_BUCKETS
+from app.utils.sql_instrumentation import QueryStats, current_query_stats, report_request_queries
 
 logger = logging.getLogger(__name__)
 
+# Requests slower than this are logged as warnings
+SLOW_REQUEST_MS = 500
+
+REQUEST_COUNT = REGISTRY.counter(
+    "http_requests_total",
+    "Total HTTP requests by method, route template and status code",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds by route template",
+    ["method", "route"],
+)
+RESPONSE_SIZE = REGISTRY.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size in bytes by route template",
+    ["method", "route"],
+    buckets=DEFAULT_SIZE_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = REGISTRY.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being processed",
+    ["method"],
+)
+
+
+def resolve_route_template(scope: Scope) -> str:
+    """
+    Get the matched route template for a request scope.
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
+    Templates such as /api/v1/check-objects/{check_object_id} keep metric
+    label cardinality bounded regardless of the concrete ids requested.
     """
-    Middleware to log request processing time and identify slow requests.
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path_format", None) or getattr(route, "path", "<unknown>")
+
+    # Mounted apps (e.g. /reports static files) set root_path to the mount prefix
+    if scope.get("endpoint") is not None and scope.get("root_path"):
+        return f"{scope['root_path']}/{{path}}"
+
+    return "<unmatched>"
+
+
+class PerformanceMiddleware:
     """
+    Pure ASGI middleware to log request processing time, identify slow
+    requests and record request metrics.
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """
-        Process request and log response time.
+    Unlike BaseHTTPMiddleware it wraps `send` directly, so response bodies
+    (including StreamingResponse exports) pass through without being
+    re-buffered and no extra task is spawned per request.
 
-        Args:
-            request: The incoming request
-            call_next: The next middleware or route handler
+    X-Process-Time is the time until response headers are sent; the logged
+    duration and latency histogram cover the full response body.
+    Server-Timing reports the queries executed before the headers were sent.
+    """
 
-        Returns:
-            The response from the route handler
-        """
-        start_time = time.time()
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        # Process request
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Calculate processing time
-        process_time = time.time() - start_time
-        process_time_ms = round(process_time * 1000, 2)
+        method = scope["method"]
+        start_time = time.perf_counter()
+        status_code = 500
+        response_bytes = 0
+        query_stats = QueryStats()
 
-        # Add custom header
-        response.headers["X-Process-Time"] = str(process_time_ms)
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_bytes
 
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time_ms = round((time.perf_counter() - start_time) * 1000, 2)
+
+                # Add custom header
+                headers = MutableHeaders(raw=list(message.get("headers", [])))
+                headers.append("X-Process-Time", str(process_time_ms))
+                headers.append(
+                    "Server-Timing",
+                    f'{query_stats.server_timing()}, app;dur={process_time_ms}'
+                )
+                message["headers"] = headers.raw
+
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc(method)
+        token = current_query_stats.set(query_stats)
+        try:
+            # Process request
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+
+            # Calculate processing time
+            process_time = time.perf_counter() - start_time
+            route = resolve_route_template(scope)
+
+            REQUESTS_IN_PROGRESS.dec(method)
+            REQUEST_COUNT.inc(method, route, status_code)
+            REQUEST_LATENCY.observe(method, route, value=process_time)
+            RESPONSE_SIZE.observe(method, route, value=response_bytes)
+            report_request_queries(query_stats, method, scope["path"], route)
+
+            self._log_request(method, scope["path"], round(process_time * 1000, 2))
+
+    @staticmethod
+    def _log_request(method: str, path: str, process_time_ms: float) -> None:
         # Log slow requests (>500ms)
-        if process_time_ms > 500:
+        if process_time_ms > SLOW_REQUEST_MS:
             logger.warning(
-                f"Slow request detected: {request.method} {request.url.path} "
+                f"Slow request detected: {method} {path} "
                 f"took {process_time_ms}ms"
             )
         else:
             logger.info(
-                f"{request.method} {request.url.path} "
+                f"{method} {path} "
                 f"completed in {process_time_ms}ms"
             )
-
-        return response
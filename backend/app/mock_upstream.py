@@ -0,0 +1,228 @@
+"""
+Mock upstream (client API) server for offline load testing
+
+Serves the two client API endpoints over HTTP from a seeded
+MockClientAPIService dataset:
+
+- POST /admin/api/test/check/data      读取待检测样品 (按采样时间筛选, 分页)
+- POST /admin/api/test/check/feedback  检测结果接收
+- GET  /mock/stats                     请求/错误/回传统计
+
+Requests are form encoded (app_id, time, random_str, sign, biz) and the
+MD5 signature is validated exactly like the real API, using
+CLIENT_APP_ID/CLIENT_SECRET unless overridden. Latency and error rates
+can be injected to exercise sync/submit retry paths.
+
+Usage:
+    python -m app.mock_upstream --port 9000 --objects 100000 --latency-ms 80 --error-rate 0.02
+
+Then point the backend at it:
+    API_BASE_URL=http://127.0.0.1:9000 USE_MOCK_CLIENT_API=false
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Form
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.services.mock_client_api import MockClientAPIService
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class MockUpstream:
+    """State of one mock upstream: dataset, fault injection and counters"""
+
+    def __init__(
+        self,
+        mock: MockClientAPIService,
+        app_id: Optional[str] = None,
+        secret: Optional[str] = None,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        max_limit: int = 1000,
+        seed: int = 0
+    ):
+        self.mock = mock
+        self.app_id = app_id or settings.CLIENT_APP_ID
+        self.secret = secret or settings.CLIENT_SECRET
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.max_limit = max_limit
+        self._rng = random.Random(seed)
+        self.feedback: Dict[str, Dict] = {}
+        self.stats = {
+            "data_requests": 0,
+            "feedback_requests": 0,
+            "injected_errors": 0,
+            "rejected_signatures": 0,
+        }
+
+    def expected_signature(self, app_id: str, time_value: str, random_str: str) -> str:
+        """Signature rule of the client API: md5(app_id&random_str&time&key)"""
+        sign_str = "&".join([app_id, random_str, str(time_value)]) + f"&{self.secret}"
+        return hashlib.md5(sign_str.encode("utf-8")).hexdigest()
+
+    def verify(self, app_id: str, time_value: str, random_str: str, sign: str) -> bool:
+        return app_id == self.app_id and sign == self.expected_signature(app_id, time_value, random_str)
+
+    def query(self, start_time: datetime, end_time: datetime, page: int, limit: int) -> Dict:
+        """One page of objects sampled within [start_time, end_time], oldest first"""
+        result = self.mock.query(start_time, end_time, page, limit)
+        return {
+            "count": result["count"],
+            "list": [self.mock.to_upstream_format(obj) for obj in result["list"]],
+        }
+
+    async def simulate_network(self) -> Optional[JSONResponse]:
+        """Sleep for the configured latency, then maybe return an injected error"""
+        if self.latency_ms or self.jitter_ms:
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            return JSONResponse(
+                status_code=self._rng.choice([500, 502, 503]),
+                content={"status": 500, "message": "模拟上游错误"}
+            )
+        return None
+
+    async def _admit(self, counter: str, app_id: str, time_value: str, random_str: str, sign: str):
+        """Count the request, inject faults and check its signature; a response to return early, if any"""
+        self.stats[counter] += 1
+        injected = await self.simulate_network()
+        if injected is not None:
+            return injected
+        if not self.verify(app_id, time_value, random_str, sign):
+            self.stats["rejected_signatures"] += 1
+            return _error(401, "签名错误")
+        return None
+
+    async def handle_data(self, app_id: str, time_value: str, random_str: str, sign: str, biz: str):
+        """读取待检测样品"""
+        rejected = await self._admit("data_requests", app_id, time_value, random_str, sign)
+        if rejected is not None:
+            return rejected
+
+        biz_data = _parse_biz(biz)
+        if biz_data is None:
+            return _error(400, "biz参数格式错误")
+
+        try:
+            start_time = datetime.strptime(biz_data.get("start_time", "1970-01-01 00:00:00"), DATETIME_FORMAT)
+            end_time = datetime.strptime(biz_data.get("end_time", "2999-12-31 23:59:59"), DATETIME_FORMAT)
+            page = max(1, int(biz_data.get("page", 1)))
+            limit = min(max(1, int(biz_data.get("limit", 50))), self.max_limit)
+        except (TypeError, ValueError):
+            return _error(400, "biz参数格式错误")
+
+        return {
+            "status": 200,
+            "message": "success",
+            "data": self.query(start_time, end_time, page, limit),
+        }
+
+    async def handle_feedback(self, app_id: str, time_value: str, random_str: str, sign: str, biz: str):
+        """检测结果接收"""
+        rejected = await self._admit("feedback_requests", app_id, time_value, random_str, sign)
+        if rejected is not None:
+            return rejected
+
+        biz_data = _parse_biz(biz)
+        goods = biz_data.get("goods") if biz_data else None
+        if not isinstance(goods, list) or not goods:
+            return _error(400, "goods不能为空")
+        if any(not isinstance(entry, dict) or not entry.get("check_no") for entry in goods):
+            return _error(400, "check_no不能为空")
+
+        for entry in goods:
+            self.feedback[entry["check_no"]] = entry
+        return {"status": 200, "message": "提交成功", "data": {"received": len(goods)}}
+
+
+def _error(status: int, message: str) -> Dict:
+    return {"status": status, "message": message, "data": None}
+
+
+def _parse_biz(biz: str) -> Optional[Dict]:
+    try:
+        value = json.loads(biz or "{}")
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def create_mock_upstream_app(upstream: MockUpstream) -> FastAPI:
+    """Create the mock client API application for the given upstream state"""
+    mock_app = FastAPI(title="Mock Client API", docs_url=None, redoc_url=None)
+    mock_app.state.upstream = upstream
+
+    @mock_app.post("/admin/api/test/check/data")
+    async def check_data(
+        app_id: str = Form(""),
+        time: str = Form(""),
+        random_str: str = Form(""),
+        sign: str = Form(""),
+        biz: str = Form("{}")
+    ):
+        return await upstream.handle_data(app_id, time, random_str, sign, biz)
+
+    @mock_app.post("/admin/api/test/check/feedback")
+    async def check_feedback(
+        app_id: str = Form(""),
+        time: str = Form(""),
+        random_str: str = Form(""),
+        sign: str = Form(""),
+        biz: str = Form("{}")
+    ):
+        return await upstream.handle_feedback(app_id, time, random_str, sign, biz)
+
+    @mock_app.get("/mock/stats")
+    async def mock_stats():
+        return {**upstream.stats, "feedback_received": len(upstream.feedback), "objects": upstream.mock.total}
+
+    return mock_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--objects", type=int, default=10000, help="dataset size")
+    parser.add_argument("--items", type=int, default=3, help="check items per object")
+    parser.add_argument("--seed", type=int, default=42, help="dataset and fault injection seed")
+    parser.add_argument("--base-date", default="2025-01-01", help="earliest sampling date (YYYY-MM-DD)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="fixed latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="extra random latency per request")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests failing with 5xx")
+    parser.add_argument("--max-limit", type=int, default=1000, help="largest page size served")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    upstream = MockUpstream(
+        MockClientAPIService(
+            total=args.objects,
+            items_per_object=args.items,
+            seed=args.seed,
+            base_date=datetime.strptime(args.base_date, "%Y-%m-%d")
+        ),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        max_limit=args.max_limit,
+        seed=args.seed
+    )
+    uvicorn.run(create_mock_upstream_app(upstream), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
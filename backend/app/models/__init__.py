@@ -9,6 +9,8 @@ from app.models.check_object import CheckObject
 from app.models.check_item import CheckObjectItem, CheckItem
 from app.models.sync_log import SyncLog
 from app.models.system_config import SystemConfig
+from app.models.distributed_lock import DistributedLock
+from app.models.ingest_inbox import IngestInbox
 
 __all__ = [
     "User",
@@ -17,4 +19,6 @@ __all__ = [
     "CheckItem",
     "SyncLog",
     "SystemConfig",
+    "DistributedLock",
+    "IngestInbox",
 ]
@@ -4,6 +4,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from app.database import Base
 
 
@@ -12,6 +13,12 @@ class CheckObjectItem(Base):
 
     __tablename__ = "check_object_items"
 
+    # status = 0: 上游已删除该项目, 保留行以免丢失已录入的检测结果
+    STATUS_REMOVED = 0
+
+    # 检测人员录入的字段, 同步时不覆盖
+    LAB_FIELDS = ("num", "result", "check_time", "check_admin")
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     check_object_item_id = Column(BigInteger, unique=True, nullable=False)
     check_object_id = Column(
@@ -43,6 +50,14 @@ class CheckObjectItem(Base):
     # Relationships
     check_object = relationship("CheckObject", back_populates="check_items")
 
+    @hybrid_property
+    def is_active(self) -> bool:
+        return self.status != self.STATUS_REMOVED
+
+    @is_active.expression
+    def is_active(cls):
+        return func.coalesce(cls.status, 1) != cls.STATUS_REMOVED
+
     def __repr__(self):
         return (
             f"<CheckObjectItem(id={self.id}, "
@@ -51,6 +51,11 @@ class CheckObject(Base):
     inspection_date = Column(String(50), nullable=True)  # 检测日期
     remark = Column(Text, nullable=True)  # 备注
 
+    # Idempotent submission - 最近一次上游确认的回传内容
+    submit_payload_hash = Column(String(64), nullable=True)  # SHA-256 of the confirmed feedback data
+    submitted_at = Column(TIMESTAMP, nullable=True)
+    pending_payload_hash = Column(String(64), nullable=True)  # Sent, outcome unknown (e.g. timed out)
+
     # Metadata
     create_admin = Column(String(100), nullable=True)
     create_time = Column(TIMESTAMP, server_default=func.now())
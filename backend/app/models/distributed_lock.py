@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, TIMESTAMP
+from app.database import Base
+
+
+class DistributedLock(Base):
+    """分布式锁租约模型 - 跨进程/跨节点互斥 (同步任务、定时任务、调度器选主)"""
+
+    __tablename__ = "distributed_locks"
+
+    name = Column(String(100), primary_key=True)  # Lock name, e.g. 'sync', 'scheduler-leader'
+    owner = Column(String(200), nullable=False)  # host:pid:token of the holder
+    acquired_at = Column(TIMESTAMP, nullable=False)
+    expires_at = Column(TIMESTAMP, nullable=False)  # Lease end; renewed by heartbeat
+
+    def __repr__(self):
+        return (
+            f"<DistributedLock(name='{self.name}', "
+            f"owner='{self.owner}', "
+            f"expires_at={self.expires_at})>"
+        )
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Index, Integer, String, Text, TIMESTAMP
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class IngestInbox(Base):
+    """推送数据收件箱模型 - 上游推送的检测对象, 先持久化再异步入库"""
+
+    __tablename__ = "ingest_inbox"
+
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    nonce = Column(String(100), nullable=False, unique=True)  # app_id:time:random_str of the signed push
+    payload = Column(Text, nullable=False)  # Raw biz JSON as received
+    status = Column(String(20), nullable=False, server_default='pending')  # 'pending', 'done', 'failed'
+    attempts = Column(Integer, nullable=False, server_default='0')
+    object_count = Column(Integer, nullable=True)  # Check objects written once processed
+    error_message = Column(Text, nullable=True)
+    received_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+    processed_at = Column(TIMESTAMP, nullable=True)
+
+    __table_args__ = (
+        Index('idx_ingest_inbox_status', 'status', 'id'),  # Pending rows, oldest first
+    )
+
+    def __repr__(self):
+        return (
+            f"<IngestInbox(id={self.id}, "
+            f"status='{self.status}', "
+            f"attempts={self.attempts}, "
+            f"object_count={self.object_count})>"
+        )
@@ -9,7 +9,7 @@ class SyncLog(Base):
     __tablename__ = "sync_logs"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    sync_type = Column(String(20), nullable=False)  # 'auto' or 'manual'
+    sync_type = Column(String(20), nullable=False)  # 'auto', 'manual', 'replay', 'backfill' or 'reconcile'
     status = Column(String(20), nullable=False)  # 'success', 'failed', 'in_progress'
     start_time = Column(TIMESTAMP, nullable=False, server_default=func.now(), index=True)
     end_time = Column(TIMESTAMP, nullable=True)
@@ -14,6 +14,8 @@ from app.schemas.check_object import (
 )
 from app.schemas.check_result import CheckResultInput, CheckResultResponse, CheckItemResult
 from app.schemas.sync_log import SyncRequest, SyncResponse, SyncLogResponse, SyncLogList
+from app.schemas.storage import StorageMonthUsage, StorageUsageResponse
+from app.schemas.ingest import IngestResponse
 
 __all__ = [
     # User schemas
@@ -35,4 +37,9 @@ __all__ = [
     "SyncResponse",
     "SyncLogResponse",
     "SyncLogList",
+    # Storage schemas
+    "StorageMonthUsage",
+    "StorageUsageResponse",
+    # Ingest schemas
+    "IngestResponse",
 ]
@@ -156,3 +156,40 @@ class CheckObjectQuery(BaseModel):
     end_date: Optional[str] = None
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=50, ge=1, le=50)
+
+
+class EvaluateRequest(BaseModel):
+    """自动判定请求"""
+    ids: List[int] = Field(..., min_length=1)  # 检测样品ID
+    apply: bool = False                         # 写入判定结果(已提交的样品不写入)
+
+
+class ItemJudgementResponse(BaseModel):
+    """检测项目判定结果"""
+    id: int
+    check_item_name: Optional[str] = None
+    num: Optional[str] = None
+    rule: Optional[str] = None    # 使用的限值, 如 ≤0.2; 无法解析时为空
+    result: Optional[str] = None  # 合格/不合格, 无法判定时为空
+    current_result: Optional[str] = None  # 判定前已有的结果(人工录入)
+    conflict: bool = False        # 已有结果与判定结果不一致(写入时保留已有结果)
+
+
+class SampleJudgementResponse(BaseModel):
+    """检测样品判定结果"""
+    id: int
+    check_object_union_num: str
+    status: int
+    check_result: Optional[str] = None  # 合格/不合格, 无法判定时为空
+    current_check_result: Optional[str] = None  # 判定前已有的样品结果
+    conflict: bool = False              # 已有样品结果与判定结果不一致
+    applied: bool = False
+    items: List[ItemJudgementResponse]
+
+
+class EvaluateResponse(BaseModel):
+    """自动判定响应"""
+    results: List[SampleJudgementResponse]
+    not_found: List[int]
+    applied_count: int
+    conflict_count: int = 0  # 存在冲突(已有结果与判定不一致)的样品数
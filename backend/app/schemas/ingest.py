@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class IngestResponse(BaseModel):
+    """推送数据接收响应"""
+    inbox_id: int
+    status: str  # Inbox status: 'pending', 'done', 'failed'
+    duplicate: bool = False  # Same signed push received before
+    message: str
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class StorageMonthUsage(BaseModel):
+    """单月报告存储占用"""
+    month: str  # "YYYY/MM"
+    bytes: int
+    files: int
+
+
+class StorageUsageResponse(BaseModel):
+    """报告存储占用统计"""
+    path: str
+    total_bytes: int
+    total_files: int
+    months: List[StorageMonthUsage]
+    sync_archive_bytes: int = 0  # Raw upstream payload archive (included in total_bytes)
+    sync_archive_files: int = 0
+    disk_total_bytes: int
+    disk_used_bytes: int
+    disk_free_bytes: int
+    growth_bytes_per_day: float
+    days_to_full: Optional[float] = None
+    last_scan: Optional[str] = None
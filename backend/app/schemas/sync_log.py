@@ -18,6 +18,33 @@ class SyncResponse(BaseModel):
     message: str
 
 
+class SyncJobResponse(BaseModel):
+    """后台同步任务提交响应"""
+    job_id: int
+    status: str  # 'queued'
+    message: str
+
+
+class SyncJobStatus(BaseModel):
+    """后台同步任务进度"""
+    job_id: int
+    sync_type: str
+    status: str  # 'queued', 'running', 'success' or 'error'
+    pages_fetched: Optional[int] = None  # Live progress only
+    total: Optional[int] = None  # Upstream object count, if reported
+    fetched_count: int = 0
+    processed_count: Optional[int] = None  # Live progress only
+    new_count: int = 0
+    updated_count: int = 0
+    rows_upserted: int = 0
+    rate_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    elapsed_seconds: Optional[float] = None
+    message: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+
+
 class SyncLogResponse(BaseModel):
     """同步日志项"""
     id: int
@@ -28,6 +55,7 @@ class SyncLogResponse(BaseModel):
     updated_count: int
     error_message: Optional[str] = None
     start_time: datetime
+    end_time: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,317 @@
+"""
+Report Archive Service
+- Delete orphaned report files not referenced by any check_result_url
+- Pack months older than REPORT_HOT_MONTHS into YYYY-MM.zip archives
+- Expire archives older than REPORT_RETENTION_MONTHS
+- Expire raw upstream payload archives older than SYNC_ARCHIVE_RETENTION_DAYS
+- Bounded by an I/O budget and a nightly time window
+"""
+import os
+import shutil
+import time
+import zipfile
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.check_object import CheckObject
+from app.services.file_service import FileService
+from app.services.payload_archive import get_payload_archive
+from app.services.storage_service import get_storage_accounting
+
+logger = logging.getLogger(__name__)
+
+# Restored copies of archived reports are dropped after this many days
+RESTORE_CACHE_DAYS = 7
+
+
+class IOBudget:
+    """Throttle disk I/O to a bytes-per-second budget by sleeping"""
+
+    def __init__(self, bytes_per_sec: int):
+        self.bytes_per_sec = bytes_per_sec
+        self._started = time.monotonic()
+        self._consumed = 0
+
+    def consume(self, num_bytes: int):
+        """Account for num_bytes of I/O, sleeping if ahead of budget"""
+        if self.bytes_per_sec <= 0:
+            return
+        self._consumed += num_bytes
+        expected_elapsed = self._consumed / self.bytes_per_sec
+        actual_elapsed = time.monotonic() - self._started
+        if expected_elapsed > actual_elapsed:
+            time.sleep(expected_elapsed - actual_elapsed)
+
+
+class WindowClosed(Exception):
+    """Raised when the archival time window ends mid-run"""
+
+
+class ReportArchiveService:
+    """Service for report retention and archival"""
+
+    def __init__(
+        self,
+        db: Session,
+        file_service: Optional[FileService] = None,
+        now: Optional[datetime] = None
+    ):
+        self.db = db
+        self.file_service = file_service or FileService()
+        self.now = now or datetime.now()
+        self.io_budget = IOBudget(settings.ARCHIVE_IO_BUDGET_MB_PER_SEC * 1024 * 1024)
+        self._enforce_window = False
+
+    def run(self, enforce_window: bool = True) -> Dict:
+        """
+        Run one archival pass
+
+        Args:
+            enforce_window: Stop when outside ARCHIVE_WINDOW_START/END_HOUR
+
+        Returns:
+            Dictionary with counts of deleted, archived and expired items
+        """
+        result = {
+            "status": "success",
+            "orphans_deleted": 0,
+            "months_archived": 0,
+            "files_archived": 0,
+            "archives_expired": 0,
+            "restored_cleaned": 0,
+            "sync_archives_expired": 0,
+        }
+        self._enforce_window = enforce_window
+
+        try:
+            self._check_window()
+            referenced = self._referenced_files()
+            result["orphans_deleted"] = self.delete_orphans(referenced)
+
+            for year, month in self._months_to_archive():
+                self._check_window()
+                result["files_archived"] += self.archive_month(year, month)
+                result["months_archived"] += 1
+
+            result["archives_expired"] = self.expire_archives()
+            result["restored_cleaned"] = self.clean_restored()
+            result["sync_archives_expired"] = self.expire_sync_archives()
+
+        except WindowClosed:
+            result["status"] = "partial"
+            logger.info("Archival window closed, remaining work deferred to next run")
+
+        return result
+
+    # ------------------------------------------------------------------
+    # Orphans
+    # ------------------------------------------------------------------
+
+    def _referenced_files(self) -> Set[str]:
+        """Collect normalized paths of every report referenced by a check object"""
+        referenced = set()
+        rows = self.db.query(CheckObject.check_result_url).filter(
+            CheckObject.check_result_url.isnot(None)
+        ).yield_per(1000)
+
+        for (url,) in rows:
+            if not url or "/reports/" not in url:
+                continue
+            try:
+                path = self.file_service.get_report_path(url[url.index("/reports/"):])
+            except ValueError:
+                continue
+            referenced.add(os.path.normcase(path))
+
+        return referenced
+
+    def delete_orphans(self, referenced: Set[str]) -> int:
+        """
+        Delete report files older than REPORT_ORPHAN_GRACE_DAYS that are
+        not referenced by any check object
+
+        Args:
+            referenced: Normalized paths from _referenced_files
+
+        Returns:
+            Number of files deleted
+        """
+        grace_seconds = settings.REPORT_ORPHAN_GRACE_DAYS * 86400
+        cutoff = self.now.timestamp() - grace_seconds
+        accounting = get_storage_accounting()
+        deleted = 0
+
+        for year, month, month_path in self._month_dirs():
+            with os.scandir(month_path) as entries:
+                for entry in entries:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    if os.path.normcase(entry.path) in referenced:
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                    if stat.st_mtime > cutoff:
+                        continue
+
+                    self._check_window()
+                    os.remove(entry.path)
+                    accounting.record_removed(entry.path, stat.st_size)
+                    self.io_budget.consume(4096)
+                    deleted += 1
+
+        if deleted:
+            logger.info(f"Deleted {deleted} orphaned report files")
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Month archives
+    # ------------------------------------------------------------------
+
+    def _month_dirs(self):
+        """Yield (year, month, path) for reports/YYYY/MM, oldest first"""
+        reports_dir = self.file_service.reports_dir
+        if not os.path.isdir(reports_dir):
+            return
+        for year in sorted(os.listdir(reports_dir)):
+            year_path = os.path.join(reports_dir, year)
+            if not (year.isdigit() and os.path.isdir(year_path)):
+                continue
+            for month in sorted(os.listdir(year_path)):
+                month_path = os.path.join(year_path, month)
+                if month.isdigit() and os.path.isdir(month_path):
+                    yield year, month, month_path
+
+    def _months_to_archive(self):
+        """Months older than REPORT_HOT_MONTHS, oldest first"""
+        current_index = self.now.year * 12 + self.now.month - 1
+        for year, month, _ in list(self._month_dirs()):
+            month_index = int(year) * 12 + int(month) - 1
+            if current_index - month_index >= settings.REPORT_HOT_MONTHS:
+                yield year, month
+
+    def archive_month(self, year: str, month: str) -> int:
+        """
+        Pack reports/YYYY/MM into YYYY-MM.zip and remove the originals
+
+        The archive is built as YYYY-MM.zip.partial and appended to across
+        runs, so a window closing mid-month loses no work. A month archived
+        before is extended on a copy, so its reports stay readable from
+        YYYY-MM.zip until the extended archive replaces it. Originals are
+        removed only after the archive is complete and renamed.
+
+        Returns:
+            Number of files archived
+        """
+        month_path = os.path.join(self.file_service.reports_dir, year, month)
+        archive_path = self.file_service.archive_path_for_month(year, month)
+        partial_path = f"{archive_path}.partial"
+        self.file_service.ensure_directory_exists(os.path.dirname(archive_path))
+
+        filenames = sorted(
+            entry.name for entry in os.scandir(month_path)
+            if entry.is_file(follow_symlinks=False)
+        )
+
+        if os.path.exists(archive_path) and not os.path.exists(partial_path):
+            # Month was archived before, new files arrived later: extend a copy
+            self._check_window()
+            shutil.copyfile(archive_path, partial_path)
+            self.io_budget.consume(os.path.getsize(archive_path) * 2)
+
+        mode = "a" if os.path.exists(partial_path) else "w"
+        with zipfile.ZipFile(partial_path, mode, zipfile.ZIP_DEFLATED) as archive:
+            existing = set(archive.namelist())
+            for filename in filenames:
+                if filename in existing:
+                    continue
+                self._check_window()
+                file_path = os.path.join(month_path, filename)
+                archive.write(file_path, filename)
+                self.io_budget.consume(os.path.getsize(file_path) * 2)
+
+        with zipfile.ZipFile(partial_path) as archive:
+            archived = {info.filename: info.file_size for info in archive.infolist()}
+
+        os.replace(partial_path, archive_path)
+
+        accounting = get_storage_accounting()
+        for filename in filenames:
+            file_path = os.path.join(month_path, filename)
+            size = os.path.getsize(file_path)
+            if archived.get(filename) == size:
+                os.remove(file_path)
+                accounting.record_removed(file_path, size)
+
+        try:
+            os.rmdir(month_path)
+        except OSError:
+            pass
+
+        logger.info(f"Archived {len(filenames)} reports from {year}/{month} into {archive_path}")
+        return len(filenames)
+
+    def expire_archives(self) -> int:
+        """Delete month archives older than REPORT_RETENTION_MONTHS (0 disables)"""
+        if settings.REPORT_RETENTION_MONTHS <= 0:
+            return 0
+
+        archive_dir = self.file_service.archive_dir
+        if not os.path.isdir(archive_dir):
+            return 0
+
+        current_index = self.now.year * 12 + self.now.month - 1
+        expired = 0
+        for name in os.listdir(archive_dir):
+            stem, ext = os.path.splitext(name)
+            if ext != ".zip" or len(stem) != 7 or stem[4] != "-":
+                continue
+            try:
+                month_index = int(stem[:4]) * 12 + int(stem[5:]) - 1
+            except ValueError:
+                continue
+            if current_index - month_index >= settings.REPORT_RETENTION_MONTHS:
+                os.remove(os.path.join(archive_dir, name))
+                expired += 1
+                logger.info(f"Expired report archive {name}")
+
+        return expired
+
+    def clean_restored(self) -> int:
+        """Remove restored copies of archived reports older than RESTORE_CACHE_DAYS"""
+        restore_dir = self.file_service.restore_dir
+        if not os.path.isdir(restore_dir):
+            return 0
+
+        cutoff = self.now.timestamp() - RESTORE_CACHE_DAYS * 86400
+        removed = 0
+        for root, _, files in os.walk(restore_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+    def expire_sync_archives(self) -> int:
+        """Delete payload archive days older than SYNC_ARCHIVE_RETENTION_DAYS (0 disables)"""
+        if settings.SYNC_ARCHIVE_RETENTION_DAYS <= 0:
+            return 0
+
+        cutoff = self.now.date() - timedelta(days=settings.SYNC_ARCHIVE_RETENTION_DAYS)
+        expired = get_payload_archive().expire(cutoff)
+        if expired:
+            get_storage_accounting().rescan_sync_archive()
+        return expired
+
+    def _check_window(self):
+        """Raise WindowClosed when the run has drifted into daytime hours"""
+        if not self._enforce_window:
+            return
+        hour = datetime.now().hour
+        start, end = settings.ARCHIVE_WINDOW_START_HOUR, settings.ARCHIVE_WINDOW_END_HOUR
+        inside = start <= hour < end if start <= end else (hour >= start or hour < end)
+        if not inside:
+            raise WindowClosed()
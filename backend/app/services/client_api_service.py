@@ -3,6 +3,8 @@ Client API Service
 T081: Implement ClientAPIService
 - fetch_check_objects: Fetch data from client API
 - calculate MD5 signature: Generate authentication signature
+- Requests pass a shared token-bucket rate limiter and circuit breaker
+- stream_check_objects: Decode data.list record by record from the streamed body
 
 参考已测试成功的 quality_inspection_api.py 实现
 """
@@ -11,16 +13,186 @@ import time
 import random
 import string
 import json
-from typing import Dict, List, Optional, Any
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 import httpx
 from datetime import datetime, timedelta
 import logging
 
 from app.config import settings
 from app.services.mock_client_api import MockClientAPIService
+from app.services.payload_archive import get_payload_archive
+from app.utils.field_mapping import compile_mapping, parse_datetime
+from app.utils.json_stream import iter_json_items
+from app.utils.metrics import REGISTRY
+from app.utils.resilience import CircuitBreaker, RateLimitExceeded, TokenBucket
 
 logger = logging.getLogger(__name__)
 
+CLIENT_API_REQUESTS = REGISTRY.counter(
+    "client_api_requests_total",
+    "Client API requests by endpoint and outcome (success/failure)",
+    ["endpoint", "outcome"],
+)
+CLIENT_API_LATENCY = REGISTRY.histogram(
+    "client_api_request_duration_seconds",
+    "Client API request latency in seconds by endpoint",
+    ["endpoint"],
+)
+
+# API字段 -> 数据库字段, 别名按顺序取第一个非空值
+CHECK_OBJECT_FIELDS = (
+    # 主键和标识
+    ("check_object_id", ("check_object_id", "id")),
+    ("check_object_union_num", ("check_no", "check_object_union_num")),
+    ("day_num", ("day_num",)),
+
+    # 送检商品信息
+    ("submission_goods_id", ("submission_goods_id",)),
+    ("submission_goods_name", ("submission_goods_name", "sample_name")),
+    ("submission_goods_area", ("submission_goods_area",)),
+    ("submission_goods_location", ("submission_goods_location",)),
+    ("submission_goods_unit", ("submission_goods_unit",)),
+    ("submission_goods_car_number", ("submission_goods_car_number",)),
+
+    # 送检人信息
+    ("submission_method", ("submission_method",)),
+    ("submission_person", ("submission_person",)),
+    ("submission_person_mobile", ("submission_person_mobile",)),
+    ("submission_person_company", ("submission_person_company", "company_name")),
+
+    # 司机信息
+    ("driver", ("driver",)),
+    ("driver_mobile", ("driver_mobile",)),
+
+    # 检测信息
+    ("check_type", ("check_type",)),
+    ("status", ("status",), {"default": 0}),
+    ("is_receive", ("is_receive",), {"default": 1}),
+    ("check_start_time", ("check_start_time", "sampling_time"), {"convert": parse_datetime}),
+    ("check_end_time", ("check_end_time",), {"convert": parse_datetime}),
+    ("check_result", ("check_result",)),
+    ("check_result_url", ("check_result_url", "report_url")),
+
+    # 元数据
+    ("create_admin", ("create_admin",)),
+)
+
+# 需求2.5.2: 检测项目字段从 objectItems[] 及其嵌套的 checkItem 中取值
+CHECK_ITEM_FIELDS = (
+    ("check_object_item_id", ("check_object_item_id", "id"), {"source": "item"}),
+    # 序号 → checkItem:item_id
+    ("check_item_id", ("item_id", "check_item_id")),
+    # 检验项目 → checkItem:name
+    ("check_item_name", ("name", "check_item_name", "item_name")),
+    # 单位 → checkItem:reference_values
+    ("unit", ("reference_values",)),
+    # 检出限 → checkItem:fee
+    ("detection_limit", ("fee",)),
+    # 检测方法 → checkItem:method_name
+    ("check_method", ("method_name",)),
+    # 其他字段
+    ("reference_value", ("reference_value", "reference_values")),
+    ("item_indicator", ("item_indicator",)),
+)
+
+_extract_check_object = compile_mapping(CHECK_OBJECT_FIELDS, "extract_check_object")
+_extract_check_item = compile_mapping(
+    CHECK_ITEM_FIELDS, "extract_check_item", sources=("check_item", "item")
+)
+
+# Shared by sync and submit so every caller in the process respects the same limits
+_rate_limiter: Optional[TokenBucket] = None
+_circuit_breaker: Optional[CircuitBreaker] = None
+_guards_lock = threading.Lock()
+
+
+def get_client_api_rate_limiter() -> TokenBucket:
+    """Get or create the client API rate limiter"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _guards_lock:
+            if _rate_limiter is None:
+                _rate_limiter = TokenBucket(
+                    rate=settings.CLIENT_API_RATE_LIMIT_PER_SECOND,
+                    capacity=settings.CLIENT_API_RATE_LIMIT_BURST,
+                    name="client_api"
+                )
+    return _rate_limiter
+
+
+def get_client_api_circuit_breaker() -> CircuitBreaker:
+    """Get or create the client API circuit breaker"""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        with _guards_lock:
+            if _circuit_breaker is None:
+                _circuit_breaker = CircuitBreaker(
+                    "client_api",
+                    failure_threshold=settings.CLIENT_API_BREAKER_FAILURE_THRESHOLD,
+                    recovery_timeout=settings.CLIENT_API_BREAKER_RECOVERY_SECONDS
+                )
+    return _circuit_breaker
+
+
+def reset_client_api_guards():
+    """Drop the shared rate limiter and circuit breaker (settings changed, tests)"""
+    global _rate_limiter, _circuit_breaker
+    with _guards_lock:
+        _rate_limiter = None
+        _circuit_breaker = None
+
+
+class CheckObjectStream:
+    """
+    Check objects of one /check/data response, decoded as they are iterated
+
+    code, msg and total follow the fetch_check_objects response format and
+    are set once iteration is complete (the envelope may follow data.list).
+    """
+
+    def __init__(self, records: Iterable[Dict], summary: Callable[[], Dict]):
+        """
+        Args:
+            records: Records decoded from the body so far, lazily
+            summary: Called after records are exhausted; returns the
+                response in fetch_check_objects format, whose data.list
+                holds any records that could not be streamed
+        """
+        self._records = records
+        self._summary = summary
+        self.code: Optional[int] = None
+        self.msg: Optional[str] = None
+        self.total: Optional[int] = None
+        self.count = 0
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes], to_internal: Callable[[Dict], Dict]) -> "CheckObjectStream":
+        """Stream data.list out of a raw response body"""
+        envelope: Dict = {}
+        return cls(iter_json_items(chunks, ("data", "list"), envelope), lambda: to_internal(envelope))
+
+    @classmethod
+    def from_response(cls, response: Dict) -> "CheckObjectStream":
+        """Wrap an already decoded fetch_check_objects response"""
+        return cls((), lambda: response)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for record in self._records:
+            self.count += 1
+            yield record
+
+        response = self._summary()
+        data = response.get("data") or {}
+        for record in data.get("list") or []:
+            self.count += 1
+            yield record
+
+        self.code = response.get("code")
+        self.msg = response.get("msg")
+        self.total = data.get("total") or self.count
+
 
 class ClientAPIService:
     """Service for interacting with client API"""
@@ -29,7 +201,10 @@ class ClientAPIService:
         self.base_url = settings.API_BASE_URL
         self.app_id = settings.CLIENT_APP_ID
         self.key = settings.CLIENT_SECRET
-        self.timeout = 30.0
+        self.timeout = httpx.Timeout(
+            settings.CLIENT_API_TIMEOUT_SECONDS,
+            connect=settings.CLIENT_API_CONNECT_TIMEOUT_SECONDS
+        )
         self.use_mock = settings.USE_MOCK_CLIENT_API
         self.mock_service = MockClientAPIService() if self.use_mock else None
 
@@ -92,6 +267,44 @@ class ClientAPIService:
 
         return params
 
+    @contextmanager
+    def _guarded(self, endpoint: str) -> Iterator[None]:
+        """
+        Run one upstream request under the shared rate limiter and circuit breaker
+
+        Raises:
+            CircuitOpenError: If the client API has been failing (no request is made)
+            RateLimitExceeded: If no request slot frees up within CLIENT_API_RATE_LIMIT_MAX_WAIT_SECONDS
+        """
+        # Fail fast while the upstream is down, then wait for a request slot
+        breaker = get_client_api_circuit_breaker()
+        breaker.before_call()
+        try:
+            get_client_api_rate_limiter().acquire(timeout=settings.CLIENT_API_RATE_LIMIT_MAX_WAIT_SECONDS)
+        except RateLimitExceeded:
+            breaker.release()
+            raise
+
+        healthy = False
+        started = time.perf_counter()
+        try:
+            yield
+            healthy = True
+
+        except httpx.HTTPStatusError as e:
+            # Other 4xx answers mean the upstream is up; only 5xx/429 count against it
+            status_code = e.response.status_code
+            healthy = status_code < 500 and status_code != 429
+            raise
+
+        finally:
+            if healthy:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            CLIENT_API_REQUESTS.inc(endpoint, "success" if healthy else "failure")
+            CLIENT_API_LATENCY.observe(endpoint, value=time.perf_counter() - started)
+
     def _make_request(
         self,
         endpoint: str,
@@ -108,42 +321,76 @@ class ClientAPIService:
             API response as dictionary
 
         Raises:
+            CircuitOpenError: If the client API has been failing (no request is made)
+            RateLimitExceeded: If no request slot frees up within CLIENT_API_RATE_LIMIT_MAX_WAIT_SECONDS
             Exception: On network/HTTP errors
         """
         url = f"{self.base_url}{endpoint}"
 
-        # 准备请求参数
-        params = self._prepare_request_params(biz_data)
+        with self._guarded(endpoint):
+            # 准备请求参数
+            params = self._prepare_request_params(biz_data)
 
-        logger.info(f"Requesting: {url}")
+            logger.info(f"Requesting: {url}")
 
-        # Make request with form data
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(
-                url,
-                data=params,
-                headers={'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'}
-            )
+            # Make request with form data
+            with httpx.Client(timeout=self.timeout) as client:
+                response = client.post(
+                    url,
+                    data=params,
+                    headers={'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'}
+                )
 
-            logger.info(f"API Response status: {response.status_code}")
+                logger.info(f"API Response status: {response.status_code}")
 
-            response.raise_for_status()
+                response.raise_for_status()
 
-            # Parse JSON response
-            try:
-                json_response = response.json()
-                return json_response
-            except Exception as e:
-                logger.error(f"Failed to parse JSON response: {str(e)}")
-                logger.error(f"Response content type: {response.headers.get('content-type')}")
-                logger.error(f"Response text (first 500 chars): {response.text[:500]}")
-                raise
+                # Parse JSON response
+                try:
+                    return response.json()
+                except Exception as e:
+                    logger.error(f"Failed to parse JSON response: {str(e)}")
+                    logger.error(f"Response content type: {response.headers.get('content-type')}")
+                    logger.error(f"Response text (first 500 chars): {response.text[:500]}")
+                    raise
+
+    @contextmanager
+    def _stream_request(
+        self,
+        endpoint: str,
+        biz_data: Dict[str, Any]
+    ) -> Iterator[httpx.Response]:
+        """
+        Like _make_request, but yields the response with its body unread
+
+        The request counts as successful for the circuit breaker only once
+        the caller has consumed the body without error.
+        """
+        url = f"{self.base_url}{endpoint}"
+
+        with self._guarded(endpoint):
+            params = self._prepare_request_params(biz_data)
+
+            logger.info(f"Requesting (streamed): {url}")
+
+            with httpx.Client(timeout=self.timeout) as client:
+                with client.stream(
+                    "POST",
+                    url,
+                    data=params,
+                    headers={'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'}
+                ) as response:
+                    logger.info(f"API Response status: {response.status_code}")
+                    response.raise_for_status()
+                    yield response
 
     def fetch_check_objects(
         self,
         page: int = 1,
         page_size: int = 50,
-        status: Optional[int] = None
+        status: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
     ) -> Dict:
         """
         Fetch check objects from client API
@@ -155,22 +402,23 @@ class ClientAPIService:
             page: Page number (default: 1)
             page_size: Items per page (default: 50)
             status: Filter by status (optional)
+            start_time: Window start (default: SYNC_START_TIME)
+            end_time: Window end (default: end of today)
 
         Returns:
-            API response containing list of check objects
+            API response containing list of check objects; data.total is the
+            number of objects in the window, which may exceed page_size
         """
         # Use mock data if enabled
         if self.use_mock:
             logger.info("Using MOCK client API data")
-            return self.mock_service.get_mock_check_objects(page, page_size)
+            return self.mock_service.get_mock_check_objects(page, page_size, start_time, end_time)
 
         endpoint = "/admin/api/test/check/data"
 
-        # 准备业务数据 - 固定起始时间，截止时间为系统当天
-        # 起始时间：2025年1月1日
-        # 截止时间：系统当天
-        start_time = "2025-01-01 00:00:00"
-        end_time = datetime.now().strftime("%Y-%m-%d 23:59:59")
+        # 准备业务数据 - 默认起始时间为 SYNC_START_TIME，截止时间为系统当天
+        start_time = (start_time or self.default_start_time()).strftime("%Y-%m-%d %H:%M:%S")
+        end_time = (end_time or self.default_end_time()).strftime("%Y-%m-%d %H:%M:%S")
 
         biz_data = {
             "start_time": start_time,
@@ -183,38 +431,7 @@ class ClientAPIService:
         try:
             response = self._make_request(endpoint, biz_data)
 
-            # 转换响应格式以匹配内部期望的格式
-            if response.get("status") == 200:
-                # API返回格式：{"status": 200, "message": "success", "data": {"count": X, "list": [...]}}
-                data = response.get("data", {})
-
-                # 提取list和count
-                if isinstance(data, dict):
-                    data_list = data.get("list", [])
-                    total_count = data.get("count", len(data_list))
-                else:
-                    # 如果data直接是列表（兼容处理）
-                    data_list = data if isinstance(data, list) else []
-                    total_count = len(data_list)
-
-                logger.info(f"Successfully fetched {len(data_list)} check objects (total: {total_count})")
-
-                return {
-                    "code": 0,
-                    "msg": "success",
-                    "data": {
-                        "list": data_list,
-                        "total": total_count
-                    }
-                }
-            else:
-                error_msg = response.get("message", "未知错误")
-                logger.error(f"API returned error status: {response.get('status')}, message: {error_msg}")
-                return {
-                    "code": response.get("status", -1),
-                    "msg": error_msg,
-                    "data": {"list": [], "total": 0}
-                }
+            return self._to_internal_response(response)
 
         except httpx.HTTPError as e:
             logger.error(f"客户端API请求失败: {str(e)}")
@@ -223,6 +440,110 @@ class ClientAPIService:
             logger.error(f"API响应JSON解析失败: {str(e)}")
             raise Exception(f"API响应解析失败，可能返回了非JSON内容")
 
+    @contextmanager
+    def stream_check_objects(
+        self,
+        page_size: int = 50,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        record: bool = True
+    ) -> Iterator["CheckObjectStream"]:
+        """
+        Fetch check objects, yielding records while the response is read
+
+        Same request as fetch_check_objects, but data.list is parsed
+        incrementally from the streamed body, so only one raw record is held
+        at a time. code/msg/total of the yielded CheckObjectStream are final
+        once its records have been iterated. The raw body is appended to the
+        payload archive when SYNC_ARCHIVE_ENABLED and record is set (callers
+        that only compare, like reconciliation, pass False). Falls back to a
+        buffered fetch_check_objects call in mock mode or when
+        CLIENT_API_STREAM_RESPONSES is off.
+
+        Raises:
+            Exception: On network/HTTP errors or malformed JSON
+        """
+        if self.use_mock or not settings.CLIENT_API_STREAM_RESPONSES:
+            yield CheckObjectStream.from_response(self.fetch_check_objects(
+                page_size=page_size, start_time=start_time, end_time=end_time
+            ))
+            return
+
+        endpoint = "/admin/api/test/check/data"
+        start_time = (start_time or self.default_start_time()).strftime("%Y-%m-%d %H:%M:%S")
+        end_time = (end_time or self.default_end_time()).strftime("%Y-%m-%d %H:%M:%S")
+        biz_data = {
+            "start_time": start_time,
+            "end_time": end_time,
+            "limit": page_size
+        }
+
+        logger.info(f"Streaming check objects: {start_time} to {end_time}, limit: {page_size}")
+
+        try:
+            with self._stream_request(endpoint, biz_data) as response:
+                if not (record and settings.SYNC_ARCHIVE_ENABLED):
+                    yield CheckObjectStream.from_chunks(response.iter_bytes(), self._to_internal_response)
+                    return
+
+                # Keep the raw page so it can be replayed after parser fixes
+                with get_payload_archive().record(endpoint=endpoint, **biz_data) as recorder:
+                    yield CheckObjectStream.from_chunks(
+                        recorder.tee(response.iter_bytes()), self._to_internal_response
+                    )
+
+        except httpx.HTTPError as e:
+            logger.error(f"客户端API请求失败: {str(e)}")
+            raise Exception(f"客户端API请求失败: {str(e)}")
+        except json.JSONDecodeError as e:
+            logger.error(f"API响应JSON解析失败: {str(e)}")
+            raise Exception(f"API响应解析失败，可能返回了非JSON内容")
+
+    @staticmethod
+    def _to_internal_response(response: Dict) -> Dict:
+        """转换响应格式以匹配内部期望的格式"""
+        if response.get("status") == 200:
+            # API返回格式：{"status": 200, "message": "success", "data": {"count": X, "list": [...]}}
+            data = response.get("data", {})
+
+            # 提取list和count
+            if isinstance(data, dict):
+                data_list = data.get("list", [])
+                total_count = data.get("count", len(data_list))
+            else:
+                # 如果data直接是列表（兼容处理）
+                data_list = data if isinstance(data, list) else []
+                total_count = len(data_list)
+
+            logger.info(f"Fetched check objects response (total: {total_count})")
+
+            return {
+                "code": 0,
+                "msg": "success",
+                "data": {
+                    "list": data_list,
+                    "total": total_count
+                }
+            }
+        else:
+            error_msg = response.get("message", "未知错误")
+            logger.error(f"API returned error status: {response.get('status')}, message: {error_msg}")
+            return {
+                "code": response.get("status", -1),
+                "msg": error_msg,
+                "data": {"list": [], "total": 0}
+            }
+
+    @staticmethod
+    def default_start_time() -> datetime:
+        """Earliest sampling time requested from the client API"""
+        return datetime.strptime(settings.SYNC_START_TIME, "%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def default_end_time() -> datetime:
+        """End of the current day"""
+        return datetime.now().replace(hour=23, minute=59, second=59, microsecond=0)
+
     def parse_check_object(self, api_data: Dict) -> Dict:
         """
         Parse check object data from API response
@@ -235,100 +556,23 @@ class ClientAPIService:
         Returns:
             Parsed check object data matching database model
         """
-        # 映射API字段到数据库字段
-        parsed = {
-            # 主键和标识
-            "check_object_id": api_data.get("check_object_id") or api_data.get("id"),
-            "check_object_union_num": api_data.get("check_no") or api_data.get("check_object_union_num"),
-            "day_num": api_data.get("day_num"),
-
-            # 送检商品信息
-            "submission_goods_id": api_data.get("submission_goods_id"),
-            "submission_goods_name": api_data.get("submission_goods_name") or api_data.get("sample_name"),
-            "submission_goods_area": api_data.get("submission_goods_area"),
-            "submission_goods_location": api_data.get("submission_goods_location"),
-            "submission_goods_unit": api_data.get("submission_goods_unit"),
-            "submission_goods_car_number": api_data.get("submission_goods_car_number"),
-
-            # 送检人信息
-            "submission_method": api_data.get("submission_method"),
-            "submission_person": api_data.get("submission_person"),
-            "submission_person_mobile": api_data.get("submission_person_mobile"),
-            "submission_person_company": api_data.get("submission_person_company") or api_data.get("company_name"),
-
-            # 司机信息
-            "driver": api_data.get("driver"),
-            "driver_mobile": api_data.get("driver_mobile"),
-
-            # 检测信息
-            "check_type": api_data.get("check_type"),
-            "status": api_data.get("status", 0),
-            "is_receive": api_data.get("is_receive", 1),
-            "check_start_time": self._parse_datetime(api_data.get("check_start_time") or api_data.get("sampling_time")),
-            "check_end_time": self._parse_datetime(api_data.get("check_end_time")),
-            "check_result": api_data.get("check_result"),
-            "check_result_url": api_data.get("check_result_url") or api_data.get("report_url"),
-
-            # 元数据
-            "create_admin": api_data.get("create_admin"),
-        }
+        parsed = _extract_check_object(api_data)
 
         # 解析检测项目
         # 需求2.5.2: 字段映射从 data:list:objectItems:checkItem 中取值
-        check_items = []
         items_data = api_data.get("objectItems") or api_data.get("check_items") or api_data.get("item") or []
 
-        for item_data in items_data:
-            # 获取嵌套的checkItem对象（客户API返回格式）
-            check_item = item_data.get("checkItem") or item_data
-
-            check_items.append({
-                "check_object_item_id": item_data.get("check_object_item_id") or item_data.get("id"),
-                # 需求2.5.2: 序号 → checkItem:item_id
-                "check_item_id": check_item.get("item_id") or check_item.get("check_item_id"),
-                # 需求2.5.2: 检验项目 → checkItem:name
-                "check_item_name": check_item.get("name") or check_item.get("check_item_name") or check_item.get("item_name"),
-                # 需求2.5.2: 单位 → checkItem:reference_values
-                "unit": check_item.get("reference_values"),
-                # 需求2.5.2: 检出限 → checkItem:fee
-                "detection_limit": check_item.get("fee"),
-                # 需求2.5.2: 检测方法 → checkItem:method_name
-                "check_method": check_item.get("method_name"),
-                # 其他字段
-                "reference_value": check_item.get("reference_value") or check_item.get("reference_values"),
-                "item_indicator": check_item.get("item_indicator"),
-            })
-
-        parsed["check_items"] = check_items
+        # 获取嵌套的checkItem对象（客户API返回格式）
+        parsed["check_items"] = [
+            _extract_check_item(item_data.get("checkItem") or item_data, item_data)
+            for item_data in items_data
+        ]
 
         return parsed
 
     def _parse_datetime(self, dt_str: Optional[str]) -> Optional[datetime]:
         """Parse datetime string to datetime object"""
-        if not dt_str:
-            return None
-
-        # 如果已经是datetime对象
-        if isinstance(dt_str, datetime):
-            return dt_str
-
-        try:
-            # Try common formats
-            for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y/%m/%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"]:
-                try:
-                    return datetime.strptime(dt_str, fmt)
-                except ValueError:
-                    continue
-
-            # 尝试ISO格式
-            try:
-                return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-            except:
-                pass
-
-            return None
-        except:
-            return None
+        return parse_datetime(dt_str)
 
     def submit_check_result(
         self,
@@ -389,4 +633,4 @@ class ClientAPIService:
             return response
         except httpx.HTTPError as e:
             logger.error(f"提交检测结果失败: {str(e)}")
-            raise Exception(f"提交检测结果失败: {str(e)}")
+            raise Exception(f"提交检测结果失败: {str(e)}") from e
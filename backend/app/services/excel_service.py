@@ -92,7 +92,8 @@ class ExcelExportService:
         for obj in check_objects:
             # Get check items for this object
             items = self.db.query(CheckObjectItem).filter(
-                CheckObjectItem.check_object_id == obj.id
+                CheckObjectItem.check_object_id == obj.id,
+                CheckObjectItem.is_active
             ).all()
 
             if not items:
@@ -185,7 +186,8 @@ class ExcelExportService:
 
             # Count items
             item_count = self.db.query(CheckObjectItem).filter(
-                CheckObjectItem.check_object_id == obj_id
+                CheckObjectItem.check_object_id == obj_id,
+                CheckObjectItem.is_active
             ).count()
 
             # At least 1 row per sample
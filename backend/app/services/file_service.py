@@ -4,23 +4,31 @@ T106: Implement FileService
 - save_pdf_report: Save PDF to disk
 - generate_file_path: Generate storage path
 - generate_url: Generate access URL
+- delete_report_file: Remove a stored report
+- resolve_report_path: Locate a report, extracting it from a month archive if needed
 """
 import os
 import uuid
+import zipfile
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional
 from fastapi import UploadFile
 
 from app.config import settings
+from app.services.storage_service import get_storage_accounting
+from app.services.preview_service import get_preview_service
 
 
 class FileService:
     """Service for handling file uploads and storage"""
 
-    def __init__(self):
-        self.upload_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
+    def __init__(self, upload_dir: Optional[str] = None):
+        self.upload_dir = upload_dir or os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
         self.reports_dir = os.path.join(self.upload_dir, "reports")
+        # Month archives (YYYY-MM.zip) live outside reports/ so the static mount never serves them
+        self.archive_dir = settings.REPORT_COLD_STORAGE_PATH or os.path.join(self.upload_dir, "archive")
+        self.restore_dir = os.path.join(self.upload_dir, "restored")
         self.max_file_size_mb = 10
 
     def save_pdf_report(
@@ -68,6 +76,9 @@ class FileService:
             with open(file_path, "wb") as f:
                 f.write(content)
 
+            get_storage_accounting().record_added(str(file_path), len(content))
+            get_preview_service().enqueue(str(file_path))
+
             # Generate URL
             file_url = self.generate_file_url(str(file_path))
 
@@ -84,6 +95,104 @@ class FileService:
         finally:
             file.file.seek(0)  # Reset file pointer
 
+    def delete_report_file(self, file_url: str) -> bool:
+        """
+        Delete a stored report by its /reports/... URL
+
+        Args:
+            file_url: URL returned by save_pdf_report
+
+        Returns:
+            True if a file was removed, False if it did not exist
+        """
+        full_path = self.get_report_path(file_url)
+        if not os.path.isfile(full_path):
+            return False
+
+        size_bytes = os.path.getsize(full_path)
+        os.remove(full_path)
+        get_storage_accounting().record_removed(full_path, size_bytes)
+        return True
+
+    def get_report_path(self, file_url: str) -> str:
+        """Convert a /reports/... URL into an absolute path under reports_dir"""
+        relative_path = file_url.replace("/reports/", "", 1).lstrip("/")
+        full_path = os.path.normpath(os.path.join(self.reports_dir, relative_path))
+
+        # Reject URLs that escape the reports directory
+        if os.path.commonpath([full_path, os.path.normpath(self.reports_dir)]) != os.path.normpath(self.reports_dir):
+            raise ValueError("无效的报告路径")
+
+        return full_path
+
+    def resolve_report_path(self, file_url: str) -> Optional[str]:
+        """
+        Locate a report on disk by its /reports/... URL
+
+        Reports in months that were archived are extracted on demand from
+        the month archive into restore_dir.
+
+        Args:
+            file_url: URL stored in check_result_url
+
+        Returns:
+            Absolute path of a readable file, or None if not found
+        """
+        try:
+            full_path = self.get_report_path(file_url)
+        except ValueError:
+            return None
+
+        if os.path.isfile(full_path):
+            return full_path
+
+        return self.extract_archived_report(full_path)
+
+    def archive_path_for_month(self, year: str, month: str) -> str:
+        """Get archive file path for a reports/YYYY/MM directory"""
+        return os.path.join(self.archive_dir, f"{year}-{month}.zip")
+
+    def extract_archived_report(self, full_path: str) -> Optional[str]:
+        """
+        Extract a single report from its month archive
+
+        Args:
+            full_path: Original path under reports/YYYY/MM
+
+        Returns:
+            Path of the extracted copy, or None if not archived
+        """
+        relative = os.path.relpath(full_path, self.reports_dir).replace("\\", "/")
+        parts = relative.split("/")
+        if len(parts) != 3:
+            return None
+
+        year, month, filename = parts
+        archive_path = self.archive_path_for_month(year, month)
+        if not os.path.isfile(archive_path):
+            return None
+
+        target_path = os.path.join(self.restore_dir, year, month, filename)
+        if os.path.isfile(target_path):
+            return target_path
+
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                with archive.open(filename) as source:
+                    self.ensure_directory_exists(os.path.dirname(target_path))
+                    tmp_path = f"{target_path}.{uuid.uuid4().hex}.tmp"
+                    with open(tmp_path, "wb") as target:
+                        while True:
+                            chunk = source.read(1024 * 1024)
+                            if not chunk:
+                                break
+                            target.write(chunk)
+                    os.replace(tmp_path, target_path)
+        except KeyError:
+            return None
+
+        return target_path
+
     def generate_filename(self, original_filename: str) -> str:
         """Generate unique filename with UUID"""
         ext = Path(original_filename).suffix.lower()
@@ -0,0 +1,205 @@
+"""
+Push Ingest Service
+- The client API can push new check objects to POST /ingest/check/data
+  instead of waiting for the next poll
+- Pushes are form encoded like the client API's own requests (app_id,
+  time, random_str, sign, biz); biz holds the objects as a "list", or as
+  "data.list" in the check/data response shape
+- The signature follows the client API's MD5 scheme but with our own
+  INGEST_SECRET and the MD5 of biz as an extra field (push_signature), so
+  neither a signed request we send upstream nor a push with its biz
+  swapped is accepted
+- Accepted pushes are stored in the ingest_inbox table before answering,
+  then written through the sync pipeline by a background worker; the
+  scheduler's inbox job picks up anything the worker missed
+- Each signed (time, random_str) is accepted once and only within
+  INGEST_SIGNATURE_MAX_AGE_SECONDS
+- Done inbox rows are deleted after INGEST_INBOX_RETENTION_HOURS, never
+  before their signed time could still be accepted
+"""
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.ingest_inbox import IngestInbox
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidPush(Exception):
+    """Push rejected: bad signature, stale time or malformed biz"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def push_signature(app_id: str, time_value: str, random_str: str, biz: str, secret: str) -> str:
+    """
+    Signature of a push
+
+    The values of app_id, biz_md5 (MD5 of the biz form field), random_str
+    and time in that (key) order, joined with "&", then "&" + secret,
+    hashed with MD5 to 32 lowercase hex characters.
+    """
+    biz_md5 = hashlib.md5((biz or "").encode("utf-8")).hexdigest()
+    sign_str = "&".join([app_id, biz_md5, random_str, time_value, secret])
+    return hashlib.md5(sign_str.encode("utf-8")).hexdigest()
+
+
+def verify_push_signature(app_id: str, time_value: str, random_str: str, biz: str, sign: str):
+    """
+    Check a push is signed with INGEST_SECRET over its biz and recent
+
+    Raises:
+        InvalidPush: 401 if the signature is wrong, no INGEST_SECRET is
+            configured or the time is out of range
+    """
+    if not settings.INGEST_SECRET or app_id != settings.CLIENT_APP_ID:
+        raise InvalidPush("签名错误", 401)
+
+    try:
+        skew = abs(time.time() - int(time_value))
+    except (TypeError, ValueError):
+        raise InvalidPush("签名错误", 401)
+    if skew > settings.INGEST_SIGNATURE_MAX_AGE_SECONDS:
+        raise InvalidPush("签名已过期", 401)
+
+    expected = push_signature(app_id, time_value, random_str, biz, settings.INGEST_SECRET)
+    if not hmac.compare_digest(expected, (sign or "").lower()):
+        raise InvalidPush("签名错误", 401)
+
+
+def pushed_objects(biz: str) -> List[Dict]:
+    """
+    Check objects of a push, in the client API format
+
+    Raises:
+        InvalidPush: If biz is not a JSON object holding a list of objects
+    """
+    try:
+        data = json.loads(biz or "{}")
+    except ValueError:
+        raise InvalidPush("biz参数格式错误")
+    if not isinstance(data, dict):
+        raise InvalidPush("biz参数格式错误")
+
+    objects = data.get("list")
+    if objects is None and isinstance(data.get("data"), dict):
+        objects = data["data"].get("list")
+    if not isinstance(objects, list) or not all(isinstance(obj, dict) for obj in objects):
+        raise InvalidPush("list参数格式错误")
+    return objects
+
+
+def enqueue_push(db: Session, app_id: str, time_value: str, random_str: str, biz: str) -> Tuple[IngestInbox, bool]:
+    """
+    Store a verified push in the inbox
+
+    Returns:
+        (inbox row, duplicate): a redelivered push returns the stored row
+    """
+    nonce = f"{app_id}:{time_value}:{random_str}"
+    existing = db.query(IngestInbox).filter(IngestInbox.nonce == nonce).first()
+    if existing is not None:
+        return existing, True
+
+    row = IngestInbox(nonce=nonce, payload=biz, status=IngestInbox.STATUS_PENDING, attempts=0)
+    db.add(row)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Same push delivered concurrently
+        db.rollback()
+        return db.query(IngestInbox).filter(IngestInbox.nonce == nonce).one(), True
+    db.refresh(row)
+    return row, False
+
+
+def purge_inbox(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Delete done inbox rows processed more than INGEST_INBOX_RETENTION_HOURS ago
+
+    Rows are kept at least twice INGEST_SIGNATURE_MAX_AGE_SECONDS (the signed
+    time may be that far ahead or behind), so a redelivered push is still
+    recognised by its nonce until its signature expires.
+
+    Returns:
+        Number of rows deleted
+    """
+    if settings.INGEST_INBOX_RETENTION_HOURS <= 0:
+        return 0
+    retention = max(
+        timedelta(hours=settings.INGEST_INBOX_RETENTION_HOURS),
+        timedelta(seconds=2 * settings.INGEST_SIGNATURE_MAX_AGE_SECONDS)
+    )
+    cutoff = (now or datetime.now()) - retention
+    deleted = db.query(IngestInbox).filter(
+        IngestInbox.status == IngestInbox.STATUS_DONE,
+        IngestInbox.processed_at < cutoff
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+class InboxWorker:
+    """
+    Process the inbox in the background right after a push is stored
+
+    Notifications arriving while a run is queued are coalesced into it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queued = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-inbox")
+
+    def notify(self, session_factory: Callable[[], Session]):
+        with self._lock:
+            if self._queued:
+                return
+            self._queued = True
+        self._executor.submit(self._run, session_factory)
+
+    def _run(self, session_factory: Callable[[], Session]):
+        with self._lock:
+            self._queued = False
+
+        # Imported here: sync_service imports this module
+        from app.services.sync_service import SyncService
+
+        db = session_factory()
+        try:
+            while True:
+                result = SyncService(db).process_inbox()
+                if result["processed"] + result["failed"] < settings.INGEST_INBOX_BATCH_ROWS:
+                    break
+        except Exception as e:
+            # Left pending: the scheduler's inbox job retries
+            logger.info(f"Inbox processing deferred: {str(e)}")
+        finally:
+            db.close()
+
+
+_inbox_worker: Optional[InboxWorker] = None
+_inbox_worker_lock = threading.Lock()
+
+
+def get_inbox_worker() -> InboxWorker:
+    """Get the global inbox worker"""
+    global _inbox_worker
+    if _inbox_worker is None:
+        with _inbox_worker_lock:
+            if _inbox_worker is None:
+                _inbox_worker = InboxWorker()
+    return _inbox_worker
@@ -0,0 +1,244 @@
+"""
+Automatic result judgement for check items
+- An item's limit expression (item_indicator, else reference_value) is
+  compiled once into an interval on the measured value: "≤0.2mg/kg",
+  "<5", "≥10", "1.0-2.5", "不得检出", "≤检出限", "阴性", "阳性"
+- Measured values (num) are parsed the same way: numbers, "未检出"/"ND"/
+  "<0.01"/"低于检出限" (not detected) and "检出"/"阳性" (detected, no
+  amount)
+- A batch of items is judged with array comparisons against the compiled
+  bounds; NumPy is used when installed, otherwise a plain loop gives the
+  same results
+- A sample is 不合格 if any item is, 合格 if every item is, and left
+  undetermined otherwise
+
+Units are stripped, the measured value is assumed to be in the unit of the
+limit. "不得检出" and "<检出限" pass below the item's detection limit ("≤检出限"
+also at it; only at 0 when it has none), "阳性" requires a value at or
+above it.
+"""
+import math
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - the loop below is used instead
+    numpy = None
+
+PASS = "合格"
+FAIL = "不合格"
+
+# Rule kinds
+NUMERIC = 0
+NEGATIVE = 1
+POSITIVE = 2
+
+_NUMBER = r"(\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"
+
+_TRANSLATION = str.maketrans({
+    "＜": "<", "＞": ">", "≦": "≤", "≧": "≥", "＝": "=",
+    "～": "~", "－": "-", "—": "-", "–": "-", "．": ".", " ": "", "　": "",
+})
+
+# Longest first: "不大于" must not be read as "大于"
+_WORDS = (
+    ("<=", "≤"), (">=", "≥"),
+    ("不大于", "≤"), ("不超过", "≤"), ("不高于", "≤"), ("小于等于", "≤"),
+    ("不小于", "≥"), ("不低于", "≥"), ("大于等于", "≥"),
+    ("小于", "<"), ("低于", "<"), ("大于", ">"), ("高于", ">"),
+)
+
+_BOUND_RE = re.compile(r"^([≤<≥>])" + _NUMBER)
+_RANGE_RE = re.compile(r"^" + _NUMBER + r"[^\d.]*?(?:-|~|至)" + _NUMBER)
+_LEADING_NUMBER_RE = re.compile(r"^" + _NUMBER)
+_NOT_DETECTED_RE = re.compile(r"不得检出|未检出|阴性|^ND(?![a-z])", re.IGNORECASE)
+# "≤检出限", "<检出限" (also "低于检出限"), "检出限以下": below the limit, not "检出"
+_BELOW_LIMIT_RE = re.compile(r"^[<≤]检出限|检出限以下")
+_DETECTED_RE = re.compile(r"检出|阳性")
+
+
+class Rule(NamedTuple):
+    """Compiled limit: the measured value must lie in the interval (lo, hi)"""
+    kind: int
+    lo: float
+    hi: float
+    lo_inclusive: bool
+    hi_inclusive: bool
+
+
+class Measurement(NamedTuple):
+    """
+    Parsed measured value
+
+    value is -inf when not detected, +inf when only reported as detected
+    (qualitative) and NaN when it cannot be read.
+    """
+    value: float
+    qualitative: bool
+
+
+class ItemJudgement(NamedTuple):
+    rule: Optional[Rule]
+    result: Optional[str]
+
+
+def _normalize(text: str) -> str:
+    text = text.strip().translate(_TRANSLATION)
+    for word, symbol in _WORDS:
+        text = text.replace(word, symbol)
+    return text
+
+
+def parse_number(text: Optional[str]) -> Optional[float]:
+    """Leading number of a value such as "0.01mg/kg", if any"""
+    if not text:
+        return None
+    match = _LEADING_NUMBER_RE.match(_normalize(text))
+    return float(match.group(1)) if match else None
+
+
+@lru_cache(maxsize=4096)
+def parse_rule(expression: Optional[str], detection_limit: Optional[str] = None) -> Optional[Rule]:
+    """
+    Compile a limit expression
+
+    Args:
+        expression: item_indicator or reference_value
+        detection_limit: The item's detection limit, bounding "不得检出"/"阴性"/"阳性"
+
+    Returns:
+        The compiled rule, or None if the expression is not understood
+    """
+    if not expression:
+        return None
+    text = _normalize(expression)
+
+    match = _BOUND_RE.match(text)
+    if match:
+        symbol, value = match.group(1), float(match.group(2))
+        if symbol in "≤<":
+            return Rule(NUMERIC, -math.inf, value, True, symbol == "≤")
+        return Rule(NUMERIC, value, math.inf, symbol == "≥", True)
+
+    match = _RANGE_RE.match(text)
+    if match:
+        lo, hi = float(match.group(1)), float(match.group(2))
+        if lo <= hi:
+            return Rule(NUMERIC, lo, hi, True, True)
+        return None
+
+    limit = parse_number(detection_limit)
+    if _BELOW_LIMIT_RE.search(text) or _NOT_DETECTED_RE.search(text):
+        if limit:
+            return Rule(NEGATIVE, -math.inf, limit, True, text.startswith("≤检出限"))
+        return Rule(NEGATIVE, -math.inf, 0.0, True, True)
+    if _DETECTED_RE.search(text):
+        if limit:
+            return Rule(POSITIVE, limit, math.inf, True, True)
+        return Rule(POSITIVE, 0.0, math.inf, False, True)
+    return None
+
+
+@lru_cache(maxsize=4096)
+def parse_measurement(num: Optional[str]) -> Measurement:
+    """Parse a measured value (CheckObjectItem.num)"""
+    if not num:
+        return Measurement(math.nan, False)
+    text = _normalize(num)
+
+    if _NOT_DETECTED_RE.search(text) or _BELOW_LIMIT_RE.search(text) or re.match(r"^[<≤]" + _NUMBER, text):
+        return Measurement(-math.inf, True)
+    if _DETECTED_RE.search(text):
+        return Measurement(math.inf, True)
+
+    value = parse_number(text)
+    return Measurement(math.nan if value is None else value, False)
+
+
+def item_rule(
+    item_indicator: Optional[str],
+    reference_value: Optional[str],
+    detection_limit: Optional[str]
+) -> Optional[Rule]:
+    """Rule of an item: its indicator when understood, else its reference value"""
+    return parse_rule(item_indicator, detection_limit) or parse_rule(reference_value, detection_limit)
+
+
+def _judge_one(rule: Optional[Rule], measurement: Measurement) -> Optional[str]:
+    value = measurement.value
+    if rule is None or math.isnan(value):
+        return None
+    # "检出" says nothing about the amount
+    if measurement.qualitative and value == math.inf and rule.kind == NUMERIC:
+        return None
+    above_lo = value > rule.lo or (rule.lo_inclusive and value == rule.lo)
+    below_hi = value < rule.hi or (rule.hi_inclusive and value == rule.hi)
+    return PASS if above_lo and below_hi else FAIL
+
+
+def _judge_arrays(rules: Sequence[Optional[Rule]], measurements: Sequence[Measurement]) -> List[Optional[str]]:
+    missing = Rule(NUMERIC, math.nan, math.nan, False, False)
+    known = numpy.array([rule is not None for rule in rules], dtype=bool)
+    kind, lo, hi, lo_inclusive, hi_inclusive = (
+        numpy.array(column) for column in zip(*(rule or missing for rule in rules))
+    )
+    value = numpy.array([m.value for m in measurements], dtype=float)
+    qualitative = numpy.array([m.qualitative for m in measurements], dtype=bool)
+
+    determined = known & ~numpy.isnan(value) & ~(qualitative & (value == numpy.inf) & (kind == NUMERIC))
+    passed = (
+        ((value > lo) | (lo_inclusive & (value == lo)))
+        & ((value < hi) | (hi_inclusive & (value == hi)))
+    )
+    return [
+        (PASS if ok else FAIL) if done else None
+        for ok, done in zip(passed.tolist(), determined.tolist())
+    ]
+
+
+def judge_items(
+    items: Sequence[Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]],
+    vectorized: Optional[bool] = None
+) -> List[ItemJudgement]:
+    """
+    Judge a batch of items
+
+    Args:
+        items: (num, item_indicator, reference_value, detection_limit) per item
+        vectorized: Force (True) or avoid (False) NumPy; default when installed
+
+    Returns:
+        Rule and 合格/不合格/None (undetermined) per item, in order
+    """
+    rules = [item_rule(indicator, reference, limit) for _, indicator, reference, limit in items]
+    measurements = [parse_measurement(num) for num, _, _, _ in items]
+
+    if vectorized is None:
+        vectorized = numpy is not None
+    if vectorized and items:
+        results = _judge_arrays(rules, measurements)
+    else:
+        results = [_judge_one(rule, m) for rule, m in zip(rules, measurements)]
+    return [ItemJudgement(rule, result) for rule, result in zip(rules, results)]
+
+
+def sample_result(item_results: Sequence[Optional[str]]) -> Optional[str]:
+    """Overall result of a sample from its item results"""
+    if FAIL in item_results:
+        return FAIL
+    if item_results and all(result == PASS for result in item_results):
+        return PASS
+    return None
+
+
+def describe_rule(rule: Optional[Rule]) -> Optional[str]:
+    """Readable form of a compiled rule, e.g. "≤0.2" or "[1.0, 2.5]" """
+    if rule is None:
+        return None
+    if rule.lo == -math.inf:
+        return f"{'≤' if rule.hi_inclusive else '<'}{rule.hi:g}"
+    if rule.hi == math.inf:
+        return f"{'≥' if rule.lo_inclusive else '>'}{rule.lo:g}"
+    return f"{'[' if rule.lo_inclusive else '('}{rule.lo:g}, {rule.hi:g}{']' if rule.hi_inclusive else ')'}"
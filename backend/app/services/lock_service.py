@@ -0,0 +1,190 @@
+"""
+Distributed Lock Service
+- LeaseLock: named lease row in distributed_locks, safe across workers and nodes
+- Heartbeat thread renews the lease while the holder is alive
+- Leases of crashed holders expire and can be taken over (stale-lock recovery)
+- Expiry is always computed and checked against the database clock, so
+  nodes with skewed clocks agree on when a lease has expired
+"""
+import os
+import uuid
+import socket
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.distributed_lock import DistributedLock
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process in lock rows
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _database_now(db: Session) -> datetime:
+    """Current time according to the database, shared by every node"""
+    return db.scalar(select(func.now()))
+
+
+class LockNotAcquired(Exception):
+    """Raised when a lease is held by another owner"""
+
+
+class LeaseLock:
+    """
+    Named lease stored in the distributed_locks table
+
+    acquire() inserts the row, or takes it over when the previous lease has
+    expired. While held, a heartbeat thread extends expires_at every
+    ttl/3 seconds; if a renewal fails (lease lost to another owner or the
+    database is unreachable) `lost` is set so long-running work can stop.
+
+    Each call uses its own short session, so lock bookkeeping never commits
+    or rolls back the caller's transaction.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        session_factory: Callable[[], Session],
+        ttl_seconds: Optional[int] = None,
+        heartbeat: bool = True
+    ):
+        self.name = name
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl_seconds or settings.DISTRIBUTED_LOCK_TTL_SECONDS)
+        self.heartbeat = heartbeat
+        self.owner = f"{PROCESS_ID}:{uuid.uuid4().hex[:8]}"
+        self.held = False
+        self.lost = threading.Event()
+        self._stop_heartbeat = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    def acquire(self) -> bool:
+        """Try to take the lease without blocking; True if now held by this owner"""
+        db = self.session_factory()
+        try:
+            now = _database_now(db)
+            try:
+                db.add(DistributedLock(
+                    name=self.name,
+                    owner=self.owner,
+                    acquired_at=now,
+                    expires_at=now + self.ttl
+                ))
+                db.commit()
+                acquired = True
+            except IntegrityError:
+                db.rollback()
+                # Row exists: take it over only if the lease has expired (or is already ours)
+                result = db.execute(
+                    update(DistributedLock)
+                    .where(
+                        DistributedLock.name == self.name,
+                        (DistributedLock.expires_at < now) | (DistributedLock.owner == self.owner)
+                    )
+                    .values(owner=self.owner, acquired_at=now, expires_at=now + self.ttl)
+                )
+                db.commit()
+                acquired = result.rowcount == 1
+                if acquired:
+                    logger.warning(f"Recovered stale lock '{self.name}'")
+        finally:
+            db.close()
+
+        if acquired:
+            self.held = True
+            self.lost.clear()
+            if self.heartbeat:
+                self._start_heartbeat()
+        return acquired
+
+    def renew(self) -> bool:
+        """Extend the lease; False if it is no longer held by this owner"""
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(DistributedLock)
+                .where(DistributedLock.name == self.name, DistributedLock.owner == self.owner)
+                .values(expires_at=_database_now(db) + self.ttl)
+            )
+            db.commit()
+            return result.rowcount == 1
+        finally:
+            db.close()
+
+    def release(self):
+        """Stop the heartbeat and delete the lease if still ours"""
+        self._stop_heartbeat.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join(timeout=5)
+            self._heartbeat_thread = None
+        if not self.held:
+            return
+        self.held = False
+
+        db = self.session_factory()
+        try:
+            db.execute(
+                delete(DistributedLock)
+                .where(DistributedLock.name == self.name, DistributedLock.owner == self.owner)
+            )
+            db.commit()
+        except Exception as e:
+            # The lease simply expires if it cannot be deleted
+            logger.error(f"Failed to release lock '{self.name}': {e}")
+        finally:
+            db.close()
+
+    @contextmanager
+    def hold(self) -> Iterator["LeaseLock"]:
+        """
+        Hold the lease for the duration of the block
+
+        Raises:
+            LockNotAcquired: If another owner holds an unexpired lease
+        """
+        if not self.acquire():
+            raise LockNotAcquired(f"Lock '{self.name}' is held by another process")
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def _start_heartbeat(self):
+        self._stop_heartbeat.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop,
+            name=f"lock-heartbeat-{self.name}",
+            daemon=True
+        )
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self):
+        interval = self.ttl.total_seconds() / 3
+        while not self._stop_heartbeat.wait(interval):
+            try:
+                renewed = self.renew()
+            except Exception as e:
+                logger.error(f"Lock '{self.name}' heartbeat failed: {e}")
+                continue
+            if not renewed:
+                logger.error(f"Lock '{self.name}' was lost to another owner")
+                self.held = False
+                self.lost.set()
+                return
+
+
+def lease_is_held(name: str, db: Session) -> bool:
+    """Whether any owner holds an unexpired lease named name"""
+    return db.query(DistributedLock).filter(
+        DistributedLock.name == name,
+        DistributedLock.expires_at >= _database_now(db)
+    ).first() is not None
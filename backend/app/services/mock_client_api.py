@@ -1,87 +1,220 @@
 """
 Mock Client API Service for Development/Testing
 提供模拟的客户 API 响应数据，用于开发和测试
+
+- get_mock_check_objects: 分页返回模拟检测对象 (默认25条, 每条3个检测项目), 可按采样时间窗口筛选
+- generate_check_objects: 按种子生成可复现的大批量数据, 供基准测试和压测使用
+- to_upstream_format: 转换为客户 API 原始格式 (objectItems/checkItem), 供 app.mock_upstream 使用
 """
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timedelta
+import bisect
 import random
+import threading
+
+# 生成模拟样品名称列表
+SAMPLE_NAMES = [
+    "猪肉", "牛肉", "鸡蛋", "白菜", "萝卜",
+    "菠菜", "番茄", "黄瓜", "大米", "面粉",
+    "食用油", "酱油", "醋", "白糖", "食盐"
+]
+
+# 生成模拟公司名称
+COMPANIES = [
+    "XX农产品有限公司",
+    "XX食品批发市场",
+    "XX超市有限公司",
+    "XX农贸市场",
+    "XX食品加工厂"
+]
+
+# 模拟检测项目 (名称, 方法, 参考值)
+CHECK_ITEMS = [
+    ("铅", "GB 5009.12-2017", "≤0.2mg/kg"),
+    ("镉", "GB 5009.15-2014", "≤0.1mg/kg"),
+    ("总汞", "GB 5009.17-2021", "≤0.01mg/kg"),
+    ("无机砷", "GB 5009.11-2014", "≤0.2mg/kg"),
+    ("毒死蜱", "GB 23200.113-2018", "≤0.02mg/kg"),
+    ("克伦特罗", "GB/T 22286-2008", "不得检出"),
+    ("氯霉素", "GB/T 22338-2008", "不得检出"),
+    ("亚硝酸盐", "GB 5009.33-2016", "≤30mg/kg"),
+]
 
 
 class MockClientAPIService:
     """提供模拟的客户 API 数据"""
 
-    @staticmethod
-    def get_mock_check_objects(page: int = 1, page_size: int = 50) -> Dict:
+    def __init__(
+        self,
+        total: int = 25,
+        items_per_object: int = 3,
+        seed: Optional[int] = None,
+        base_date: Optional[datetime] = None
+    ):
+        """
+        Args:
+            total: 数据集样品总数
+            items_per_object: 每个样品的检测项目数
+            seed: 随机种子, 指定后同一下标始终生成相同数据; None 时每次随机
+            base_date: 采样时间起点, 默认为30天前
+        """
+        self.total = total
+        self.items_per_object = items_per_object
+        self.seed = seed
+        self.base_date = base_date or (datetime.now() - timedelta(days=30))
+        self._timeline: Optional[List] = None
+        self._timeline_lock = threading.Lock()
+
+    def get_mock_check_objects(
+        self,
+        page: int = 1,
+        page_size: int = 50,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Dict:
         """
         生成模拟的检测对象数据
 
         Args:
             page: 页码
             page_size: 每页数量
+            start_time: 采样时间下限 (含), 指定时间窗口时按采样时间升序返回
+            end_time: 采样时间上限 (含)
 
         Returns:
-            模拟的 API 响应数据
+            模拟的 API 响应数据, total 为窗口内 (或全部) 样品数
         """
-        # 生成模拟样品名称列表
-        sample_names = [
-            "猪肉", "牛肉", "鸡蛋", "白菜", "萝卜",
-            "菠菜", "番茄", "黄瓜", "大米", "面粉",
-            "食用油", "酱油", "醋", "白糖", "食盐"
-        ]
-
-        # 生成模拟公司名称
-        companies = [
-            "XX农产品有限公司",
-            "XX食品批发市场",
-            "XX超市有限公司",
-            "XX农贸市场",
-            "XX食品加工厂"
-        ]
-
-        # 生成模拟数据
-        mock_items = []
-        base_date = datetime.now() - timedelta(days=30)
-
-        total_items = 25  # 总共生成25个样品
-        start_idx = (page - 1) * page_size
-        end_idx = min(start_idx + page_size, total_items)
-
-        for i in range(start_idx, end_idx):
-            check_object_id = 10000 + i
-            sample_name = random.choice(sample_names)
-            company_name = random.choice(companies)
-            sampling_date = base_date + timedelta(days=random.randint(0, 30))
-
-            mock_items.append({
-                "check_object_id": check_object_id,
-                "check_object_union_num": f"JC{check_object_id}",
-                "day_num": sampling_date.strftime("%Y%m%d"),
-                "submission_goods_name": sample_name,
-                "submission_person_company": company_name,
-                "submission_person": "张三",
-                "submission_person_mobile": "13800138000",
-                "check_type": "常规检测",
-                "status": 0,  # 待检测
-                "sampling_time": sampling_date.isoformat(),
-                "check_items": [
-                    {
-                        "check_object_item_id": check_object_id * 100 + j,
-                        "check_item_id": 1000 + j,
-                        "check_item_name": f"检测项目{j+1}",
-                        "method_name": "国标GB/T xxx",
-                        "reference_value": "≤10mg/kg"
-                    }
-                    for j in range(3)  # 每个样品3个检测项目
-                ]
-            })
+        if start_time is not None or end_time is not None:
+            result = self.query(start_time or datetime.min, end_time or datetime.max, page, page_size)
+            mock_items, total = result["list"], result["count"]
+        else:
+            start_idx = (page - 1) * page_size
+            end_idx = min(start_idx + page_size, self.total)
+            mock_items = [self.generate_check_object(i) for i in range(start_idx, end_idx)]
+            total = self.total
 
         return {
             "code": 0,
             "msg": "success",
             "data": {
                 "list": mock_items,
-                "total": total_items,
+                "total": total,
                 "page": page,
                 "page_size": page_size
             }
         }
+
+    def timeline(self) -> List:
+        """整个数据集的 (采样时间, 下标), 按时间排序; 只构建一次"""
+        with self._timeline_lock:
+            if self._timeline is None:
+                self._timeline = sorted(
+                    (self.sampling_time(index), index) for index in range(self.total)
+                )
+            return self._timeline
+
+    def query(self, start_time: datetime, end_time: datetime, page: int = 1, limit: int = 50) -> Dict:
+        """采样时间在 [start_time, end_time] 内的一页检测对象, 按采样时间升序"""
+        timeline = self.timeline()
+        low = bisect.bisect_left(timeline, (start_time, -1))
+        high = bisect.bisect_right(timeline, (end_time, self.total))
+        offset = low + (page - 1) * limit
+        return {
+            "count": high - low,
+            "list": [
+                self.generate_check_object(index)
+                for _, index in timeline[offset:min(offset + limit, high)]
+            ],
+        }
+
+    def generate_check_objects(self, start: int = 0, count: Optional[int] = None) -> Iterator[Dict]:
+        """
+        按下标顺序生成检测对象
+
+        Args:
+            start: 起始下标
+            count: 生成数量, 默认到数据集末尾
+        """
+        end = self.total if count is None else min(start + count, self.total)
+        for index in range(start, end):
+            yield self.generate_check_object(index)
+
+    def generate_check_object(self, index: int) -> Dict:
+        """
+        生成下标为 index 的检测对象 (客户 API 原始格式)
+
+        指定 seed 时结果只取决于 (seed, index), 可以任意顺序或并发生成
+        """
+        rng = self._rng(index)
+
+        check_object_id = 10000 + index
+        sampling_date = self._sampling_time(rng)
+
+        return {
+            "check_object_id": check_object_id,
+            "check_object_union_num": f"JC{check_object_id}",
+            "day_num": sampling_date.strftime("%Y%m%d"),
+            "submission_goods_name": rng.choice(SAMPLE_NAMES),
+            "submission_person_company": rng.choice(COMPANIES),
+            "submission_person": "张三",
+            "submission_person_mobile": "13800138000",
+            "check_type": "常规检测",
+            "status": 0,  # 待检测
+            "sampling_time": sampling_date.isoformat(),
+            "check_items": self._generate_check_items(check_object_id, rng)
+        }
+
+    def sampling_time(self, index: int) -> datetime:
+        """下标为 index 的检测对象的采样时间, 不生成完整对象"""
+        return self._sampling_time(self._rng(index))
+
+    @staticmethod
+    def to_upstream_format(check_object: Dict) -> Dict:
+        """
+        转换为客户 API 原始返回格式
+
+        与 /admin/api/test/check/data 实际返回一致: 编号为 check_no,
+        检测项目位于 objectItems[].checkItem
+        """
+        upstream = {
+            key: value for key, value in check_object.items()
+            if key not in ("check_object_union_num", "check_items", "sampling_time")
+        }
+        upstream["check_no"] = check_object["check_object_union_num"]
+        upstream["check_start_time"] = check_object["sampling_time"].replace("T", " ")
+        upstream["objectItems"] = [
+            {
+                "id": item["check_object_item_id"],
+                "checkItem": {
+                    "item_id": item["check_item_id"],
+                    "name": item["check_item_name"],
+                    "method_name": item["method_name"],
+                    "reference_values": item["reference_value"],
+                }
+            }
+            for item in check_object["check_items"]
+        ]
+        return upstream
+
+    def _rng(self, index: int):
+        return random.Random(f"{self.seed}:{index}") if self.seed is not None else random
+
+    def _sampling_time(self, rng) -> datetime:
+        # Must stay the first draws from rng so sampling_time() matches generate_check_object()
+        return self.base_date + timedelta(
+            days=rng.randint(0, 30),
+            seconds=rng.randint(0, 86399)
+        )
+
+    def _generate_check_items(self, check_object_id: int, rng) -> List[Dict]:
+        items = []
+        for j in range(self.items_per_object):
+            name, method, reference = CHECK_ITEMS[(j + rng.randint(0, len(CHECK_ITEMS) - 1)) % len(CHECK_ITEMS)]
+            items.append({
+                "check_object_item_id": check_object_id * 100 + j,
+                "check_item_id": 1000 + j,
+                "check_item_name": name,
+                "method_name": method,
+                "reference_value": reference
+            })
+        return items
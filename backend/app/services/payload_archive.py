@@ -0,0 +1,162 @@
+"""
+Raw upstream payload archive
+
+Every check object page fetched from the client API is appended, exactly
+as received, to a gzip file per fetch day (pages-YYYY-MM-DD.gz). Each page
+is its own gzip member holding one JSON metadata line followed by the raw
+response body, so files are append-only, readable with plain `zcat`, and
+a crash can at worst leave a truncated last member.
+
+Archived pages can be replayed through the current parser and upsert path
+(python -m app.cli.replay) after a mapping fix, without refetching. Fetch
+days older than SYNC_ARCHIVE_RETENTION_DAYS are deleted by the nightly
+archive job.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_FILE_PATTERN = re.compile(r"^pages-(\d{4}-\d{2}-\d{2})\.gz$")
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+_READ_SIZE = 1024 * 1024
+
+
+class PageRecorder:
+    """Compresses one page as it streams; appended to the archive only if complete"""
+
+    def __init__(self, metadata: Dict):
+        self.metadata = metadata
+        self.complete = False
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, _GZIP_WBITS)
+        header = json.dumps(metadata, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+        self._parts: List[bytes] = [self._compressor.compress(header)]
+
+    def tee(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Pass chunks through, compressing a copy; marks the page complete at the end"""
+        for chunk in chunks:
+            self._parts.append(self._compressor.compress(chunk))
+            yield chunk
+        self.complete = True
+
+    def member(self) -> bytes:
+        """The page as one gzip member"""
+        return b"".join(self._parts) + self._compressor.flush()
+
+
+class PayloadArchive:
+    """Append-only archive of raw upstream pages"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.SYNC_ARCHIVE_PATH or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "uploads", "sync_archive"
+        )
+        self._lock = threading.Lock()
+
+    def path_for(self, day: date) -> str:
+        return os.path.join(self.directory, f"pages-{day.isoformat()}.gz")
+
+    @contextmanager
+    def record(self, **metadata) -> Iterator[PageRecorder]:
+        """
+        Record one page: feed its body through recorder.tee()
+
+        The page is appended when the block exits normally after the whole
+        body has passed through tee(); failed or partially read pages are
+        dropped. Archive write errors are logged, never raised.
+        """
+        metadata.setdefault("fetched_at", datetime.now().isoformat(timespec="seconds"))
+        recorder = PageRecorder(metadata)
+        yield recorder
+        if recorder.complete:
+            self.append(recorder)
+
+    def append(self, recorder: PageRecorder):
+        try:
+            member = recorder.member()
+            os.makedirs(self.directory, exist_ok=True)
+            # One write per page in append mode, so concurrent writers never interleave
+            with self._lock, open(self.path_for(date.today()), "ab") as f:
+                f.write(member)
+        except OSError as e:
+            logger.error(f"Failed to archive upstream page: {e}")
+
+    def files(self, since: Optional[date] = None, until: Optional[date] = None) -> List[str]:
+        """Archive files for fetch days in [since, until], oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        selected = []
+        for name in sorted(os.listdir(self.directory)):
+            match = _FILE_PATTERN.match(name)
+            if not match:
+                continue
+            day = date.fromisoformat(match.group(1))
+            if (since is None or day >= since) and (until is None or day <= until):
+                selected.append(os.path.join(self.directory, name))
+        return selected
+
+    def expire(self, before: date) -> int:
+        """Delete archive files for fetch days before the given day; returns the number deleted"""
+        expired = 0
+        for path in self.files(until=before - timedelta(days=1)):
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.error(f"Failed to delete payload archive {path}: {e}")
+                continue
+            expired += 1
+            logger.info(f"Expired payload archive {os.path.basename(path)}")
+        return expired
+
+    def iter_pages(
+        self,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> Iterator[Tuple[Dict, bytes]]:
+        """Yield (metadata, raw body) of archived pages in fetch order"""
+        for path in self.files(since, until):
+            yield from _read_members(path)
+
+
+def _read_members(path: str) -> Iterator[Tuple[Dict, bytes]]:
+    with open(path, "rb") as f:
+        decompressor = zlib.decompressobj(_GZIP_WBITS)
+        parts: List[bytes] = []
+        pending = b""
+        while True:
+            data = pending or f.read(_READ_SIZE)
+            pending = b""
+            if not data:
+                break
+            parts.append(decompressor.decompress(data))
+            if decompressor.eof:
+                header, _, body = b"".join(parts).partition(b"\n")
+                yield json.loads(header), body
+                pending = decompressor.unused_data
+                decompressor = zlib.decompressobj(_GZIP_WBITS)
+                parts = []
+        if parts:
+            logger.warning(f"Ignoring truncated page at the end of {path}")
+
+
+_payload_archive: Optional[PayloadArchive] = None
+_payload_archive_lock = threading.Lock()
+
+
+def get_payload_archive() -> PayloadArchive:
+    """Get the global payload archive"""
+    global _payload_archive
+    if _payload_archive is None:
+        with _payload_archive_lock:
+            if _payload_archive is None:
+                _payload_archive = PayloadArchive()
+    return _payload_archive
@@ -0,0 +1,238 @@
+"""
+Report Preview Service
+- Render first-page thumbnail and page count for uploaded PDF reports
+- Background generation fed from FileService.save_pdf_report
+- Disk cache with LRU eviction bounded by PREVIEW_CACHE_MAX_MB
+"""
+import os
+import re
+import json
+import uuid
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from app.config import settings
+
+try:
+    import pymupdf
+except ImportError:  # pragma: no cover - rendering is optional
+    pymupdf = None
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
+
+# Fallback page counting when PyMuPDF is not installed
+_PAGE_OBJECT_RE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+
+
+class ReportPreviewService:
+    """Generates and caches report thumbnails keyed by report file name"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_cache_bytes: Optional[int] = None,
+        thumbnail_width: Optional[int] = None
+    ):
+        self.cache_dir = cache_dir or os.path.join(UPLOAD_DIR, "previews")
+        self.max_cache_bytes = (
+            max_cache_bytes if max_cache_bytes is not None
+            else settings.PREVIEW_CACHE_MAX_MB * 1024 * 1024
+        )
+        self.thumbnail_width = thumbnail_width or settings.PREVIEW_THUMBNAIL_WIDTH
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # key -> bytes on disk (thumbnail + metadata), least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    @property
+    def can_render(self) -> bool:
+        """Whether thumbnails can be rendered (PyMuPDF installed)"""
+        return pymupdf is not None
+
+    def cache_key(self, pdf_path: str) -> str:
+        """Cache key for a report: its unique file name without extension"""
+        return os.path.splitext(os.path.basename(pdf_path))[0]
+
+    def enqueue(self, pdf_path: str):
+        """Schedule background preview generation for a saved report"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-preview")
+        self._executor.submit(self._generate_quietly, pdf_path)
+
+    def get_preview(self, pdf_path: str) -> Optional[Dict]:
+        """
+        Get the cached preview for a report, generating it if missing
+
+        Args:
+            pdf_path: Absolute path of the PDF report
+
+        Returns:
+            {"page_count": int, "thumbnail_path": str | None} or None if
+            the file is not a readable PDF
+        """
+        key = self.cache_key(pdf_path)
+        metadata = self._read_metadata(key)
+        if metadata is None:
+            metadata = self.generate(pdf_path)
+            if metadata is None:
+                return None
+        else:
+            self._touch(key)
+
+        thumbnail_path = self._thumbnail_path(key)
+        return {
+            "page_count": metadata["page_count"],
+            "thumbnail_path": thumbnail_path if os.path.isfile(thumbnail_path) else None,
+        }
+
+    def generate(self, pdf_path: str) -> Optional[Dict]:
+        """
+        Render thumbnail and page count for a report into the cache
+
+        Returns:
+            Metadata dictionary, or None if the PDF cannot be read
+        """
+        key = self.cache_key(pdf_path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        if pymupdf is not None:
+            try:
+                with pymupdf.open(pdf_path) as document:
+                    page_count = document.page_count
+                    if page_count == 0:
+                        return None
+                    page = document.load_page(0)
+                    zoom = self.thumbnail_width / max(page.rect.width, 1)
+                    pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+                    self._write_atomic(self._thumbnail_path(key), pixmap.tobytes("png"))
+            except Exception as e:
+                logger.warning(f"Failed to render preview for {pdf_path}: {e}")
+                return None
+        else:
+            page_count = self._count_pages(pdf_path)
+            if page_count is None:
+                return None
+
+        metadata = {"page_count": page_count}
+        self._write_atomic(self._metadata_path(key), json.dumps(metadata).encode("utf-8"))
+        self._register(key)
+        return metadata
+
+    def _generate_quietly(self, pdf_path: str):
+        try:
+            self.generate(pdf_path)
+        except Exception as e:
+            logger.error(f"Background preview generation failed for {pdf_path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Cache bookkeeping
+    # ------------------------------------------------------------------
+
+    def _thumbnail_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _metadata_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _entry_size(self, key: str) -> int:
+        size = 0
+        for path in (self._thumbnail_path(key), self._metadata_path(key)):
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    def _load_index(self):
+        """Rebuild the LRU order from metadata file modification times"""
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.name[:-5])
+                for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and entry.name.endswith(".json")
+            ]
+        except FileNotFoundError:
+            return
+
+        for _, key in sorted(entries):
+            size = self._entry_size(key)
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _read_metadata(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._metadata_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _register(self, key: str):
+        size = self._entry_size(key)
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def _touch(self, key: str):
+        """Mark an entry as recently used, persisting the order via mtime"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(self._metadata_path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop least recently used entries until under budget (caller holds the lock)"""
+        while self._total_bytes > self.max_cache_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            for path in (self._thumbnail_path(key), self._metadata_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _write_atomic(path: str, content: bytes):
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _count_pages(pdf_path: str) -> Optional[int]:
+        """Count page objects without a PDF library (uncompressed object streams only)"""
+        try:
+            with open(pdf_path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        if not content.startswith(b"%PDF"):
+            return None
+        return len(_PAGE_OBJECT_RE.findall(content)) or 1
+
+
+# Global preview service instance
+_preview_service: Optional[ReportPreviewService] = None
+_preview_service_lock = threading.Lock()
+
+
+def get_preview_service() -> ReportPreviewService:
+    """Get or create the report preview service instance"""
+    global _preview_service
+    if _preview_service is None:
+        with _preview_service_lock:
+            if _preview_service is None:
+                _preview_service = ReportPreviewService()
+    return _preview_service
@@ -0,0 +1,192 @@
+"""
+Reconciliation of local check objects with the client API
+
+Walks the sampling-time range one calendar day at a time. For each day
+the upstream objects are streamed and reduced to compact digests (check
+number -> normalized upstream-owned fields), the local rows of that day
+are loaded as the same digests, and the two are compared with set
+operations:
+
+- missing: upstream only, written locally
+- changed: upstream fields differ from a local row that is not submitted,
+  rewritten through the sync pipeline
+- local_only: local only (deleted upstream, or its sampling time moved),
+  reported
+- unreflected: submitted locally (status 2) but still pending upstream,
+  reported
+
+Only the differing objects are kept in full, and only until their day is
+repaired, so memory is bounded by the busiest day, not the range.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.check_object import CheckObject
+from app.services.client_api_service import CHECK_OBJECT_FIELDS, ClientAPIService
+from app.services.sync_pipeline import SyncPipeline, UpstreamError, Window
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Written locally by lab work and submission, so never compared with upstream
+LOCAL_FIELDS = ("status", "check_result", "check_result_url", "check_end_time")
+DIGEST_FIELDS = tuple(field[0] for field in CHECK_OBJECT_FIELDS if field[0] not in LOCAL_FIELDS)
+
+DRIFT_KINDS = ("missing", "changed", "local_only", "unreflected")
+
+RECONCILE_DRIFT = REGISTRY.gauge(
+    "reconcile_drift_objects",
+    "Check objects found differing from upstream by the last reconciliation, by kind",
+    ["kind"],
+)
+RECONCILE_REPAIRED = REGISTRY.counter(
+    "reconcile_repaired_objects_total",
+    "Check objects rewritten from upstream by reconciliation",
+)
+
+Digest = Tuple
+
+
+def _normalize(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+def digest(values: Dict) -> Digest:
+    """Comparable upstream-owned fields of a parsed object or local row"""
+    return tuple(_normalize(values.get(field)) for field in DIGEST_FIELDS)
+
+
+def differs(upstream: Digest, local: Digest) -> bool:
+    """Whether a sync would change the local row (upstream None values are never written)"""
+    return any(up is not None and up != mine for up, mine in zip(upstream, local))
+
+
+class Reconciler:
+    """Compare and repair one sampling-time range, a day window at a time"""
+
+    def __init__(
+        self,
+        db: Session,
+        client_api_service: ClientAPIService,
+        start_time: datetime,
+        end_time: datetime,
+        page_size: Optional[int] = None
+    ):
+        self.db = db
+        self.client = client_api_service
+        self.start_time = start_time
+        self.end_time = end_time
+        self.page_size = page_size or settings.SYNC_PAGE_SIZE
+        self.pipeline = SyncPipeline(db, client_api_service)
+        self.report = {
+            "days": 0,
+            "requests": 0,
+            "upstream_count": 0,
+            "local_count": 0,
+            **{kind: 0 for kind in DRIFT_KINDS},
+        }
+
+    def run(self) -> Dict:
+        """
+        Reconcile every day of the range
+
+        Returns:
+            Drift counts plus the pipeline's new_count/updated_count of repaired rows
+
+        Raises:
+            UpstreamError: If the client API reports an error
+            Exception: On network or database errors (repaired days are kept)
+        """
+        for start, end in self.days():
+            self._reconcile_day(start, end)
+            self.report["days"] += 1
+
+        for kind in DRIFT_KINDS:
+            RECONCILE_DRIFT.set(kind, value=self.report[kind])
+        return self.result()
+
+    def result(self) -> Dict:
+        return {
+            **self.report,
+            "fetched_count": self.pipeline.fetched_count,
+            "new_count": self.pipeline.new_count,
+            "updated_count": self.pipeline.updated_count,
+        }
+
+    def days(self) -> Iterator[Window]:
+        """Calendar-day windows (inclusive, second resolution) covering the range"""
+        start = self.start_time
+        while start <= self.end_time:
+            next_day = datetime.combine(start.date() + timedelta(days=1), datetime.min.time())
+            yield start, min(next_day - timedelta(seconds=1), self.end_time)
+            start = next_day
+
+    def _reconcile_day(self, start: datetime, end: datetime):
+        local = self._local_digests(start, end)
+        seen = set()
+        repairs: List[Dict] = []
+
+        for parsed in self._upstream(start, end):
+            union_num = parsed.get("check_object_union_num")
+            seen.add(union_num)
+            mine = local.get(union_num)
+            if mine is None:
+                self.report["missing"] += 1
+                repairs.append(parsed)
+            elif mine[0] == 2:
+                if not parsed.get("status") and not parsed.get("check_result"):
+                    self.report["unreflected"] += 1
+            elif differs(digest(parsed), mine[1]):
+                self.report["changed"] += 1
+                repairs.append(parsed)
+
+        local_only = local.keys() - seen
+        self.report["upstream_count"] += len(seen)
+        self.report["local_count"] += len(local)
+        self.report["local_only"] += len(local_only)
+        if local_only:
+            logger.info(f"Reconcile {start.date()}: {len(local_only)} local objects not upstream")
+
+        if repairs:
+            self.pipeline.write_pages([repairs])
+            RECONCILE_REPAIRED.inc(amount=len(repairs))
+            logger.info(f"Reconcile {start.date()}: repaired {len(repairs)} objects")
+
+    def _local_digests(self, start: datetime, end: datetime) -> Dict[str, Tuple[int, Digest]]:
+        columns = [CheckObject.check_object_union_num, CheckObject.status] + [
+            getattr(CheckObject, field) for field in DIGEST_FIELDS
+        ]
+        rows = self.db.query(*columns).filter(
+            CheckObject.check_start_time >= start,
+            CheckObject.check_start_time <= end
+        ).yield_per(1000)
+        return {
+            row[0]: (row[1], tuple(_normalize(value) for value in row[2:]))
+            for row in rows
+        }
+
+    def _upstream(self, start: datetime, end: datetime) -> Iterator[Dict]:
+        """Parsed upstream objects of [start, end], splitting windows that exceed a page"""
+        # Comparison only: the pages are not archived for replay
+        with self.client.stream_check_objects(
+            page_size=self.page_size, start_time=start, end_time=end, record=False
+        ) as page:
+            parsed = [self.client.parse_check_object(obj) for obj in page]
+        if page.code != 0:
+            raise UpstreamError(page.msg or "未知错误")
+        self.report["requests"] += 1
+
+        if page.total > len(parsed) and end - start >= timedelta(seconds=1):
+            middle = (start + (end - start) / 2).replace(microsecond=0)
+            yield from self._upstream(start, middle)
+            yield from self._upstream(middle + timedelta(seconds=1), end)
+        else:
+            yield from parsed
@@ -0,0 +1,319 @@
+"""
+Storage Accounting Service
+- Track report bytes per year/month directory incrementally on upload/delete
+- Periodic parallel os.scandir rescan to correct drift
+- Raw upstream payload archive measured as its own bucket on rescan
+- Growth rate and projected days-to-full for storage alerts
+"""
+import os
+import json
+import threading
+import logging
+from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.services.payload_archive import get_payload_archive
+from app.utils.storage import get_disk_usage
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
+LEDGER_FILENAME = ".storage_ledger.json"
+
+# Keep at most this many daily samples for growth rate estimation
+HISTORY_DAYS = 90
+
+
+class StorageAccountingService:
+    """
+    Maintains a ledger of report storage usage keyed by "YYYY/MM".
+
+    Uploads and deletions adjust the ledger in O(1); the full directory tree
+    is only walked by rescan(), which the scheduler runs periodically. The
+    payload archive is appended to on every sync, so it is only measured by
+    rescan() and after archive days are expired.
+    """
+
+    def __init__(
+        self,
+        upload_dir: Optional[str] = None,
+        max_workers: int = 4,
+        sync_archive_dir: Optional[str] = None
+    ):
+        self.upload_dir = upload_dir or UPLOAD_DIR
+        self.reports_dir = os.path.join(self.upload_dir, "reports")
+        self.sync_archive_dir = sync_archive_dir or get_payload_archive().directory
+        # Ledger lives outside reports/ so it is never served by the static mount
+        self.ledger_path = os.path.join(self.upload_dir, LEDGER_FILENAME)
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._months: Dict[str, Dict[str, int]] = {}
+        self._sync_archive: Dict[str, int] = {"bytes": 0, "files": 0}
+        self._history: List[Tuple[str, int]] = []
+        self._last_scan: Optional[str] = None
+        self._ledger_mtime: Optional[float] = None
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Incremental accounting
+    # ------------------------------------------------------------------
+
+    def record_added(self, file_path: str, size_bytes: int):
+        """Account for a file written under the reports directory"""
+        self._apply(file_path, size_bytes, 1)
+
+    def record_removed(self, file_path: str, size_bytes: int):
+        """Account for a file removed from the reports directory"""
+        self._apply(file_path, -size_bytes, -1)
+
+    def _apply(self, file_path: str, delta_bytes: int, delta_files: int):
+        month_key = self.month_key_for_path(file_path)
+        if month_key is None:
+            return
+
+        with self._lock:
+            self._reload_if_changed()
+            bucket = self._months.setdefault(month_key, {"bytes": 0, "files": 0})
+            bucket["bytes"] = max(0, bucket["bytes"] + delta_bytes)
+            bucket["files"] = max(0, bucket["files"] + delta_files)
+            if bucket["files"] == 0 and bucket["bytes"] == 0:
+                del self._months[month_key]
+            self._record_history_sample()
+            self._save()
+
+    def month_key_for_path(self, file_path: str) -> Optional[str]:
+        """Return "YYYY/MM" for a path under reports/YYYY/MM, otherwise None"""
+        rel = os.path.relpath(os.path.abspath(file_path), os.path.abspath(self.reports_dir))
+        parts = rel.replace("\\", "/").split("/")
+        if len(parts) < 3 or not (parts[0].isdigit() and parts[1].isdigit()):
+            return None
+        return f"{parts[0]}/{parts[1]}"
+
+    # ------------------------------------------------------------------
+    # Full rescan
+    # ------------------------------------------------------------------
+
+    def rescan(self) -> Dict[str, Dict[str, int]]:
+        """
+        Walk reports/YYYY/MM with os.scandir, one month directory per worker,
+        and replace the ledger with the measured totals.
+
+        Returns:
+            Per-month usage {"YYYY/MM": {"bytes": int, "files": int}}
+        """
+        month_dirs = []
+        try:
+            with os.scandir(self.reports_dir) as years:
+                for year in years:
+                    if not (year.is_dir() and year.name.isdigit()):
+                        continue
+                    with os.scandir(year.path) as months:
+                        for month in months:
+                            if month.is_dir() and month.name.isdigit():
+                                month_dirs.append((f"{year.name}/{month.name}", month.path))
+        except FileNotFoundError:
+            month_dirs = []
+
+        usage_by_month: Dict[str, Dict[str, int]] = {}
+        if month_dirs:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for key, usage in zip(
+                    (key for key, _ in month_dirs),
+                    executor.map(_scan_directory, (path for _, path in month_dirs))
+                ):
+                    if usage["files"]:
+                        usage_by_month[key] = usage
+
+        sync_archive = _scan_directory(self.sync_archive_dir)
+
+        with self._lock:
+            self._months = usage_by_month
+            self._sync_archive = sync_archive
+            self._last_scan = datetime.now().isoformat(timespec="seconds")
+            self._record_history_sample()
+            self._save()
+
+        logger.info(
+            f"Storage rescan complete: {len(usage_by_month)} month directories, "
+            f"{sum(m['bytes'] for m in usage_by_month.values())} bytes"
+        )
+        return usage_by_month
+
+    def rescan_sync_archive(self) -> Dict[str, int]:
+        """Measure only the payload archive directory, e.g. after expiring days"""
+        sync_archive = _scan_directory(self.sync_archive_dir)
+        with self._lock:
+            self._reload_if_changed()
+            self._sync_archive = sync_archive
+            self._record_history_sample()
+            self._save()
+        return sync_archive
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def get_usage(self) -> Dict:
+        """
+        Summarize storage usage from the ledger
+
+        Returns:
+            Dictionary with per-month report breakdown, payload archive usage,
+            growth rate and projection; totals include the payload archive
+        """
+        with self._lock:
+            self._reload_if_changed()
+            months = {k: dict(v) for k, v in self._months.items()}
+            sync_archive = dict(self._sync_archive)
+            history = list(self._history)
+            last_scan = self._last_scan
+
+        total_bytes = sum(m["bytes"] for m in months.values()) + sync_archive["bytes"]
+        total_files = sum(m["files"] for m in months.values()) + sync_archive["files"]
+        disk_total, disk_used, disk_free = get_disk_usage(self.upload_dir)
+
+        growth = self.estimate_growth_bytes_per_day(months, history)
+        days_to_full = None
+        if growth > 0 and disk_total > 0:
+            days_to_full = round(disk_free / growth, 1)
+
+        return {
+            "path": self.upload_dir,
+            "total_bytes": total_bytes,
+            "total_files": total_files,
+            "months": [
+                {"month": key, "bytes": months[key]["bytes"], "files": months[key]["files"]}
+                for key in sorted(months, reverse=True)
+            ],
+            "sync_archive_bytes": sync_archive["bytes"],
+            "sync_archive_files": sync_archive["files"],
+            "disk_total_bytes": disk_total,
+            "disk_used_bytes": disk_used,
+            "disk_free_bytes": disk_free,
+            "growth_bytes_per_day": round(growth, 1),
+            "days_to_full": days_to_full,
+            "last_scan": last_scan,
+        }
+
+    @staticmethod
+    def estimate_growth_bytes_per_day(
+        months: Dict[str, Dict[str, int]],
+        history: List[Tuple[str, int]],
+        today: Optional[date] = None
+    ) -> float:
+        """
+        Estimate report growth in bytes/day.
+
+        Uses the daily history samples (last 30 days) when they span at
+        least one day, otherwise falls back to the current month's bytes
+        divided by the days elapsed in the month.
+        """
+        today = today or date.today()
+
+        recent = [
+            (date.fromisoformat(day), total) for day, total in history
+            if (today - date.fromisoformat(day)).days <= 30
+        ]
+        if len(recent) >= 2:
+            (first_day, first_total), (last_day, last_total) = recent[0], recent[-1]
+            span = (last_day - first_day).days
+            if span >= 1:
+                return max(0.0, (last_total - first_total) / span)
+
+        current = months.get(f"{today.year}/{today.month:02d}")
+        if current:
+            return current["bytes"] / max(today.day, 1)
+        return 0.0
+
+    # ------------------------------------------------------------------
+    # Ledger persistence
+    # ------------------------------------------------------------------
+
+    def _record_history_sample(self):
+        """Keep one total-bytes sample per day (caller holds the lock)"""
+        today = date.today().isoformat()
+        total = sum(m["bytes"] for m in self._months.values()) + self._sync_archive["bytes"]
+        if self._history and self._history[-1][0] == today:
+            self._history[-1] = (today, total)
+        else:
+            self._history.append((today, total))
+        self._history = self._history[-HISTORY_DAYS:]
+
+    def _load(self):
+        try:
+            with open(self.ledger_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._months = data.get("months", {})
+            self._sync_archive = data.get("sync_archive", {"bytes": 0, "files": 0})
+            self._history = [tuple(sample) for sample in data.get("history", [])]
+            self._last_scan = data.get("last_scan")
+            self._ledger_mtime = os.path.getmtime(self.ledger_path)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable storage ledger {self.ledger_path}: {e}")
+
+    def _reload_if_changed(self):
+        """Pick up ledger updates written by other worker processes"""
+        try:
+            mtime = os.path.getmtime(self.ledger_path)
+        except OSError:
+            return
+        if self._ledger_mtime is None or mtime > self._ledger_mtime:
+            self._load()
+
+    def _save(self):
+        data = {
+            "months": self._months,
+            "sync_archive": self._sync_archive,
+            "history": self._history,
+            "last_scan": self._last_scan,
+        }
+        try:
+            os.makedirs(self.upload_dir, exist_ok=True)
+            tmp_path = f"{self.ledger_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.ledger_path)
+            self._ledger_mtime = os.path.getmtime(self.ledger_path)
+        except OSError as e:
+            logger.error(f"Failed to write storage ledger {self.ledger_path}: {e}")
+
+
+def _scan_directory(path: str) -> Dict[str, int]:
+    """Recursively sum file sizes below path using os.scandir"""
+    total_bytes = 0
+    total_files = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_bytes += entry.stat(follow_symlinks=False).st_size
+                            total_files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return {"bytes": total_bytes, "files": total_files}
+
+
+# Global accounting instance
+_storage_accounting: Optional[StorageAccountingService] = None
+_storage_accounting_lock = threading.Lock()
+
+
+def get_storage_accounting() -> StorageAccountingService:
+    """Get or create the storage accounting instance"""
+    global _storage_accounting
+    if _storage_accounting is None:
+        with _storage_accounting_lock:
+            if _storage_accounting is None:
+                _storage_accounting = StorageAccountingService()
+    return _storage_accounting
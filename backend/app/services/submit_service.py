@@ -5,13 +5,21 @@ T124, T125: Implement SubmitService
 - call_client_api: Submit to client feedback endpoint
 - handle_response: Process response and update status
 T128: Retry logic with exponential backoff
+- Idempotent submits: confirmed payload hash per check object, per-check_no lease
+- The hash being sent is stored first; after a failure that may have reached
+  upstream (timeout), resending the same payload needs confirmation
 """
+import json
 import time
+import hashlib
+from datetime import datetime
 from typing import Dict, List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 import httpx
 
 from app.services.client_api_service import ClientAPIService
+from app.services.lock_service import LeaseLock
+from app.utils.resilience import CircuitOpenError, RateLimitExceeded
 from app.models.check_object import CheckObject
 from app.models.check_item import CheckObjectItem
 from app.utils.security import calculate_md5_signature
@@ -26,15 +34,26 @@ class SubmitService:
         self.max_retries = 3
         self.base_retry_delay = 1  # seconds
 
-    def submit_check_object(self, check_object_id: int) -> Dict:
+    def submit_check_object(self, check_object_id: int, confirm: bool = False) -> Dict:
         """
         Submit check object results to client API
 
+        Idempotent per (check_no, payload hash): resubmitting the payload
+        upstream already confirmed returns success without calling the API
+        again, and a per-check_no lease keeps concurrent submits (double
+        clicks, several workers) from sending feedback twice. A payload
+        whose last send ended without an answer (it may have been received)
+        is only sent again with confirm.
+
         Args:
             check_object_id: ID of check object to submit
+            confirm: Resend a payload whose last send had an unknown outcome
 
         Returns:
-            Dictionary with success status and message
+            Dictionary with success status and message; "duplicate" is set
+            when an identical confirmed payload was short-circuited,
+            "in_progress" when another submit of the object is running and
+            "needs_confirmation" when an unanswered payload was not resent
         """
         # Get check object
         check_object = self.db.query(CheckObject).filter(
@@ -47,42 +66,72 @@ class SubmitService:
                 "message": "检测对象不存在"
             }
 
+        check_object_data = self.build_check_object_data(check_object)
+        payload_hash = self.payload_hash(check_object_data)
+
+        # Same result already confirmed upstream (double click, retried request)
+        duplicate = self._confirmed_duplicate(check_object, payload_hash)
+        if duplicate is not None:
+            return duplicate
+
         # Validate status and data
-        if not self.can_submit(check_object_id):
+        rejection = self._rejection(check_object)
+        if rejection is not None:
+            return rejection
+
+        # One submit per check_no at a time, across workers and nodes
+        lock = LeaseLock(
+            f"submit:{check_object.check_object_union_num}",
+            session_factory=sessionmaker(bind=self.db.get_bind())
+        )
+        if not lock.acquire():
+            return {"success": False, "in_progress": True, "message": "检测对象正在提交中,请勿重复提交"}
+
+        try:
+            # A concurrent submit may have finished before the lease was free
+            self.db.refresh(check_object)
+            duplicate = self._confirmed_duplicate(check_object, payload_hash)
+            if duplicate is not None:
+                return duplicate
+            if check_object.status == 2:
+                return {"success": False, "message": "检测对象已提交,不能重复提交"}
+            if check_object.pending_payload_hash == payload_hash and not confirm:
+                return {
+                    "success": False,
+                    "needs_confirmation": True,
+                    "message": "上次提交未收到客户接口答复,结果可能已被接收,请核实后确认重新提交"
+                }
+
+            return self._send(check_object, check_object_data, payload_hash)
+        finally:
+            lock.release()
+
+    def _rejection(self, check_object: CheckObject) -> Optional[Dict]:
+        """Error result if the object cannot be submitted in its current state"""
+        if not self.can_submit(check_object.id):
             if check_object.status == 0:
                 return {"success": False, "message": "检测对象必须是已检测状态才能提交"}
             elif check_object.status == 2:
                 return {"success": False, "message": "检测对象已提交,不能重复提交"}
             else:
                 return {"success": False, "message": "检测对象状态不正确"}
-
         if not check_object.check_result:
             return {"success": False, "message": "检验结果不能为空"}
+        return None
 
-        # Get check items
-        check_items = self.db.query(CheckObjectItem).filter(
-            CheckObjectItem.check_object_id == check_object_id
-        ).all()
+    def _confirmed_duplicate(self, check_object: CheckObject, payload_hash: str) -> Optional[Dict]:
+        if check_object.status == 2 and check_object.submit_payload_hash == payload_hash:
+            return {"success": True, "duplicate": True, "message": "提交成功(结果未变化,未重复提交)"}
+        return None
+
+    def _send(self, check_object: CheckObject, check_object_data: Dict, payload_hash: str) -> Dict:
+        # Recorded before sending: kept if the outcome stays unknown
+        check_object.pending_payload_hash = payload_hash
+        self.db.commit()
 
         # Submit with retry logic (T128)
         for attempt in range(self.max_retries):
             try:
-                # Prepare check object data for client API
-                check_object_data = {
-                    "check_object_union_num": check_object.check_no,
-                    "check_result": check_object.check_result,
-                    "check_result_url": check_object.report_url or "",
-                    "check_items": [
-                        {
-                            "check_item_id": item.check_item_id,
-                            "check_item_name": item.check_item_name,
-                            "result": item.check_result or "",
-                            "num": item.result_indicator or ""
-                        }
-                        for item in check_items
-                    ]
-                }
-
                 # Call client API with list of check objects
                 response = self.client_api_service.submit_check_result(
                     [check_object_data]  # Wrap in list as expected by API
@@ -94,33 +143,33 @@ class SubmitService:
                 if result["success"]:
                     # Update status to 2 (提交成功) - 需求2.3
                     check_object.status = 2
-                    self.db.commit()
+                    check_object.submit_payload_hash = payload_hash
+                    check_object.submitted_at = datetime.now()
                 else:
                     # Update status to 3 (提交失败) - 需求2.3
                     check_object.status = 3
-                    self.db.commit()
+                check_object.pending_payload_hash = None
+                self.db.commit()
 
                 return result
 
-            except (httpx.ConnectError, httpx.TimeoutException) as e:
-                # Network errors: retry with exponential backoff
-                if attempt < self.max_retries - 1:
+            except Exception as e:
+                if self.is_retryable(e) and attempt < self.max_retries - 1:
+                    # The request never reached upstream: resending cannot duplicate feedback
                     delay = self.calculate_retry_delay(attempt)
                     time.sleep(delay)
                     continue
-                else:
-                    # Update status to 3 (提交失败) - 网络错误
-                    check_object.status = 3
-                    self.db.commit()
+
+                # Update status to 3 (提交失败); the user can resubmit
+                check_object.status = 3
+                if not self.outcome_unknown(e):
+                    check_object.pending_payload_hash = None
+                self.db.commit()
+                if self.is_retryable(e):
                     return {
                         "success": False,
                         "message": f"网络错误: {str(e)},已重试{self.max_retries}次"
                     }
-
-            except Exception as e:
-                # Update status to 3 (提交失败) - 其他错误
-                check_object.status = 3
-                self.db.commit()
                 return {
                     "success": False,
                     "message": self.format_error_message(e)
@@ -131,6 +180,57 @@ class SubmitService:
             "message": "提交失败: 超过最大重试次数"
         }
 
+    def build_check_object_data(self, check_object: CheckObject) -> Dict:
+        """Feedback data of a check object, as passed to submit_check_result"""
+        check_items = self.db.query(CheckObjectItem).filter(
+            CheckObjectItem.check_object_id == check_object.check_object_id,
+            CheckObjectItem.is_active
+        ).order_by(CheckObjectItem.check_object_item_id).all()
+
+        return {
+            "check_object_union_num": check_object.check_object_union_num,
+            "check_result": check_object.check_result,
+            "check_result_url": check_object.check_result_url or "",
+            "check_items": [
+                {
+                    "check_item_id": item.check_item_id,
+                    "check_item_name": item.check_item_name,
+                    "result": item.result or "",
+                    "num": item.num or ""
+                }
+                for item in check_items
+            ]
+        }
+
+    @staticmethod
+    def payload_hash(check_object_data: Dict) -> str:
+        """Version of a submitted result: SHA-256 of the canonical feedback data"""
+        canonical = json.dumps(check_object_data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """
+        Whether resending is safe: only when the connection was never made
+
+        Read/write timeouts are not retried, the feedback may have been
+        received upstream already.
+        """
+        cause = error if isinstance(error, httpx.HTTPError) else error.__cause__
+        return isinstance(cause, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+    @classmethod
+    def outcome_unknown(cls, error: Exception) -> bool:
+        """
+        Whether the feedback may have been received despite the error
+
+        True for transport errors after the connection was made (read/write
+        timeouts, dropped connections); an error answer from upstream or a
+        failure before connecting is a definite failure.
+        """
+        cause = error if isinstance(error, httpx.HTTPError) else error.__cause__
+        return isinstance(cause, httpx.TransportError) and not cls.is_retryable(error)
+
     def can_submit(self, check_object_id: int) -> bool:
         """
         Check if check object can be submitted
@@ -148,8 +248,8 @@ class SubmitService:
         if not check_object:
             return False
 
-        # Must be status 1 (已检测) and have check_result
-        return check_object.status == 1 and bool(check_object.check_result)
+        # Must be status 1 (已检测), or 3 (提交失败) to resubmit, and have check_result
+        return check_object.status in (1, 3) and bool(check_object.check_result)
 
     def format_check_items(self, check_items: List[Dict]) -> List[Dict]:
         """
@@ -239,13 +339,14 @@ class SubmitService:
         Returns:
             Result dictionary with success status
         """
-        if response.get("code") == 0:
+        # Internal format (code 0) or the feedback endpoint's own (status 200)
+        if response.get("code") == 0 or response.get("status") == 200:
             return {
                 "success": True,
                 "message": "提交成功"
             }
         else:
-            error_msg = response.get("msg", "未知错误")
+            error_msg = response.get("msg") or response.get("message") or "未知错误"
             return {
                 "success": False,
                 "message": f"客户端API错误: {error_msg}"
@@ -275,7 +376,9 @@ class SubmitService:
         """
         error_str = str(error)
 
-        if "timeout" in error_str.lower():
+        if isinstance(error, (CircuitOpenError, RateLimitExceeded)):
+            return "客户接口暂时不可用,请稍后重试"
+        elif "timeout" in error_str.lower():
             return "请求超时,请检查网络连接"
         elif "connection" in error_str.lower():
             return "网络连接失败,请稍后重试"
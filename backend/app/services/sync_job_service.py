@@ -0,0 +1,148 @@
+"""
+Sync Job Service
+- Run manual syncs in the background instead of inside the request
+- The job id is the id of its SyncLog, created as in_progress when queued
+- Live progress is kept in memory by the process running the job; other
+  processes fall back to the SyncLog record
+"""
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models.sync_log import SyncLog
+from app.services.sync_service import SyncProgress, SyncService
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept in memory for status queries
+MAX_FINISHED_JOBS = 50
+
+
+class SyncJobManager:
+    """
+    Queue sync jobs and track their progress
+
+    Jobs run on a dedicated single worker thread, so a queued manual sync
+    never competes with request handling or scheduled jobs for threads.
+    """
+
+    def __init__(self):
+        self._jobs: "OrderedDict[int, SyncProgress]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sync-job")
+
+    def submit(
+        self,
+        session_factory: Callable[[], Session],
+        sync_type: str = "manual",
+        operator: Optional[str] = None
+    ) -> SyncProgress:
+        """
+        Create the job's SyncLog and start the sync in the background
+
+        Raises:
+            Exception: If a sync is already queued or running in this process
+        """
+        with self._lock:
+            if SyncService.is_sync_in_progress() or any(
+                job.status not in SyncProgress.FINISHED for job in self._jobs.values()
+            ):
+                raise Exception("同步正在进行中,请稍后再试")
+
+            db = session_factory()
+            try:
+                log = SyncLog(sync_type=sync_type, status="in_progress", operator=operator)
+                db.add(log)
+                db.commit()
+                job_id = log.id
+            finally:
+                db.close()
+
+            progress = SyncProgress(job_id, sync_type)
+            self._jobs[job_id] = progress
+            self._prune()
+
+        self._executor.submit(self._run, progress, session_factory)
+        logger.info(f"Queued {sync_type} sync job {job_id}")
+        return progress
+
+    def get(self, job_id: int) -> Optional[SyncProgress]:
+        """Live progress of a job run by this process, if known"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, progress: SyncProgress, session_factory: Callable[[], Session]):
+        db = session_factory()
+        try:
+            result = SyncService(db).sync_data(
+                sync_type=progress.sync_type,
+                progress=progress,
+                sync_log_id=progress.job_id
+            )
+            progress.finish(result["status"], result["message"])
+
+        except Exception as e:
+            # Refused before the sync started (e.g. another node holds the sync lock)
+            logger.warning(f"Sync job {progress.job_id} failed: {str(e)}")
+            db.rollback()
+            db.query(SyncLog).filter(SyncLog.id == progress.job_id).update(
+                {"status": "error", "error_message": str(e), "end_time": func.now()},
+                synchronize_session=False
+            )
+            db.commit()
+            progress.finish("error", str(e))
+
+        finally:
+            db.close()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in SyncProgress.FINISHED]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
+
+
+def log_progress(log: SyncLog) -> Dict:
+    """Job status from a SyncLog record, for jobs not tracked by this process"""
+    rows = (log.new_count or 0) + (log.updated_count or 0)
+    elapsed = None
+    if log.start_time and log.end_time:
+        elapsed = (log.end_time - log.start_time).total_seconds()
+
+    return {
+        "job_id": log.id,
+        "sync_type": log.sync_type,
+        "status": "running" if log.status == "in_progress" else log.status,
+        "pages_fetched": None,
+        "total": None,
+        "fetched_count": log.fetched_count or 0,
+        "processed_count": None,
+        "new_count": log.new_count or 0,
+        "updated_count": log.updated_count or 0,
+        "rows_upserted": rows,
+        "rate_per_second": round(rows / elapsed, 2) if elapsed else None,
+        "eta_seconds": 0.0 if log.end_time else None,
+        "elapsed_seconds": elapsed,
+        "message": log.error_message,
+        "start_time": log.start_time,
+        "end_time": log.end_time,
+    }
+
+
+# Global sync job manager instance
+_sync_job_manager: Optional[SyncJobManager] = None
+_sync_job_manager_lock = threading.Lock()
+
+
+def get_sync_job_manager() -> SyncJobManager:
+    """Get or create the sync job manager instance"""
+    global _sync_job_manager
+    if _sync_job_manager is None:
+        with _sync_job_manager_lock:
+            if _sync_job_manager is None:
+                _sync_job_manager = SyncJobManager()
+    return _sync_job_manager
@@ -0,0 +1,428 @@
+"""
+Sync Pipeline
+- Fetch: sampling-time windows are fetched concurrently by a bounded worker
+  pool; a window holding more objects than one page is split in half and
+  re-fetched, since the client API pages by time window and limit only
+- Parse: parse_check_object runs on the fetch workers, record by record as
+  the response body is decoded (ClientAPIService.stream_check_objects)
+- Write: a single writer (the caller's session) upserts parsed objects in
+  batches and commits each batch, so a failure keeps committed batches.
+  Check items are merged by check_object_item_id with bulk statements
+  instead of being deleted and re-inserted
+"""
+import os
+import json
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session, noload
+
+from app.config import settings
+from app.models.check_item import CheckObjectItem
+from app.models.check_object import CheckObject
+from app.services.client_api_service import ClientAPIService
+
+logger = logging.getLogger(__name__)
+
+# End-of-stream marker put on the page queue once every window is done
+_DONE = object()
+
+# Inclusive [start, end] sampling-time window
+Window = Tuple[datetime, datetime]
+
+
+class UpstreamError(Exception):
+    """Client API answered with a non-zero code"""
+
+
+class WindowCheckpoint:
+    """
+    Finished root windows of a long run (backfill), persisted as JSON
+
+    Rewritten atomically after every finished window, so an interrupted
+    run resumes with the windows that were not completely committed.
+    """
+
+    FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._done = {tuple(window) for window in json.load(f).get("done", [])}
+
+    def _key(self, start: datetime, end: datetime) -> Tuple[str, str]:
+        return start.strftime(self.FORMAT), end.strftime(self.FORMAT)
+
+    def is_done(self, start: datetime, end: datetime) -> bool:
+        return self._key(start, end) in self._done
+
+    def mark_done(self, start: datetime, end: datetime):
+        with self._lock:
+            self._done.add(self._key(start, end))
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"done": sorted(self._done)}, f, indent=1)
+            os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+
+class SyncPipeline:
+    """
+    Fetch, parse and write check objects as overlapping stages
+
+    Counters (fetched_count, new_count, updated_count) reflect committed
+    batches only, so they stay accurate when run() fails part way.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        client_api_service: ClientAPIService,
+        progress=None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        window: Optional[timedelta] = None,
+        page_size: Optional[int] = None,
+        fetch_workers: Optional[int] = None,
+        prefetch_pages: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        on_window_done: Optional[Callable[[datetime, datetime], None]] = None
+    ):
+        self.db = db
+        self.client = client_api_service
+        self.progress = progress
+        self.start_time = start_time or ClientAPIService.default_start_time()
+        self.end_time = end_time or ClientAPIService.default_end_time()
+        self.window = window or timedelta(days=settings.SYNC_WINDOW_DAYS)
+        self.page_size = page_size or settings.SYNC_PAGE_SIZE
+        self.fetch_workers = fetch_workers or settings.SYNC_FETCH_WORKERS
+        self.batch_size = batch_size or settings.SYNC_WRITE_BATCH_SIZE
+        # Called (from the writer or a fetch worker) once every object of a root window is committed
+        self.on_window_done = on_window_done
+
+        self.fetched_count = 0
+        self.new_count = 0
+        self.updated_count = 0
+        self.items_inserted = 0
+        self.items_updated = 0
+        self.expected_count = 0
+        self.requests = 0
+
+        self._pages: queue.Queue = queue.Queue(maxsize=prefetch_pages or settings.SYNC_PREFETCH_PAGES)
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Root window -> fetches in flight + pages not yet committed
+        self._window_holds: Dict[Window, int] = {}
+        # Root window and uncommitted object count of each page handed to the writer
+        self._uncommitted: Deque[List] = deque()
+
+    def run(self, windows: Optional[Iterable[Window]] = None) -> Dict[str, int]:
+        """
+        Run the sync over [start_time, end_time]
+
+        Args:
+            windows: Root windows to fetch instead of windows(), e.g. the
+                windows a resumed backfill has not finished yet
+
+        Raises:
+            UpstreamError: If the client API reports an error
+            Exception: On network or database errors (committed batches are kept)
+        """
+        self._executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="sync-fetch")
+        # Planning token: keeps the window count above zero until every root window is queued
+        self._outstanding = 1
+        try:
+            for start, end in (self.windows() if windows is None else windows):
+                self._submit(start, end)
+            self._window_done()
+            return self.write_pages(self._queued_pages())
+        finally:
+            self._cancel.set()
+            self._drain()
+            self._executor.shutdown(wait=True)
+
+    def windows(self) -> Iterator[Window]:
+        """Initial [start, end] windows (inclusive, second resolution) covering the range"""
+        start = self.start_time
+        while start <= self.end_time:
+            end = min(start + self.window - timedelta(seconds=1), self.end_time)
+            yield start, end
+            start = end + timedelta(seconds=1)
+
+    # Fetch + parse stage (worker threads)
+
+    def _submit(self, start: datetime, end: datetime, root_window: Optional[Window] = None):
+        """Queue a fetch of [start, end]; sub-windows of a split pass their root window"""
+        root = root_window or (start, end)
+        with self._lock:
+            self._outstanding += 1
+            self._window_holds[root] = self._window_holds.get(root, 0) + 1
+        self._executor.submit(self._fetch_window, start, end, root)
+
+    def _window_done(self, root_window: Optional[Window] = None):
+        if root_window is not None:
+            self._release(root_window)
+        with self._lock:
+            self._outstanding -= 1
+            finished = self._outstanding == 0
+        if finished:
+            self._put(_DONE)
+
+    def _hold(self, root_window: Window):
+        with self._lock:
+            self._window_holds[root_window] += 1
+
+    def _release(self, root_window: Window):
+        with self._lock:
+            self._window_holds[root_window] -= 1
+            done = self._window_holds[root_window] == 0
+            if done:
+                del self._window_holds[root_window]
+        if done and self.on_window_done is not None:
+            self.on_window_done(*root_window)
+
+    def _fetch_window(self, start: datetime, end: datetime, root_window: Window):
+        root = root_window == (start, end)
+        try:
+            if self._cancel.is_set():
+                return
+
+            # Records are parsed as they are decoded, so the raw page is never held whole
+            with self.client.stream_check_objects(
+                page_size=self.page_size, start_time=start, end_time=end
+            ) as page:
+                parsed = [self.client.parse_check_object(obj) for obj in page]
+            if page.code != 0:
+                raise UpstreamError(page.msg or "未知错误")
+
+            total = page.total
+            with self._lock:
+                self.requests += 1
+                if root:
+                    self.expected_count += total
+                    if self.progress is not None:
+                        self.progress.total = self.expected_count
+
+            if total > len(parsed):
+                if end - start >= timedelta(seconds=1):
+                    middle = (start + (end - start) / 2).replace(microsecond=0)
+                    self._submit(start, middle, root_window)
+                    self._submit(middle + timedelta(seconds=1), end, root_window)
+                    return
+                logger.warning(
+                    f"Sync window {start} holds {total} objects, only {len(parsed)} returned"
+                )
+
+            self._hold(root_window)
+            self._put((root_window, parsed))
+
+        except Exception as e:
+            # Never release a root window with a failed fetch, so it is not reported done
+            self._hold(root_window)
+            self._put(e)
+
+        finally:
+            self._window_done(root_window)
+
+    def _put(self, item):
+        # Bounded queue: block while the writer is behind, give up once cancelled
+        while not self._cancel.is_set():
+            try:
+                self._pages.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _drain(self):
+        while True:
+            try:
+                self._pages.get_nowait()
+            except queue.Empty:
+                return
+
+    # Write stage (caller's thread)
+
+    def _queued_pages(self) -> Iterator[List[Dict]]:
+        while True:
+            page = self._pages.get()
+            if page is _DONE:
+                return
+            if isinstance(page, Exception):
+                raise page
+            root_window, parsed = page
+            if parsed:
+                self._uncommitted.append([root_window, len(parsed)])
+            else:
+                self._release(root_window)
+            yield parsed
+
+    def _committed(self, count: int):
+        """Release root windows whose pages are now fully committed"""
+        while count and self._uncommitted:
+            entry = self._uncommitted[0]
+            taken = min(count, entry[1])
+            entry[1] -= taken
+            count -= taken
+            if entry[1] == 0:
+                self._uncommitted.popleft()
+                self._release(entry[0])
+
+    def write_pages(self, pages: Iterable[List[Dict]]) -> Dict[str, int]:
+        """
+        Upsert pages of parsed objects in batches (also used to replay archived pages)
+
+        Returns:
+            Counts of committed objects
+        """
+        batch: List[Dict] = []
+        for page in pages:
+            if self.progress is not None:
+                self.progress.page_fetched(len(page))
+            batch.extend(page)
+            while len(batch) >= self.batch_size:
+                self._write_batch(batch[:self.batch_size])
+                del batch[:self.batch_size]
+                self._committed(self.batch_size)
+
+        if batch:
+            self._write_batch(batch)
+            self._committed(len(batch))
+
+        return {
+            "fetched_count": self.fetched_count,
+            "new_count": self.new_count,
+            "updated_count": self.updated_count,
+        }
+
+    def _write_batch(self, objects: List[Dict]):
+        """Upsert one batch of parsed objects, merge their check items and commit"""
+        # Last occurrence wins when a batch repeats an object
+        by_union_num = {parsed.get("check_object_union_num"): parsed for parsed in objects}
+        existing = {
+            obj.check_object_union_num: obj
+            for obj in self.db.query(CheckObject).options(noload(CheckObject.check_items)).filter(
+                CheckObject.check_object_union_num.in_(list(by_union_num))
+            )
+        }
+
+        new_count = 0
+        updated_count = 0
+        merged_ids = []
+        upstream_items: Dict = {}
+        for union_num, parsed in by_union_num.items():
+            fields = {key: value for key, value in parsed.items() if key != "check_items"}
+            obj = existing.get(union_num)
+
+            if obj is None:
+                obj = CheckObject(**fields)
+                self.db.add(obj)
+                new_count += 1
+            elif obj.status != 2:
+                # Don't update if already submitted (status=2)
+                for key, value in fields.items():
+                    if value is not None:
+                        setattr(obj, key, value)
+                updated_count += 1
+            else:
+                continue
+
+            merged_ids.append(obj.check_object_id)
+            for item_data in parsed.get("check_items", []):
+                row = {
+                    key: value for key, value in item_data.items()
+                    if key not in CheckObjectItem.LAB_FIELDS
+                }
+                row["check_object_id"] = obj.check_object_id
+                upstream_items[row["check_object_item_id"]] = row
+
+        # Check objects must exist before their items are inserted
+        self.db.flush()
+        self._merge_items(merged_ids, upstream_items)
+        self.db.commit()
+
+        self.fetched_count += len(objects)
+        self.new_count += new_count
+        self.updated_count += updated_count
+        if self.progress is not None:
+            self.progress.objects_processed(len(objects), self.new_count, self.updated_count)
+
+    def _merge_items(self, check_object_ids: List[int], upstream_items: Dict[int, Dict]):
+        """
+        Merge upstream check items into check_object_items, keyed by check_object_item_id
+
+        Changed upstream columns are updated, new items inserted and items no
+        longer sent upstream soft-removed (status=0). Lab-entered columns
+        (num, result, check_time, check_admin) are never written, so results
+        already entered on a sample survive a re-sync. One statement per kind.
+        """
+        if not check_object_ids:
+            return
+
+        columns = {
+            key for row in upstream_items.values() for key in row
+        } - {"check_object_item_id"}
+        selected = [CheckObjectItem.id, CheckObjectItem.check_object_item_id, CheckObjectItem.status]
+        selected += [getattr(CheckObjectItem, key) for key in sorted(columns)]
+
+        current = {}
+        if upstream_items:
+            current = {
+                row.check_object_item_id: row
+                for row in self.db.execute(
+                    select(*selected).where(
+                        CheckObjectItem.check_object_item_id.in_(list(upstream_items))
+                    )
+                )
+            }
+
+        inserts = []
+        updates = []
+        for item_id, row in upstream_items.items():
+            stored = current.get(item_id)
+            if stored is None:
+                inserts.append(row)
+                continue
+
+            changes = {
+                key: value for key, value in row.items()
+                if getattr(stored, key) != value
+            }
+            if stored.status == CheckObjectItem.STATUS_REMOVED:
+                changes["status"] = 1
+            if changes:
+                changes["id"] = stored.id
+                updates.append(changes)
+
+        if updates:
+            self.db.execute(update(CheckObjectItem), updates)
+        if inserts:
+            self.db.execute(insert(CheckObjectItem), inserts)
+
+        removed = update(CheckObjectItem).where(
+            CheckObjectItem.check_object_id.in_(check_object_ids),
+            CheckObjectItem.is_active
+        )
+        if upstream_items:
+            removed = removed.where(CheckObjectItem.check_object_item_id.not_in(list(upstream_items)))
+        self.db.execute(
+            removed.values(status=CheckObjectItem.STATUS_REMOVED),
+            execution_options={"synchronize_session": False}
+        )
+
+        self.items_inserted += len(inserts)
+        self.items_updated += len(updates)
@@ -0,0 +1,109 @@
+"""
+Adaptive auto sync interval
+
+The auto sync job runs on an interval that follows upstream activity:
+- busy business hours (a sync returned at least SYNC_BUSY_NEW_COUNT new
+  objects) halve the interval, down to SYNC_INTERVAL_MIN_MINUTES
+- syncs that return nothing, fail, or are blocked by the open client API
+  circuit double it, up to SYNC_INTERVAL_MAX_MINUTES
+- anything in between returns to the base interval (SystemConfig
+  sync_interval_minutes, else SYNC_INTERVAL_MINUTES)
+
+Outside business hours the interval never drops below the base, and a
+backed-off interval is cut short so the first sync of the day runs when
+business hours start.
+
+Auto syncs are incremental (SyncService.incremental_start_time), so a
+short interval costs a few requests, not a crawl of the whole history.
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.config import settings
+
+
+class AdaptiveSyncInterval:
+    """Next auto sync interval (minutes) from the outcome of the last run"""
+
+    def __init__(
+        self,
+        base_minutes: Optional[int] = None,
+        min_minutes: Optional[int] = None,
+        max_minutes: Optional[int] = None,
+        busy_new_count: Optional[int] = None,
+        business_start_hour: Optional[int] = None,
+        business_end_hour: Optional[int] = None
+    ):
+        self.base_minutes = base_minutes or settings.SYNC_INTERVAL_MINUTES
+        self.min_minutes = min_minutes or settings.SYNC_INTERVAL_MIN_MINUTES
+        self.max_minutes = max_minutes or settings.SYNC_INTERVAL_MAX_MINUTES
+        self.busy_new_count = busy_new_count or settings.SYNC_BUSY_NEW_COUNT
+        self.business_start_hour = (
+            settings.SYNC_BUSINESS_HOURS_START if business_start_hour is None else business_start_hour
+        )
+        self.business_end_hour = (
+            settings.SYNC_BUSINESS_HOURS_END if business_end_hour is None else business_end_hour
+        )
+        self.minutes = self._clamp(self.base_minutes)
+        self._lock = threading.Lock()
+
+    def in_business_hours(self, now: datetime) -> bool:
+        return self.business_start_hour <= now.hour < self.business_end_hour
+
+    def update(self, result: Dict, now: Optional[datetime] = None, base_minutes: Optional[int] = None) -> int:
+        """
+        Adapt the interval to a finished auto sync
+
+        Args:
+            result: Auto sync result ("status", "new_count")
+            now: Current time
+            base_minutes: Configured base interval, if it may have changed
+
+        Returns:
+            Minutes until the next auto sync
+        """
+        now = now or datetime.now()
+        with self._lock:
+            if base_minutes:
+                self.base_minutes = base_minutes
+
+            if result.get("status") != "success" or not result.get("new_count"):
+                minutes = self.minutes * 2
+            elif result["new_count"] >= self.busy_new_count and self.in_business_hours(now):
+                minutes = self.minutes // 2
+            else:
+                minutes = self.base_minutes
+
+            self.minutes = self._clamp(minutes, now)
+            return self._until_business_hours(self.minutes, now)
+
+    def _clamp(self, minutes: int, now: Optional[datetime] = None) -> int:
+        low = self.min_minutes
+        if now is not None and not self.in_business_hours(now):
+            low = max(low, self.base_minutes)
+        return max(low, min(self.max_minutes, minutes))
+
+    def _until_business_hours(self, minutes: int, now: datetime) -> int:
+        """Shorten an interval that would skip past the start of business hours"""
+        if self.in_business_hours(now):
+            return minutes
+        opening = now.replace(hour=self.business_start_hour, minute=0, second=0, microsecond=0)
+        if opening <= now:
+            opening += timedelta(days=1)
+        until_opening = int((opening - now).total_seconds() // 60) + 1
+        return max(1, min(minutes, until_opening))
+
+
+_sync_interval: Optional[AdaptiveSyncInterval] = None
+_sync_interval_lock = threading.Lock()
+
+
+def get_sync_interval() -> AdaptiveSyncInterval:
+    """Get the global adaptive auto sync interval"""
+    global _sync_interval
+    if _sync_interval is None:
+        with _sync_interval_lock:
+            if _sync_interval is None:
+                _sync_interval = AdaptiveSyncInterval()
+    return _sync_interval
@@ -1,19 +1,123 @@
 """
 Sync Service
 T082, T083: Implement SyncService
-- sync_data: Synchronize data from client API
+- sync_data: Synchronize data from client API (pipelined, see sync_pipeline)
+- backfill: Ingest an arbitrary date range with resumable checkpoints
+- replay_archive: Re-derive data from archived upstream pages
+- reconcile: Compare local check objects with upstream per day and repair drift
+- process_inbox: Write check objects pushed by the client API (see ingest_service)
 - Handle concurrency control
 - Log sync results
+- SyncProgress: live progress (pages, rows, rate, ETA) of a running sync
 """
+import time
+import logging
 import threading
-from typing import Dict, Optional
-from sqlalchemy.orm import Session
-from datetime import datetime
-
-from app.services.client_api_service import ClientAPIService
-from app.models.check_object import CheckObject
-from app.models.check_item import CheckObjectItem
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import func
+from datetime import date, datetime, timedelta
+
+from app.config import settings
+from app.services.client_api_service import CheckObjectStream, ClientAPIService
+from app.services.ingest_service import pushed_objects
+from app.services.lock_service import LeaseLock
+from app.services.reconcile_service import Reconciler
+from app.services.payload_archive import PayloadArchive, get_payload_archive
+from app.services.sync_pipeline import SyncPipeline, UpstreamError, WindowCheckpoint
+from app.models.ingest_inbox import IngestInbox
 from app.models.sync_log import SyncLog
+from app.utils.field_mapping import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class SyncProgress:
+    """
+    Live progress of one sync run
+
+    Updated by the thread running the sync and read by the job status
+    endpoints; plain attribute writes, so readers may see a slightly stale
+    but never inconsistent-typed snapshot.
+    """
+
+    FINISHED = ("success", "error")
+
+    def __init__(self, job_id: Optional[int] = None, sync_type: str = "manual"):
+        self.job_id = job_id
+        self.sync_type = sync_type
+        self.status = "queued"
+        self.pages_fetched = 0
+        self.total: Optional[int] = None
+        self.fetched_count = 0
+        self.processed_count = 0
+        self.new_count = 0
+        self.updated_count = 0
+        self.message: Optional[str] = None
+        self.start_time: Optional[datetime] = None
+        self.end_time: Optional[datetime] = None
+        self.done = threading.Event()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def start(self):
+        self.status = "running"
+        self.start_time = datetime.now()
+        self._started = time.monotonic()
+
+    def page_fetched(self, count: int, total: Optional[int] = None):
+        """Record one fetched page of `count` objects (total: upstream count, if known)"""
+        self.pages_fetched += 1
+        self.fetched_count += count
+        if total is not None:
+            self.total = total
+
+    def objects_processed(self, count: int, new_count: int, updated_count: int):
+        """Record `count` processed objects with the running new/updated counters"""
+        self.processed_count += count
+        self.new_count = new_count
+        self.updated_count = updated_count
+
+    def finish(self, status: str, message: Optional[str] = None):
+        self.status = status
+        self.message = message
+        self.end_time = datetime.now()
+        self._finished = time.monotonic()
+        self.done.set()
+
+    def snapshot(self) -> Dict:
+        """Progress as a dict, including throughput and estimated time remaining"""
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = (self._finished or time.monotonic()) - self._started
+        rate = self.processed_count / elapsed if elapsed > 0 else 0.0
+
+        eta = None
+        if self.status == "running" and rate > 0:
+            expected = max(self.total or 0, self.fetched_count)
+            eta = max(expected - self.processed_count, 0) / rate
+        elif self.status in self.FINISHED:
+            eta = 0.0
+
+        return {
+            "job_id": self.job_id,
+            "sync_type": self.sync_type,
+            "status": self.status,
+            "pages_fetched": self.pages_fetched,
+            "total": self.total,
+            "fetched_count": self.fetched_count,
+            "processed_count": self.processed_count,
+            "new_count": self.new_count,
+            "updated_count": self.updated_count,
+            "rows_upserted": self.new_count + self.updated_count,
+            "rate_per_second": round(rate, 2),
+            "eta_seconds": None if eta is None else round(eta, 1),
+            "elapsed_seconds": round(elapsed, 3),
+            "message": self.message,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+        }
 
 
 class SyncService:
@@ -32,12 +136,22 @@ class SyncService:
         """Check if sync is currently in progress"""
         return cls._is_syncing
 
-    def sync_data(self, sync_type: str = "manual") -> Dict:
+    def sync_data(
+        self,
+        sync_type: str = "manual",
+        progress: Optional[SyncProgress] = None,
+        sync_log_id: Optional[int] = None,
+        start_time: Optional[datetime] = None
+    ) -> Dict:
         """
         Synchronize check objects from client API
 
         Args:
             sync_type: Type of sync - "manual" or "auto"
+            progress: Progress tracker updated while the sync runs
+            sync_log_id: Existing (in_progress) SyncLog to complete instead of creating one
+            start_time: Earliest sampling time requested (default: SYNC_START_TIME),
+                see incremental_start_time()
 
         Returns:
             Dictionary with sync results:
@@ -52,149 +166,370 @@ class SyncService:
         Raises:
             Exception: If sync is already in progress or API error occurs
         """
-        # Check if sync is already running
-        if not self._sync_lock.acquire(blocking=False):
-            raise Exception("同步正在进行中,请稍后再试")
+        progress = progress or SyncProgress(sync_log_id, sync_type)
 
-        try:
-            self.__class__._is_syncing = True
+        with self._exclusive():
+            started_at = datetime.now()
+            progress.start()
 
-            # Initialize counters
-            fetched_count = 0
-            new_count = 0
-            updated_count = 0
-            error_message = None
+            pipeline = SyncPipeline(self.db, self.client_api_service, progress, start_time=start_time)
 
             try:
-                # Fetch data from client API
-                response = self.client_api_service.fetch_check_objects(
-                    page=1,
-                    page_size=100  # Fetch first 100 records
-                )
-
-                # Check API response code
-                if response.get("code") != 0:
-                    error_message = response.get("msg", "未知错误")
-                    self._create_sync_log(
-                        sync_type=sync_type,
-                        status="error",
-                        fetched_count=0,
-                        new_count=0,
-                        updated_count=0,
-                        error_message=error_message
-                    )
-                    return {
-                        "status": "error",
-                        "fetched_count": 0,
-                        "new_count": 0,
-                        "updated_count": 0,
-                        "message": error_message
-                    }
-
-                # Parse data
-                data_list = response.get("data", {}).get("list", [])
-                fetched_count = len(data_list)
-
-                # Process each check object
-                for api_data in data_list:
-                    parsed_data = self.client_api_service.parse_check_object(api_data)
-
-                    # Check if record exists by check_object_union_num
-                    existing = self.db.query(CheckObject).filter(
-                        CheckObject.check_object_union_num == parsed_data.get("check_object_union_num")
-                    ).first()
-
-                    if existing:
-                        # Don't update if already submitted (status=2)
-                        if existing.status != 2:
-                            # Update existing record
-                            for key, value in parsed_data.items():
-                                if key != "check_items" and value is not None:
-                                    setattr(existing, key, value)
-
-                            # Update check items
-                            self._update_check_items(existing, parsed_data["check_items"])
-                            updated_count += 1
-                    else:
-                        # Create new record
-                        check_items = parsed_data.pop("check_items", [])
-                        new_obj = CheckObject(**parsed_data)
-                        self.db.add(new_obj)
-                        self.db.flush()  # Get check_object_id for items
-
-                        # Add check items - use check_object_id (BigInteger), not id
-                        for item_data in check_items:
-                            item = CheckObjectItem(
-                                check_object_id=new_obj.check_object_id,
-                                **item_data
-                            )
-                            self.db.add(item)
-
-                        new_count += 1
-
-                # Commit all changes
-                self.db.commit()
+                counts = pipeline.run()
 
                 # Create success log
                 self._create_sync_log(
                     sync_type=sync_type,
                     status="success",
-                    fetched_count=fetched_count,
-                    new_count=new_count,
-                    updated_count=updated_count,
-                    error_message=None
+                    error_message=None,
+                    sync_log_id=sync_log_id,
+                    start_time=started_at,
+                    **counts
                 )
 
                 return {
                     "status": "success",
-                    "fetched_count": fetched_count,
-                    "new_count": new_count,
-                    "updated_count": updated_count,
-                    "message": f"同步成功: 获取{fetched_count}条, 新增{new_count}条, 更新{updated_count}条"
+                    **counts,
+                    "message": (
+                        f"同步成功: 获取{counts['fetched_count']}条, "
+                        f"新增{counts['new_count']}条, 更新{counts['updated_count']}条"
+                    )
                 }
 
             except Exception as e:
+                # Batches committed before the failure are kept
                 self.db.rollback()
                 error_message = str(e)
+                counts = {
+                    "fetched_count": pipeline.fetched_count,
+                    "new_count": pipeline.new_count,
+                    "updated_count": pipeline.updated_count,
+                }
 
                 # Create error log
                 self._create_sync_log(
                     sync_type=sync_type,
                     status="error",
-                    fetched_count=fetched_count,
-                    new_count=new_count,
-                    updated_count=updated_count,
-                    error_message=error_message
+                    error_message=error_message,
+                    sync_log_id=sync_log_id,
+                    start_time=started_at,
+                    **counts
                 )
 
                 return {
                     "status": "error",
-                    "fetched_count": 0,
-                    "new_count": 0,
-                    "updated_count": 0,
-                    "message": f"同步失败: {error_message}"
+                    **counts,
+                    "message": error_message if isinstance(e, UpstreamError) else f"同步失败: {error_message}"
+                }
+
+    def incremental_start_time(self) -> Optional[datetime]:
+        """
+        Earliest sampling time an auto sync needs to request
+
+        The start of the last successful auto or manual sync, less
+        SYNC_INCREMENTAL_OVERLAP_MINUTES for objects registered with a
+        slightly earlier sampling time. None (the full range) if no sync has
+        succeeded yet. Objects sampled before that are left to the daily
+        reconciliation.
+        """
+        last_start = self.db.query(func.max(SyncLog.start_time)).filter(
+            SyncLog.sync_type.in_(("auto", "manual")),
+            SyncLog.status == "success"
+        ).scalar()
+        if last_start is None:
+            return None
+        return max(
+            last_start - timedelta(minutes=settings.SYNC_INCREMENTAL_OVERLAP_MINUTES),
+            ClientAPIService.default_start_time()
+        )
+
+    def backfill(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        window: Optional[timedelta] = None,
+        fetch_workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+        checkpoint: Optional[WindowCheckpoint] = None,
+        progress: Optional[SyncProgress] = None
+    ) -> Dict:
+        """
+        Ingest an arbitrary sampling-time range, e.g. history when onboarding
+
+        Runs the sync pipeline over [start_time, end_time] split into
+        `window`-sized root windows, skipping windows already recorded in
+        `checkpoint` and recording each one once all its objects are
+        committed. Upstream requests share the client API rate limiter.
+        Recorded as a SyncLog with sync_type "backfill".
+
+        Returns:
+            Same shape as sync_data, plus "windows" and "skipped_windows"
+        """
+        progress = progress or SyncProgress(sync_type="backfill")
+
+        with self._exclusive():
+            progress.start()
+            pipeline = SyncPipeline(
+                self.db,
+                self.client_api_service,
+                progress,
+                start_time=start_time,
+                end_time=end_time,
+                window=window,
+                page_size=page_size,
+                fetch_workers=fetch_workers,
+                on_window_done=checkpoint.mark_done if checkpoint is not None else None
+            )
+            windows = list(pipeline.windows())
+            pending = [w for w in windows if checkpoint is None or not checkpoint.is_done(*w)]
+
+            try:
+                counts = pipeline.run(pending)
+                status, error_message = "success", None
+            except Exception as e:
+                # Batches committed before the failure are kept; finished windows stay checkpointed
+                self.db.rollback()
+                counts = {
+                    "fetched_count": pipeline.fetched_count,
+                    "new_count": pipeline.new_count,
+                    "updated_count": pipeline.updated_count,
                 }
+                status, error_message = "error", str(e)
+
+            self._create_sync_log(
+                sync_type="backfill",
+                status=status,
+                error_message=error_message,
+                **counts
+            )
+            progress.finish(status, error_message)
+
+        message = (
+            f"回填完成: {len(pending)}个时间窗口, 获取{counts['fetched_count']}条, "
+            f"新增{counts['new_count']}条, 更新{counts['updated_count']}条"
+            if status == "success" else f"回填失败: {error_message}"
+        )
+        return {
+            "status": status,
+            **counts,
+            "windows": len(pending),
+            "skipped_windows": len(windows) - len(pending),
+            "requests": pipeline.requests,
+            "message": message,
+        }
+
+    def replay_archive(
+        self,
+        archive: Optional[PayloadArchive] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> Dict:
+        """
+        Re-derive check objects from archived upstream pages, without upstream calls
+
+        Pages fetched on days in [since, until] are parsed with the current
+        parse_check_object and upserted like a sync, oldest first so later
+        fetches win. Pages with an API error, and truncated pages of windows
+        that the sync split and re-fetched, are skipped. Recorded as a
+        SyncLog with sync_type "replay".
 
+        Returns:
+            Same shape as sync_data, plus "pages" and "skipped_pages"
+        """
+        archive = archive or get_payload_archive()
+        stats = {"pages": 0, "skipped_pages": 0}
+
+        with self._exclusive():
+            pipeline = SyncPipeline(self.db, self.client_api_service)
+            try:
+                counts = pipeline.write_pages(self._archived_pages(archive, since, until, stats))
+                status, error_message = "success", None
+            except Exception as e:
+                self.db.rollback()
+                counts = {
+                    "fetched_count": pipeline.fetched_count,
+                    "new_count": pipeline.new_count,
+                    "updated_count": pipeline.updated_count,
+                }
+                status, error_message = "error", str(e)
+
+            self._create_sync_log(
+                sync_type="replay",
+                status=status,
+                error_message=error_message,
+                **counts
+            )
+
+        message = (
+            f"回放完成: {stats['pages']}页, 获取{counts['fetched_count']}条, "
+            f"新增{counts['new_count']}条, 更新{counts['updated_count']}条"
+            if status == "success" else f"回放失败: {error_message}"
+        )
+        return {"status": status, **counts, **stats, "message": message}
+
+    def _archived_pages(
+        self,
+        archive: PayloadArchive,
+        since: Optional[date],
+        until: Optional[date],
+        stats: Dict
+    ) -> Iterator[List[Dict]]:
+        parse = self.client_api_service.parse_check_object
+        for metadata, body in archive.iter_pages(since, until):
+            page = CheckObjectStream.from_chunks([body], ClientAPIService._to_internal_response)
+            parsed = [parse(obj) for obj in page]
+
+            window = [parse_datetime(metadata.get(key)) for key in ("start_time", "end_time")]
+            splittable = None not in window and window[1] - window[0] >= timedelta(seconds=1)
+            if page.code != 0 or (page.total > len(parsed) and splittable):
+                stats["skipped_pages"] += 1
+                continue
+
+            stats["pages"] += 1
+            yield parsed
+
+    def reconcile(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Compare local check objects with upstream day by day and repair drift
+
+        Objects missing locally or changed upstream are rewritten through
+        the sync pipeline; local-only and unreflected submissions are only
+        reported. Defaults to the last RECONCILE_LOOKBACK_DAYS days.
+        Recorded as a SyncLog with sync_type "reconcile".
+
+        Returns:
+            Same shape as sync_data, plus the drift counts of reconcile_service
+        """
+        end_time = end_time or ClientAPIService.default_end_time()
+        if start_time is None:
+            start_time = ClientAPIService.default_start_time()
+            if settings.RECONCILE_LOOKBACK_DAYS:
+                lookback = end_time.replace(hour=0, minute=0, second=0) - timedelta(
+                    days=settings.RECONCILE_LOOKBACK_DAYS - 1
+                )
+                start_time = max(start_time, lookback)
+
+        with self._exclusive():
+            reconciler = Reconciler(self.db, self.client_api_service, start_time, end_time)
+            try:
+                result = reconciler.run()
+                status, error_message = "success", None
+            except Exception as e:
+                # Days repaired before the failure are kept
+                self.db.rollback()
+                result = reconciler.result()
+                status, error_message = "error", str(e)
+
+            self._create_sync_log(
+                sync_type="reconcile",
+                status=status,
+                error_message=error_message,
+                fetched_count=result["fetched_count"],
+                new_count=result["new_count"],
+                updated_count=result["updated_count"],
+            )
+
+        message = (
+            f"对账完成: {result['days']}天, 上游{result['upstream_count']}条, 本地{result['local_count']}条, "
+            f"缺失{result['missing']}条, 不一致{result['changed']}条, 仅本地{result['local_only']}条, "
+            f"提交未回传{result['unreflected']}条"
+            if status == "success" else f"对账失败: {error_message}"
+        )
+        return {"status": status, **result, "message": message}
+
+    def process_inbox(self, limit: Optional[int] = None) -> Dict:
+        """
+        Write pending pushed check objects through the sync pipeline
+
+        Takes the sync locks like any other write of check objects, so a
+        push never races a running sync (its rows stay pending until the
+        next run). An empty inbox returns without touching the locks. Each
+        inbox row is written and marked done on its own; a failing row is
+        retried up to INGEST_MAX_ATTEMPTS times. Pushes are not recorded as
+        SyncLogs, the inbox row is their record.
+
+        Returns:
+            {"processed", "failed", "new_count", "updated_count"} of this run
+
+        Raises:
+            Exception: If a sync is already in progress
+        """
+        limit = limit or settings.INGEST_INBOX_BATCH_ROWS
+        stats = {"processed": 0, "failed": 0}
+
+        pending = self.db.query(IngestInbox.id).filter(IngestInbox.status == IngestInbox.STATUS_PENDING)
+        if not self.db.query(pending.exists()).scalar():
+            return {"new_count": 0, "updated_count": 0, **stats}
+
+        with self._exclusive():
+            rows = (
+                self.db.query(IngestInbox)
+                .filter(IngestInbox.status == IngestInbox.STATUS_PENDING)
+                .order_by(IngestInbox.id)
+                .limit(limit)
+                .all()
+            )
+            pipeline = SyncPipeline(self.db, self.client_api_service)
+            parse = self.client_api_service.parse_check_object
+
+            for row in rows:
+                written = pipeline.fetched_count
+                try:
+                    pipeline.write_pages([[parse(obj) for obj in pushed_objects(row.payload)]])
+                    row.status = IngestInbox.STATUS_DONE
+                    row.object_count = pipeline.fetched_count - written
+                    row.error_message = None
+                    stats["processed"] += 1
+                except Exception as e:
+                    self.db.rollback()
+                    row.attempts += 1
+                    row.error_message = str(e)
+                    if row.attempts >= settings.INGEST_MAX_ATTEMPTS:
+                        row.status = IngestInbox.STATUS_FAILED
+                    logger.warning(f"Inbox row {row.id} failed (attempt {row.attempts}): {str(e)}")
+                    stats["failed"] += 1
+                row.processed_at = datetime.now()
+                self.db.commit()
+
+        return {"new_count": pipeline.new_count, "updated_count": pipeline.updated_count, **stats}
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """
+        Hold the sync locks: the class lock for this process and the
+        "sync" lease for other workers and nodes sharing the database
+
+        Raises:
+            Exception: If a sync is already in progress
+        """
+        # Check if sync is already running in this process
+        if not self._sync_lock.acquire(blocking=False):
+            raise Exception("同步正在进行中,请稍后再试")
+
+        # ...and in any other worker or node sharing the database
+        lease = LeaseLock("sync", session_factory=sessionmaker(bind=self.db.get_bind()))
+        try:
+            acquired = lease.acquire()
+        except Exception:
+            self._sync_lock.release()
+            raise
+        if not acquired:
+            self._sync_lock.release()
+            raise Exception("同步正在进行中,请稍后再试")
+
+        try:
+            self.__class__._is_syncing = True
+            yield
         finally:
-            # Always release lock
+            # Always release locks
             self.__class__._is_syncing = False
+            lease.release()
             self._sync_lock.release()
 
-    def _update_check_items(self, check_object: CheckObject, items_data: list):
-        """Update check items for a check object"""
-        # Remove existing items - use check_object_id (BigInteger foreign key)
-        self.db.query(CheckObjectItem).filter(
-            CheckObjectItem.check_object_id == check_object.check_object_id
-        ).delete()
-
-        # Add new items - use check_object_id (BigInteger foreign key)
-        for item_data in items_data:
-            item = CheckObjectItem(
-                check_object_id=check_object.check_object_id,
-                **item_data
-            )
-            self.db.add(item)
-
     def _create_sync_log(
         self,
         sync_type: str,
@@ -202,18 +537,24 @@ class SyncService:
         fetched_count: int,
         new_count: int,
         updated_count: int,
-        error_message: Optional[str]
+        error_message: Optional[str],
+        sync_log_id: Optional[int] = None,
+        start_time: Optional[datetime] = None
     ):
-        """Create sync log record"""
-        log = SyncLog(
-            sync_type=sync_type,
-            status=status,
-            fetched_count=fetched_count,
-            new_count=new_count,
-            updated_count=updated_count,
-            error_message=error_message
-        )
-        self.db.add(log)
+        """Create sync log record, or complete the job's in_progress record"""
+        log = self.db.get(SyncLog, sync_log_id) if sync_log_id is not None else None
+        if log is None:
+            log = SyncLog(sync_type=sync_type)
+            if start_time is not None:
+                log.start_time = start_time
+            self.db.add(log)
+
+        log.status = status
+        log.fetched_count = fetched_count
+        log.new_count = new_count
+        log.updated_count = updated_count
+        log.error_message = error_message
+        log.end_time = func.now()
         self.db.commit()
 
     def get_sync_logs(
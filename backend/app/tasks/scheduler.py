@@ -1,24 +1,46 @@
 """
 APScheduler Setup
 T084: Implement APScheduler setup
-- Daily job at 2:00 AM calling SyncService (每天自动同步一次)
-- Storage monitoring job at 3:00 AM
+- Auto sync job calling SyncService on an adaptive interval (see sync_schedule):
+  shorter while business hours are busy, backing off when idle or failing
+- Inbox job every INGEST_INBOX_POLL_SECONDS writing pushed check objects the
+  push worker left pending (only with INGEST_WEBHOOK_ENABLED)
+- Reconciliation job at RECONCILE_HOUR comparing local check objects with upstream
+- Storage monitoring job every STORAGE_MONITOR_INTERVAL_MINUTES (ledger based)
+- Storage rescan job at 3:00 AM (full directory walk)
+- Report archival job at ARCHIVE_WINDOW_START_HOUR (retention, orphans, month archives)
 - Manual sync available via API endpoint
+- Leader election: every node runs the scheduler, only the lease holder runs jobs,
+  and each job additionally holds its own lease while running
 """
 import logging
+import functools
+from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 
+from app.config import settings
 from app.database import SessionLocal
+from app.models.system_config import SystemConfig
 from app.services.sync_service import SyncService
-from app.utils.storage import check_storage_space
+from app.services.ingest_service import purge_inbox
+from app.services.sync_schedule import get_sync_interval
+from app.services.storage_service import get_storage_accounting
+from app.services.archive_service import ReportArchiveService
+from app.services.lock_service import LeaseLock
+from app.services.client_api_service import get_client_api_circuit_breaker
+from app.utils.resilience import OPEN
 
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
 _scheduler: BackgroundScheduler = None
 
+# Scheduler leadership lease (created by the first election run)
+_leader_lock: LeaseLock = None
+_is_leader = False
+
 
 def get_scheduler() -> BackgroundScheduler:
     """Get or create scheduler instance"""
@@ -28,17 +50,101 @@ def get_scheduler() -> BackgroundScheduler:
     return _scheduler
 
 
+def is_leader() -> bool:
+    """Whether this process currently holds the scheduler leadership lease"""
+    return _is_leader and _leader_lock is not None and not _leader_lock.lost.is_set()
+
+
+def leader_election_task():
+    """
+    Task for scheduler leader election
+    Runs every DISTRIBUTED_LOCK_TTL_SECONDS / 3 on every node; the holder
+    renews its lease, the others take over once it expires
+    """
+    global _leader_lock, _is_leader
+
+    try:
+        if _leader_lock is None:
+            # Renewal is driven by this job, no separate heartbeat thread
+            _leader_lock = LeaseLock("scheduler-leader", session_factory=SessionLocal, heartbeat=False)
+
+        if _is_leader:
+            _is_leader = _leader_lock.renew()
+            if not _is_leader:
+                _leader_lock.held = False
+                logger.warning("Lost scheduler leadership")
+        else:
+            _is_leader = _leader_lock.acquire()
+            if _is_leader:
+                logger.info(f"Acquired scheduler leadership as {_leader_lock.owner}")
+
+    except Exception as e:
+        logger.error(f"Leader election error: {str(e)}")
+        _is_leader = False
+
+    return _is_leader
+
+
+def leader_job(func, job_id: str):
+    """
+    Wrap a scheduled task so it only runs on the leader, under a per-job lease
+
+    The job lease covers a leadership handover in the middle of a long run:
+    the new leader skips the job until the previous run has finished or its
+    lease has expired.
+    """
+    @functools.wraps(func)
+    def wrapper():
+        if not is_leader():
+            logger.debug(f"Skipping {job_id}: not the scheduler leader")
+            return {"status": "skipped", "message": "not leader"}
+
+        lock = LeaseLock(f"job:{job_id}", session_factory=SessionLocal)
+        try:
+            if not lock.acquire():
+                logger.info(f"Skipping {job_id}: already running on another node")
+                return {"status": "skipped", "message": "already running"}
+        except Exception as e:
+            logger.error(f"Job lock error for {job_id}: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+        try:
+            return func()
+        finally:
+            lock.release()
+
+    return wrapper
+
+
 def auto_sync_task():
     """
     Task for automatic data synchronization
-    Runs daily at 2:00 AM (每天凌晨2点自动同步一次)
+    Runs every few minutes to hours; each run adapts the interval of the next.
+    Incremental: only sampling times from shortly before the last successful
+    sync are requested, the daily reconciliation covers older ones.
     """
     logger.info("Starting automatic sync task")
 
     db = SessionLocal()
+    try:
+        result = _auto_sync(db)
+        reschedule_auto_sync(result, _configured_sync_interval(db))
+        return result
+
+    finally:
+        db.close()
+
+
+def _auto_sync(db) -> dict:
+    # Don't start a sync that would fail immediately against a failing upstream
+    breaker = get_client_api_circuit_breaker()
+    if breaker.state == OPEN:
+        logger.warning(f"Auto sync skipped: client API circuit open, retry in {breaker.retry_after():.0f}s")
+        return {"status": "skipped", "message": "client API circuit open"}
+
     try:
         sync_service = SyncService(db)
-        result = sync_service.sync_data(sync_type="auto")
+        result = sync_service.sync_data(sync_type="auto", start_time=sync_service.incremental_start_time())
 
         if result["status"] == "success":
             logger.info(
@@ -54,6 +160,92 @@ def auto_sync_task():
         logger.error(f"Auto sync task error: {str(e)}")
         return {"status": "error", "message": str(e)}
 
+
+def _configured_sync_interval(db):
+    """SystemConfig.sync_interval_minutes, None if unset or unreadable"""
+    try:
+        config = db.query(SystemConfig).first()
+        return config.sync_interval_minutes if config is not None else None
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"Could not read configured sync interval: {str(e)}")
+        return None
+
+
+def reschedule_auto_sync(result: dict, base_minutes=None):
+    """
+    Move the auto sync job to the interval adapted to the last run
+
+    Args:
+        result: Result of the auto sync run
+        base_minutes: Configured base interval (SystemConfig), if any
+
+    Returns:
+        Minutes until the next auto sync
+    """
+    minutes = get_sync_interval().update(result, base_minutes=base_minutes)
+    job = get_scheduler().get_job("auto_sync_job")
+    if job is None:
+        return minutes
+
+    if not isinstance(job.trigger, IntervalTrigger) or job.trigger.interval != timedelta(minutes=minutes):
+        job.reschedule(trigger=IntervalTrigger(minutes=minutes))
+        logger.info(f"Next auto sync in {minutes} minutes")
+    return minutes
+
+
+def reconcile_task():
+    """
+    Task for reconciling local check objects with upstream
+    Runs daily at RECONCILE_HOUR over the last RECONCILE_LOOKBACK_DAYS days
+    """
+    logger.info("Starting reconciliation task")
+
+    breaker = get_client_api_circuit_breaker()
+    if breaker.state == OPEN:
+        logger.warning(f"Reconciliation skipped: client API circuit open, retry in {breaker.retry_after():.0f}s")
+        return {"status": "skipped", "message": "client API circuit open"}
+
+    db = SessionLocal()
+    try:
+        result = SyncService(db).reconcile()
+        if result["status"] == "success":
+            logger.info(result["message"])
+        else:
+            logger.warning(f"Reconciliation failed: {result['message']}")
+        return result
+
+    except Exception as e:
+        logger.error(f"Reconciliation task error: {str(e)}")
+        return {"status": "error", "message": str(e)}
+
+    finally:
+        db.close()
+
+
+def ingest_inbox_task():
+    """
+    Task for writing pushed check objects
+    Picks up inbox rows left pending by the push worker (sync running,
+    failure, restart) and deletes done rows past their retention
+    """
+    db = SessionLocal()
+    try:
+        purged = purge_inbox(db)
+        if purged:
+            logger.info(f"Inbox purged: rows={purged}")
+        result = SyncService(db).process_inbox()
+        if result["processed"] or result["failed"]:
+            logger.info(
+                f"Inbox processed: rows={result['processed']}, failed={result['failed']}, "
+                f"new={result['new_count']}, updated={result['updated_count']}"
+            )
+        return result
+
+    except Exception as e:
+        logger.info(f"Inbox task deferred: {str(e)}")
+        return {"status": "skipped", "message": str(e)}
+
     finally:
         db.close()
 
@@ -61,22 +253,49 @@ def auto_sync_task():
 def storage_monitor_task():
     """
     Task for monitoring disk storage
-    Runs daily to check available disk space
+    Runs every STORAGE_MONITOR_INTERVAL_MINUTES using the storage ledger,
+    so it never walks the reports tree itself
     """
     logger.info("Running storage monitoring task")
 
     try:
-        result = check_storage_space("/app/uploads", threshold_gb=10)
+        usage = get_storage_accounting().get_usage()
 
-        if result["is_low"]:
+        free_gb = usage["disk_free_bytes"] / (1024 ** 3)
+        days_to_full = usage["days_to_full"]
+        threshold_gb = settings.STORAGE_ALERT_FREE_GB
+        threshold_days = settings.STORAGE_ALERT_DAYS_TO_FULL
+
+        is_low = usage["disk_total_bytes"] > 0 and free_gb < threshold_gb
+        filling_soon = days_to_full is not None and days_to_full < threshold_days
+
+        result = {
+            "path": usage["path"],
+            "free_gb": round(free_gb, 2),
+            "reports_gb": round(usage["total_bytes"] / (1024 ** 3), 2),
+            "growth_mb_per_day": round(usage["growth_bytes_per_day"] / (1024 ** 2), 2),
+            "days_to_full": days_to_full,
+            "is_low": is_low,
+            "filling_soon": filling_soon,
+            "threshold_gb": threshold_gb,
+            "threshold_days": threshold_days,
+        }
+
+        if is_low:
+            logger.warning(
+                f"Low disk space warning: {free_gb:.2f}GB free, "
+                f"threshold is {threshold_gb}GB at {usage['path']}"
+            )
+        elif filling_soon:
             logger.warning(
-                f"Low disk space warning: {result['free_gb']:.2f}GB free, "
-                f"threshold is {result['threshold_gb']}GB at {result['path']}"
+                f"Disk projected to fill in {days_to_full} days "
+                f"(growth {result['growth_mb_per_day']}MB/day, {free_gb:.2f}GB free) "
+                f"at {usage['path']}"
             )
         else:
             logger.info(
-                f"Disk space OK: {result['free_gb']:.2f}GB free "
-                f"({result['usage_percent']:.1f}% used) at {result['path']}"
+                f"Disk space OK: {free_gb:.2f}GB free, "
+                f"reports use {result['reports_gb']}GB at {usage['path']}"
             )
 
         return result
@@ -86,6 +305,48 @@ def storage_monitor_task():
         return {"status": "error", "message": str(e)}
 
 
+def storage_rescan_task():
+    """
+    Task for re-measuring report storage
+    Runs daily to correct any drift in the incremental storage ledger
+    """
+    logger.info("Running storage rescan task")
+
+    try:
+        months = get_storage_accounting().rescan()
+        return {"status": "success", "months": len(months)}
+
+    except Exception as e:
+        logger.error(f"Storage rescan task error: {str(e)}")
+        return {"status": "error", "message": str(e)}
+
+
+def report_archive_task():
+    """
+    Task for report retention and archival
+    Runs nightly inside the archival window and stops when the window ends
+    """
+    logger.info("Running report archive task")
+
+    db = SessionLocal()
+    try:
+        result = ReportArchiveService(db).run()
+        logger.info(
+            f"Report archive {result['status']}: orphans_deleted={result['orphans_deleted']}, "
+            f"months_archived={result['months_archived']}, "
+            f"archives_expired={result['archives_expired']}, "
+            f"sync_archives_expired={result['sync_archives_expired']}"
+        )
+        return result
+
+    except Exception as e:
+        logger.error(f"Report archive task error: {str(e)}")
+        return {"status": "error", "message": str(e)}
+
+    finally:
+        db.close()
+
+
 def setup_scheduler(scheduler: BackgroundScheduler):
     """
     Setup scheduler with all jobs
@@ -96,28 +357,92 @@ def setup_scheduler(scheduler: BackgroundScheduler):
     # Remove existing jobs to avoid duplicates
     existing_jobs = {job.id for job in scheduler.get_jobs()}
 
-    # Add sync job - daily at 2:00 AM (每天自动同步一次)
+    # Add leader election job - runs immediately, then renews the lease
+    if "scheduler_leader_job" not in existing_jobs:
+        scheduler.add_job(
+            leader_election_task,
+            trigger=IntervalTrigger(seconds=max(settings.DISTRIBUTED_LOCK_TTL_SECONDS // 3, 1)),
+            id="scheduler_leader_job",
+            name="Scheduler Leader Election",
+            replace_existing=True,
+            max_instances=1,
+            next_run_time=datetime.now()
+        )
+        logger.info("Added scheduler leader election job")
+
+    # Add sync job - starts at the base interval, then adapts after every run
     if "auto_sync_job" not in existing_jobs:
+        minutes = get_sync_interval().minutes
         scheduler.add_job(
-            auto_sync_task,
-            trigger=CronTrigger(hour=2, minute=0),
+            leader_job(auto_sync_task, "auto_sync_job"),
+            trigger=IntervalTrigger(minutes=minutes),
             id="auto_sync_job",
             name="Automatic Data Sync",
             replace_existing=True,
             max_instances=1  # Prevent concurrent runs
         )
-        logger.info("Added auto sync job (daily at 2:00 AM)")
+        logger.info(f"Added auto sync job (every {minutes} minutes, adaptive)")
+
+    # Add reconciliation job - daily, repairs objects missed or changed since they were synced
+    if settings.RECONCILE_ENABLED and "reconcile_job" not in existing_jobs:
+        scheduler.add_job(
+            leader_job(reconcile_task, "reconcile_job"),
+            trigger=CronTrigger(hour=settings.RECONCILE_HOUR, minute=0),
+            id="reconcile_job",
+            name="Upstream Reconciliation",
+            replace_existing=True,
+            max_instances=1
+        )
+        logger.info(f"Added reconciliation job (daily at {settings.RECONCILE_HOUR}:00)")
 
-    # Add storage monitoring job - daily at 3:00 AM
+    # Add inbox job - catches pushes the push worker could not write right away
+    if settings.INGEST_WEBHOOK_ENABLED and "ingest_inbox_job" not in existing_jobs:
+        scheduler.add_job(
+            leader_job(ingest_inbox_task, "ingest_inbox_job"),
+            trigger=IntervalTrigger(seconds=settings.INGEST_INBOX_POLL_SECONDS),
+            id="ingest_inbox_job",
+            name="Push Inbox",
+            replace_existing=True,
+            max_instances=1
+        )
+        logger.info(f"Added push inbox job (every {settings.INGEST_INBOX_POLL_SECONDS} seconds)")
+
+    # Add storage monitoring job - ledger based, runs frequently
     if "storage_monitor_job" not in existing_jobs:
         scheduler.add_job(
-            storage_monitor_task,
-            trigger=CronTrigger(hour=3, minute=0),
+            leader_job(storage_monitor_task, "storage_monitor_job"),
+            trigger=IntervalTrigger(minutes=settings.STORAGE_MONITOR_INTERVAL_MINUTES),
             id="storage_monitor_job",
             name="Storage Monitoring",
             replace_existing=True
         )
-        logger.info("Added storage monitor job (daily at 3:00 AM)")
+        logger.info(
+            f"Added storage monitor job (every {settings.STORAGE_MONITOR_INTERVAL_MINUTES} minutes)"
+        )
+
+    # Add storage rescan job - daily at 3:00 AM
+    if "storage_rescan_job" not in existing_jobs:
+        scheduler.add_job(
+            leader_job(storage_rescan_task, "storage_rescan_job"),
+            trigger=CronTrigger(hour=3, minute=0),
+            id="storage_rescan_job",
+            name="Storage Rescan",
+            replace_existing=True,
+            max_instances=1
+        )
+        logger.info("Added storage rescan job (daily at 3:00 AM)")
+
+    # Add report archive job - daily at the start of the archival window
+    if "report_archive_job" not in existing_jobs:
+        scheduler.add_job(
+            leader_job(report_archive_task, "report_archive_job"),
+            trigger=CronTrigger(hour=settings.ARCHIVE_WINDOW_START_HOUR, minute=0),
+            id="report_archive_job",
+            name="Report Archival",
+            replace_existing=True,
+            max_instances=1
+        )
+        logger.info(f"Added report archive job (daily at {settings.ARCHIVE_WINDOW_START_HOUR}:00)")
 
 
 def start_scheduler():
@@ -132,7 +457,12 @@ def start_scheduler():
 
 def shutdown_scheduler():
     """Shutdown the scheduler"""
-    global _scheduler
+    global _scheduler, _is_leader
     if _scheduler and _scheduler.running:
         _scheduler.shutdown(wait=False)
         logger.info("Scheduler shutdown")
+
+    # Hand leadership over without waiting for the lease to expire
+    if _leader_lock is not None and _is_leader:
+        _is_leader = False
+        _leader_lock.release()
@@ -0,0 +1,141 @@
+"""
+Compiled field mapping for upstream payloads
+
+Field aliases are declared as tables and compiled once into a plain Python
+function, so per-record extraction is a single dict literal with bound
+`get` lookups instead of interpreting the table for every record.
+
+Datetime strings are parsed by sniffing their shape: the fixed-width
+formats the client API actually sends are decoded by slicing, anything
+else falls back to strptime/fromisoformat. Results are memoized, since
+the same timestamps repeat across pages and re-syncs.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# Formats tried, in order, when a value has no fast path
+DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y/%m/%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S")
+
+# Marks an entry without a default: a missing key yields None
+_NO_DEFAULT = object()
+
+
+def _fixed_datetime(value: str) -> datetime:
+    digits = value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16] + value[17:19]
+    if not digits.isdigit() or value[13] != ":" or value[16] != ":":
+        raise ValueError(value)
+    return datetime(
+        int(digits[0:4]), int(digits[4:6]), int(digits[6:8]),
+        int(digits[8:10]), int(digits[10:12]), int(digits[12:14])
+    )
+
+
+def _fixed_date(value: str) -> datetime:
+    digits = value[0:4] + value[5:7] + value[8:10]
+    if not digits.isdigit():
+        raise ValueError(value)
+    return datetime(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]))
+
+
+# (length, date separator, date/time separator) -> fast parser
+_FAST_PATHS: Dict[Tuple[int, str, str], Callable[[str], datetime]] = {
+    (19, "-", " "): _fixed_datetime,
+    (19, "/", " "): _fixed_datetime,
+    (19, "-", "T"): _fixed_datetime,
+    (10, "-", ""): _fixed_date,
+}
+
+
+def _parse_slow(value: str) -> Optional[datetime]:
+    for fmt in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+
+    # 尝试ISO格式
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=16384)
+def _parse_string(value: str) -> Optional[datetime]:
+    length = len(value)
+    if length >= 10 and value.isascii():
+        parser = _FAST_PATHS.get((length, value[4], value[10] if length > 10 else ""))
+        if parser is not None and value[4] == value[7]:
+            try:
+                return parser(value)
+            except ValueError:
+                pass
+    return _parse_slow(value)
+
+
+def parse_datetime(value) -> Optional[datetime]:
+    """
+    Parse an upstream datetime value
+
+    Accepts datetime objects, the formats in DATETIME_FORMATS and ISO 8601.
+    Returns None for empty or unparseable values.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        return None
+    return _parse_string(value)
+
+
+def compile_mapping(
+    fields: Sequence[Tuple],
+    name: str = "extract",
+    sources: Sequence[str] = ("data",)
+) -> Callable[..., Dict]:
+    """
+    Compile a field alias table into an extractor function
+
+    Each entry is (target, aliases) or (target, aliases, options):
+    - aliases are tried in order like `get(a) or get(b)`
+    - options["default"]: with a single alias, behaves like `get(a, default)`
+    - options["convert"]: applied to the looked-up value
+    - options["source"]: which of the extractor's positional dicts to read
+      (one of `sources`, default the first)
+
+    Returns a function taking one dict per source and returning the mapped dict.
+    """
+    namespace = {}
+    entries = []
+    for index, entry in enumerate(fields):
+        target, aliases = entry[0], entry[1]
+        options = entry[2] if len(entry) > 2 else {}
+        default = options.get("default", _NO_DEFAULT)
+        converter = options.get("convert")
+        source = options.get("source", sources[0])
+        if source not in sources:
+            raise ValueError(f"{target}: unknown source {source!r}")
+        if not aliases:
+            raise ValueError(f"{target}: at least one alias is required")
+
+        get = f"{source}_get"
+        if default is not _NO_DEFAULT:
+            if len(aliases) != 1:
+                raise ValueError(f"{target}: a default needs exactly one alias")
+            namespace[f"_default_{index}"] = default
+            expression = f"{get}({aliases[0]!r}, _default_{index})"
+        else:
+            expression = " or ".join(f"{get}({alias!r})" for alias in aliases)
+
+        if converter is not None:
+            namespace[f"_convert_{index}"] = converter
+            expression = f"_convert_{index}({expression})"
+        entries.append(f"        {target!r}: {expression},")
+
+    lines = [f"def {name}({', '.join(sources)}):"]
+    lines += [f"    {source}_get = {source}.get" for source in sources]
+    lines += ["    return {", *entries, "    }"]
+    exec(compile("\n".join(lines), f"<field_mapping:{name}>", "exec"), namespace)
+    return namespace[name]
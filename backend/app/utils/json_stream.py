@@ -0,0 +1,159 @@
+"""
+Incremental JSON parsing
+
+iter_json_items() walks a JSON document arriving as text/bytes chunks and
+yields the elements of one nested array (e.g. data.list) as they are
+completed, so a large response is never held as a single string or
+object graph. Values outside that array are decoded normally and
+collected into an envelope dict mirroring the document.
+
+Each element is decoded with json.JSONDecoder.raw_decode; an element cut
+by a chunk boundary is retried once more input has arrived.
+"""
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+_WHITESPACE = " \t\n\r"
+# Characters that can continue a number raw_decode stopped short of ("1." + "5")
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class _Reader:
+    def __init__(self, chunks: Iterable[Union[str, bytes]]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._exhausted = False
+        self.buffer = ""
+        self.pos = 0
+
+    def more(self) -> bool:
+        """Append the next chunk, dropping consumed input; False at end of input"""
+        while not self._exhausted:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._exhausted = True
+                chunk = self._utf8.decode(b"", final=True)
+            else:
+                if isinstance(chunk, bytes):
+                    chunk = self._utf8.decode(chunk)
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.more():
+                raise self.error("Unexpected end of JSON input")
+
+    def take(self, expected: str) -> str:
+        """Consume the next non-whitespace character, which must be one of expected"""
+        char = self.peek()
+        if char not in expected:
+            raise self.error(f"Expecting one of {expected!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.more():
+                    continue
+                raise
+            # A number or literal ending the buffer may continue in the next
+            # chunk, as may a number cut right after its "." or exponent marker
+            if end == len(self.buffer) or (
+                self.buffer[end] in _NUMBER_CHARS
+                and isinstance(value, (int, float))
+                and not isinstance(value, bool)
+            ):
+                if self.more():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_json_items(
+    chunks: Iterable[Union[str, bytes]],
+    path: Sequence[str],
+    envelope: Optional[Dict] = None
+) -> Iterator[Any]:
+    """
+    Yield the elements of the array at `path` in a streamed JSON object
+
+    Args:
+        chunks: Text or UTF-8 byte chunks of the document
+        path: Object keys leading to the array, e.g. ("data", "list")
+        envelope: Filled with every other value of the document (nested
+            objects on the path become nested dicts); complete once the
+            generator is exhausted. If the value at `path` is not an array
+            it is stored here instead of being yielded.
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed or truncated
+    """
+    reader = _Reader(chunks)
+    if envelope is None:
+        envelope = {}
+    if reader.peek() != "{":
+        raise reader.error("Expecting '{'")
+    yield from _walk_object(reader, tuple(path), envelope)
+    while reader.pos < len(reader.buffer) or reader.more():
+        if reader.buffer[reader.pos] not in _WHITESPACE:
+            raise reader.error("Extra data")
+        reader.pos += 1
+
+
+def _walk_object(reader: _Reader, path: Sequence[str], target: Dict) -> Iterator[Any]:
+    reader.take("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+
+    while True:
+        if reader.peek() != '"':
+            raise reader.error("Expecting property name enclosed in double quotes")
+        key = reader.value()
+        reader.take(":")
+
+        if path and key == path[0]:
+            char = reader.peek()
+            if len(path) == 1 and char == "[":
+                yield from _walk_array(reader)
+            elif len(path) > 1 and char == "{":
+                yield from _walk_object(reader, path[1:], target.setdefault(key, {}))
+            else:
+                target[key] = reader.value()
+        else:
+            target[key] = reader.value()
+
+        if reader.take(",}") == "}":
+            return
+
+
+def _walk_array(reader: _Reader) -> Iterator[Any]:
+    reader.take("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+
+    while True:
+        yield reader.value()
+        if reader.take(",]") == "]":
+            return
@@ -0,0 +1,206 @@
+"""
+Resilience primitives for outbound calls.
+
+- TokenBucket: blocking rate limiter shared by all threads of a process
+- CircuitBreaker: closed -> open after consecutive failures, half-open
+  probing after a cool-down, closed again once a probe succeeds
+
+Both are thread-safe; state lives in the process, so limits configured
+per process apply to each uvicorn worker separately.
+"""
+import time
+import threading
+from typing import Callable, Optional
+
+from app.utils.metrics import REGISTRY
+
+CIRCUIT_STATE = REGISTRY.gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 = closed, 1 = half-open, 2 = open)",
+    ["name"],
+)
+CIRCUIT_TRANSITIONS = REGISTRY.counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state transitions by target state",
+    ["name", "state"],
+)
+CALLS_REJECTED = REGISTRY.counter(
+    "circuit_breaker_rejected_total",
+    "Calls rejected without being attempted, by reason",
+    ["name", "reason"],
+)
+RATE_LIMIT_WAIT = REGISTRY.histogram(
+    "rate_limiter_wait_seconds",
+    "Time spent waiting for a rate limiter token",
+    ["name"],
+)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+
+class RateLimitExceeded(Exception):
+    """Raised when no rate limiter token became available in time"""
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter
+
+    Allows `rate` calls per second on average with bursts of up to
+    `capacity`. A rate of 0 or less disables limiting.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        name: str = "default",
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.name = name
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if available; otherwise return seconds until one is"""
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Block until a token is available
+
+        Raises:
+            RateLimitExceeded: If no token is available within timeout seconds
+        """
+        if self.rate <= 0:
+            return
+
+        started = self._clock()
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                RATE_LIMIT_WAIT.observe(self.name, value=self._clock() - started)
+                return
+            if timeout is not None and self._clock() - started + wait > timeout:
+                CALLS_REJECTED.inc(self.name, "rate_limited")
+                raise RateLimitExceeded(f"{self.name}: rate limit of {self.rate}/s exceeded")
+            self._sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail immediately with CircuitOpenError. Once `recovery_timeout`
+    seconds have passed, up to `half_open_max_calls` probe calls are let
+    through; a successful probe closes the circuit, a failed one re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        CIRCUIT_STATE.set(name, value=0)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through (0 if not open)"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self.recovery_timeout - (self._clock() - self._opened_at), 0.0)
+
+    def before_call(self):
+        """
+        Admit or reject a call
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all probes in flight
+        """
+        with self._lock:
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.recovery_timeout:
+                    CALLS_REJECTED.inc(self.name, "circuit_open")
+                    raise CircuitOpenError(f"{self.name}: circuit open")
+                self._transition(HALF_OPEN)
+
+            if self._state == HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    CALLS_REJECTED.inc(self.name, "circuit_open")
+                    raise CircuitOpenError(f"{self.name}: circuit half-open, probe in progress")
+                self._probes += 1
+
+    def release(self):
+        """Give back an admitted call that was never attempted"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == OPEN:
+                # Late failure of a call admitted before the circuit opened
+                return
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._transition(OPEN)
+
+    def _transition(self, state: str):
+        # Caller holds self._lock
+        if state == self._state:
+            return
+        self._state = state
+        self._probes = 0
+        CIRCUIT_STATE.set(self.name, value=_STATE_VALUES[state])
+        CIRCUIT_TRANSITIONS.inc(self.name, state)
@@ -0,0 +1,215 @@
+"""
+SQL query instrumentation
+- Per-request query count and DB time via SQLAlchemy cursor events
+- Slow statement logging with parameter shape (never values)
+- Repeated identical statements within one request flagged as likely N+1
+- track_queries() for asserting query budgets in tests
+- Connection pool checkout/overflow gauges and request wait time
+"""
+import time
+import logging
+from collections import Counter as CounterDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+QUERY_LATENCY = REGISTRY.histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time in seconds",
+    ["operation"],
+)
+NPLUSONE_DETECTED = REGISTRY.counter(
+    "db_nplusone_detected_total",
+    "Requests where a statement repeated at least SQL_NPLUSONE_THRESHOLD times",
+    ["route"],
+)
+POOL_CHECKED_OUT = REGISTRY.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+)
+POOL_OVERFLOW = REGISTRY.gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is not full)",
+)
+POOL_CHECKOUTS = REGISTRY.counter(
+    "db_pool_checkouts_total",
+    "Connection checkouts from the pool",
+)
+POOL_CONNECTIONS_OPENED = REGISTRY.counter(
+    "db_pool_connections_opened_total",
+    "New DBAPI connections opened by the pool",
+)
+POOL_WAIT = REGISTRY.histogram(
+    "db_pool_wait_seconds",
+    "Time request handlers waited to obtain a database connection",
+)
+
+
+class QueryStats:
+    """Queries executed within one unit of work (usually one HTTP request)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.statements: CounterDict = CounterDict()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+
+    @property
+    def total_time_ms(self) -> float:
+        return round(self.total_time * 1000, 2)
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least threshold times, most repeated first"""
+        return [
+            (statement, count) for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        """Server-Timing header value for this unit of work"""
+        return f'db;dur={self.total_time_ms};desc="{self.count} queries"'
+
+
+# Active QueryStats for the current request/task, if any
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+# Process-wide trackers installed by track_queries(), regardless of context
+_global_trackers: List[QueryStats] = []
+
+
+def describe_parameters(parameters: Any) -> str:
+    """Describe the shape of statement parameters without exposing values"""
+    if isinstance(parameters, dict):
+        return f"dict({', '.join(sorted(str(k) for k in parameters))})"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {describe_parameters(parameters[0])}"
+        return f"tuple[{len(parameters)}]"
+    return type(parameters).__name__
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    return head[0].upper() if head else "UNKNOWN"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context so a failing statement leaves nothing behind
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_time = getattr(context, "_query_start_time", None)
+    if start_time is None:
+        return
+    elapsed = time.perf_counter() - start_time
+
+    QUERY_LATENCY.observe(_operation(statement), value=elapsed)
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for tracker in _global_trackers:
+        if tracker is not stats:
+            tracker.record(statement, elapsed)
+
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms > settings.SQL_SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f}ms, params {describe_parameters(parameters)}): "
+            f"{' '.join(statement.split())[:500]}"
+        )
+
+
+def instrument_engine(engine: Engine):
+    """Attach query timing listeners to an engine (idempotent)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_pool(engine: Engine):
+    """Attach pool checkout/checkin listeners updating the pool metrics (idempotent)"""
+    pool = engine.pool
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.inc()
+        POOL_CHECKED_OUT.inc()
+        # Only QueuePool tracks overflow (SQLite in-memory uses other pools)
+        if hasattr(pool, "overflow"):
+            POOL_OVERFLOW.set(value=pool.overflow())
+
+    def on_checkin(dbapi_connection, connection_record):
+        # Fired before the pool's own counters are updated, so track checkouts ourselves
+        POOL_CHECKED_OUT.dec()
+
+    def on_connect(dbapi_connection, connection_record):
+        POOL_CONNECTIONS_OPENED.inc()
+
+    if getattr(pool, "_metrics_instrumented", False):
+        return
+    pool._metrics_instrumented = True
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+    event.listen(pool, "connect", on_connect)
+
+
+def record_pool_wait(engine: Engine, seconds: float):
+    """Record how long a request waited for a connection, warning when it is slow"""
+    POOL_WAIT.observe(value=seconds)
+    wait_ms = seconds * 1000
+    if wait_ms > settings.DB_POOL_WAIT_WARN_MS:
+        logger.warning(
+            f"Request waited {wait_ms:.1f}ms for a database connection "
+            f"({engine.pool.status()}); consider raising DB_POOL_SIZE/DB_MAX_OVERFLOW"
+        )
+
+
+def report_request_queries(stats: QueryStats, method: str, path: str, route: str):
+    """Log likely N+1 patterns found in one request"""
+    repeated = stats.repeated_statements(settings.SQL_NPLUSONE_THRESHOLD)
+    if not repeated:
+        return
+
+    NPLUSONE_DETECTED.inc(route)
+    statement, count = repeated[0]
+    logger.warning(
+        f"Possible N+1 in {method} {path}: statement executed {count} times "
+        f"({stats.count} queries, {stats.total_time_ms}ms total): "
+        f"{' '.join(statement.split())[:300]}"
+    )
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collect every query executed in the process while the block runs.
+
+    Intended for tests and benchmarks, where requests may execute in
+    another thread (e.g. TestClient) than the code asserting the budget.
+
+    Example:
+        with track_queries() as stats:
+            client.get("/api/v1/check-objects")
+        assert stats.count <= 3
+    """
+    stats = QueryStats()
+    _global_trackers.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_trackers.remove(stats)
@@ -0,0 +1,36 @@
+import os
+import logging
+
+import anyio
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+logger = logging.getLogger(__name__)
+
+
+class ReportStaticFiles(StaticFiles):
+    """
+    Static file mount for /reports that falls back to month archives.
+
+    Reports moved into YYYY-MM.zip by the archival job keep their original
+    /reports/YYYY/MM/<file> URL; on a miss the file is extracted on demand.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as exc:
+            if exc.status_code != 404:
+                raise
+
+        from app.services.file_service import FileService
+
+        restored_path = await anyio.to_thread.run_sync(
+            FileService().resolve_report_path, f"/reports/{path}"
+        )
+        if not restored_path:
+            raise HTTPException(status_code=404)
+
+        return self.file_response(restored_path, os.stat(restored_path), scope)
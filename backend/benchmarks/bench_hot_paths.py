@@ -0,0 +1,356 @@
+"""
+Benchmark: hot paths against a seeded synthetic dataset
+
+Seeds CheckObject/CheckObjectItem rows through the sync pipeline from a
+seeded MockClientAPIService dataset, then measures:
+
+- sync ingest throughput (objects/items per second)
+- list page latency at the first, middle and last page
+- detail latency
+- Excel export time and peak Python memory
+- batch report ZIP throughput
+- submission throughput (mock client API)
+
+HTTP paths are driven through the real app with TestClient, so routing,
+validation, serialization and middleware are included. Results are
+written as JSON; pass a previous report with --compare to flag
+regressions beyond --tolerance.
+
+Usage:
+    python -m benchmarks.bench_hot_paths [--objects 5000] [--items 3] [--seed 42]
+        [--json report.json] [--compare baseline.json] [--tolerance 0.2]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import reports as reports_api
+from app.api.deps import get_current_user
+from app.config import settings
+from app.database import Base, get_db
+from app.main import app
+from app.models.check_object import CheckObject
+from app.models.user import User
+from app.services.excel_service import ExcelExportService
+from app.services.file_service import FileService
+from app.services.client_api_service import ClientAPIService
+from app.services.mock_client_api import MockClientAPIService
+from app.services.submit_service import SubmitService
+from app.services.sync_pipeline import SyncPipeline
+from app.utils.sql_instrumentation import instrument_engine, track_queries
+
+# Excel export is limited to 1000 rows per request
+EXCEL_MAX_ROWS = 1000
+
+
+def percentiles(samples_ms: List[float]) -> Dict:
+    ordered = sorted(samples_ms)
+    return {
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def timed_requests(call: Callable[[int], object], iterations: int) -> Dict:
+    """Latency percentiles and mean queries per call for call(i)"""
+    samples = []
+    with track_queries() as stats:
+        for i in range(iterations):
+            started = time.perf_counter()
+            call(i)
+            samples.append((time.perf_counter() - started) * 1000)
+    return {**percentiles(samples), "queries_per_call": round(stats.count / iterations, 1)}
+
+
+def bench_sync_ingest(SessionLocal, mock: MockClientAPIService, batch_size: int) -> Dict:
+    """Run one pipelined sync over the whole dataset, batch_size objects per upstream page"""
+    client = ClientAPIService()
+    client.use_mock = True
+    client.mock_service = mock
+    mock.timeline()  # Build the mock's sampling-time index outside the measurement
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        pipeline = SyncPipeline(db, client, page_size=batch_size)
+        counts = pipeline.run()
+    finally:
+        db.close()
+
+    objects = counts["fetched_count"]
+    items = objects * mock.items_per_object
+    elapsed = time.perf_counter() - started
+    return {
+        "objects": objects,
+        "items": items,
+        "seconds": round(elapsed, 3),
+        "objects_per_sec": round(objects / elapsed, 1),
+        "items_per_sec": round(items / elapsed, 1),
+        "upstream_requests": pipeline.requests,
+    }
+
+
+def prepare_results(SessionLocal, report_count: int, report_kb: int, upload_dir: str, seed: int) -> List[int]:
+    """
+    Mark every other object as checked and attach PDF reports to the first
+    report_count objects. Returns the ids of checked objects.
+    """
+    rng = random.Random(seed)
+    file_service = FileService(upload_dir=upload_dir)
+    month_dir = os.path.join(file_service.reports_dir, "2025", "01")
+    os.makedirs(month_dir, exist_ok=True)
+
+    db = SessionLocal()
+    try:
+        checked_ids = []
+        objects = db.query(CheckObject).order_by(CheckObject.id).all()
+        for index, obj in enumerate(objects):
+            if index % 2 == 0:
+                obj.status = 1
+                obj.check_result = "合格" if rng.random() > 0.1 else "不合格"
+                checked_ids.append(obj.id)
+            if index < report_count:
+                name = f"{obj.check_object_union_num}.pdf"
+                with open(os.path.join(month_dir, name), "wb") as f:
+                    f.write(b"%PDF-1.4\n" + os.urandom(report_kb * 1024))
+                obj.check_result_url = f"/reports/2025/01/{name}"
+        db.commit()
+        return checked_ids
+    finally:
+        db.close()
+
+
+def bench_list_pages(client: TestClient, total: int, page_size: int, iterations: int) -> Dict:
+    last_page = max(1, -(-total // page_size))
+    results = {}
+    for label, page in [("first", 1), ("middle", max(1, last_page // 2)), ("last", last_page)]:
+        url = f"/api/v1/check-objects?page={page}&page_size={page_size}"
+        results[label] = {"page": page, **timed_requests(lambda i: client.get(url).raise_for_status(), iterations)}
+    return results
+
+
+def bench_detail(client: TestClient, total: int, iterations: int, seed: int) -> Dict:
+    rng = random.Random(seed)
+    ids = [rng.randint(1, total) for _ in range(iterations)]
+    return timed_requests(lambda i: client.get(f"/api/v1/check-objects/{ids[i]}").raise_for_status(), iterations)
+
+
+def bench_excel_export(SessionLocal, check_object_ids: List[int], items_per_object: int) -> Dict:
+    ids = check_object_ids[:max(1, EXCEL_MAX_ROWS // max(1, items_per_object))]
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        content = ExcelExportService(db).export_to_excel(ids)
+        elapsed = time.perf_counter() - started
+
+        # Separate pass: tracemalloc slows allocation-heavy code considerably
+        tracemalloc.start()
+        ExcelExportService(db).export_to_excel(ids)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        db.close()
+    return {
+        "objects": len(ids),
+        "rows": len(ids) * items_per_object,
+        "seconds": round(elapsed, 3),
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+        "file_kb": round(len(content) / 1024, 1),
+    }
+
+
+def bench_batch_zip(client: TestClient, report_count: int, report_kb: int, iterations: int) -> Dict:
+    samples = []
+    size = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = client.post("/api/v1/reports/batch-download", json={})
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+        size = len(response.content)
+    mean = statistics.mean(samples)
+    return {
+        "reports": report_count,
+        "seconds": round(mean, 3),
+        "reports_per_sec": round(report_count / mean, 1),
+        "input_mb_per_sec": round(report_count * report_kb / 1024 / mean, 1),
+        "zip_kb": round(size / 1024, 1),
+    }
+
+
+def bench_submission(SessionLocal, check_object_ids: List[int], count: int) -> Dict:
+    ids = check_object_ids[:count]
+    succeeded = 0
+    db = SessionLocal()
+    try:
+        service = SubmitService(db)
+        started = time.perf_counter()
+        for check_object_id in ids:
+            if service.submit_check_object(check_object_id)["success"]:
+                succeeded += 1
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    return {
+        "submitted": len(ids),
+        "succeeded": succeeded,
+        "seconds": round(elapsed, 3),
+        "submissions_per_sec": round(len(ids) / elapsed, 1),
+    }
+
+
+def run(args, workdir: str) -> Dict:
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    instrument_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    mock = MockClientAPIService(
+        total=args.objects,
+        items_per_object=args.items,
+        seed=args.seed,
+        base_date=datetime(2025, 1, 1)
+    )
+    upload_dir = os.path.join(workdir, "uploads")
+
+    results = {}
+    print(f"Seeding {args.objects} objects x {args.items} items ...", file=sys.stderr)
+    results["sync_ingest"] = bench_sync_ingest(SessionLocal, mock, args.batch_size)
+    checked_ids = prepare_results(SessionLocal, args.reports, args.report_kb, upload_dir, args.seed)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    settings.USE_MOCK_CLIENT_API = True
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, username="bench", role="admin")
+    original_file_service = reports_api.FileService
+    reports_api.FileService = partial(FileService, upload_dir=upload_dir)
+    try:
+        with TestClient(app) as client:
+            print("Measuring list/detail latency ...", file=sys.stderr)
+            results["list_page"] = bench_list_pages(client, args.objects, args.page_size, args.iterations)
+            results["detail"] = bench_detail(client, args.objects, args.iterations, args.seed)
+            print("Measuring Excel export and batch ZIP ...", file=sys.stderr)
+            results["excel_export"] = bench_excel_export(SessionLocal, checked_ids, args.items)
+            results["batch_zip"] = bench_batch_zip(client, args.reports, args.report_kb, args.zip_iterations)
+        print("Measuring submission ...", file=sys.stderr)
+        results["submission"] = bench_submission(SessionLocal, checked_ids, args.submissions)
+    finally:
+        reports_api.FileService = original_file_service
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.url.get_backend_name(),
+            "objects": args.objects,
+            "items_per_object": args.items,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Regressions of current vs baseline results beyond tolerance (fraction).
+
+    Metrics ending in _ms/seconds/_mb are lower-is-better, _per_sec
+    higher-is-better; counts and sizes are informational only.
+    """
+    regressions = []
+    current_flat = flatten(current["results"])
+    for name, old in flatten(baseline["results"]).items():
+        new = current_flat.get(name)
+        if new is None or not old:
+            continue
+        if name.endswith(("_ms", ".seconds", "_mb")):
+            change = (new - old) / old
+        elif name.endswith("_per_sec"):
+            change = (old - new) / old
+        else:
+            continue
+        if change > tolerance:
+            regressions.append(f"{name}: {old} -> {new} ({change:+.0%} worse)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=5000, help="check objects to seed")
+    parser.add_argument("--items", type=int, default=3, help="check items per object")
+    parser.add_argument("--seed", type=int, default=42, help="dataset seed")
+    parser.add_argument("--batch-size", type=int, default=100, help="objects per upstream sync page")
+    parser.add_argument("--page-size", type=int, default=100, help="list page size")
+    parser.add_argument("--iterations", type=int, default=50, help="requests per latency measurement")
+    parser.add_argument("--reports", type=int, default=200, help="PDF reports in the batch ZIP")
+    parser.add_argument("--report-kb", type=int, default=200, help="size of each PDF report")
+    parser.add_argument("--zip-iterations", type=int, default=3, help="batch ZIP downloads")
+    parser.add_argument("--submissions", type=int, default=500, help="objects to submit")
+    parser.add_argument("--database-url", help="database to seed (default: temporary SQLite file)")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression fraction")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    workdir = tempfile.mkdtemp(prefix="bench_hot_paths_")
+    try:
+        report = run(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Micro-benchmark: PerformanceMiddleware overhead and streaming throughput
+
+Compares a bare Starlette app, the previous BaseHTTPMiddleware-based
+PerformanceMiddleware and the current pure ASGI implementation by
+driving the ASGI apps in-process (no sockets), so only middleware cost
+is measured.
+
+Usage:
+    python -m benchmarks.bench_middleware [--requests 5000] [--chunks 256] [--json out.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware.performance import PerformanceMiddleware
+
+CHUNK_SIZE = 64 * 1024
+
+
+class LegacyPerformanceMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation this benchmark compares against"""
+
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        process_time_ms = round((time.time() - start_time) * 1000, 2)
+        response.headers["X-Process-Time"] = str(process_time_ms)
+        if process_time_ms > 500:
+            logging.getLogger(__name__).warning(
+                f"Slow request detected: {request.method} {request.url.path} took {process_time_ms}ms"
+            )
+        else:
+            logging.getLogger(__name__).info(
+                f"{request.method} {request.url.path} completed in {process_time_ms}ms"
+            )
+        return response
+
+
+def build_app(chunks: int, middleware=None) -> Starlette:
+    chunk = b"x" * CHUNK_SIZE
+
+    async def ping(request):
+        return PlainTextResponse("pong")
+
+    async def stream(request):
+        async def body():
+            for _ in range(chunks):
+                yield chunk
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    app = Starlette(routes=[Route("/ping", ping), Route("/stream", stream)])
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+def make_scope(path: str) -> Dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+
+async def call(app, path: str, on_body: Callable[[int], None] = lambda n: None):
+    request_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Like a real server: block until the client goes away
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            on_body(len(message.get("body", b"")))
+
+    await app(make_scope(path), receive, send)
+    disconnected.set()
+
+
+async def bench_overhead(app, requests: int) -> float:
+    """Mean microseconds per small request"""
+    for _ in range(200):
+        await call(app, "/ping")
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(app, "/ping")
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def bench_streaming(app, rounds: int) -> Dict:
+    """Streaming throughput and time to first body chunk"""
+    first_chunk_ms = []
+    total_bytes = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        request_started = time.perf_counter()
+        seen = []
+
+        def on_body(n):
+            nonlocal total_bytes
+            if n and not seen:
+                seen.append(True)
+                first_chunk_ms.append((time.perf_counter() - request_started) * 1000)
+            total_bytes += n
+
+        await call(app, "/stream", on_body)
+    elapsed = time.perf_counter() - started
+    return {
+        "throughput_mb_s": round(total_bytes / elapsed / (1024 * 1024), 1),
+        "first_chunk_ms": round(sum(first_chunk_ms) / len(first_chunk_ms), 3),
+    }
+
+
+async def run(requests: int, chunks: int, rounds: int) -> Dict:
+    variants = {
+        "none": build_app(chunks),
+        "base_http_middleware": build_app(chunks, LegacyPerformanceMiddleware),
+        "pure_asgi": build_app(chunks, PerformanceMiddleware),
+    }
+    results = {}
+    for name, app in variants.items():
+        overhead = await bench_overhead(app, requests)
+        streaming = await bench_streaming(app, rounds)
+        results[name] = {"us_per_request": round(overhead, 1), **streaming}
+
+    baseline = results["none"]["us_per_request"]
+    for result in results.values():
+        result["overhead_us"] = round(result["us_per_request"] - baseline, 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="small requests per variant")
+    parser.add_argument("--chunks", type=int, default=256, help="64KiB chunks per streamed response")
+    parser.add_argument("--rounds", type=int, default=20, help="streamed responses per variant")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = asyncio.run(run(args.requests, args.chunks, args.rounds))
+
+    print(f"{'variant':<22}{'us/req':>10}{'overhead us':>13}{'stream MB/s':>13}{'first chunk ms':>16}")
+    for name, r in results.items():
+        print(
+            f"{name:<22}{r['us_per_request']:>10}{r['overhead_us']:>13}"
+            f"{r['throughput_mb_s']:>13}{r['first_chunk_ms']:>16}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
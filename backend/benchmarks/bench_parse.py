@@ -0,0 +1,156 @@
+"""
+Micro-benchmark: parsing upstream check object payloads
+
+Generates synthetic records in the client API format (objectItems[].checkItem,
+mixed timestamp formats) and compares the previous hand-written
+parse_check_object/_parse_datetime with the compiled field mapping and
+format-sniffing datetime parser now used by ClientAPIService.
+
+Usage:
+    python -m benchmarks.bench_parse [--records 100000] [--items 3] [--seed 42] [--json out.json]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from app.services.client_api_service import ClientAPIService
+from app.services.mock_client_api import MockClientAPIService
+from app.utils import field_mapping
+
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+
+
+def legacy_parse_datetime(dt_str) -> Optional[datetime]:
+    """The _parse_datetime implementation this benchmark compares against"""
+    if not dt_str:
+        return None
+    if isinstance(dt_str, datetime):
+        return dt_str
+    try:
+        for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y/%m/%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"]:
+            try:
+                return datetime.strptime(dt_str, fmt)
+            except ValueError:
+                continue
+        try:
+            return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+        except (ValueError, TypeError):
+            pass
+        return None
+    except (ValueError, TypeError):
+        return None
+
+
+def legacy_parse_check_object(api_data: Dict) -> Dict:
+    """The parse_check_object implementation this benchmark compares against"""
+    parsed = {
+        "check_object_id": api_data.get("check_object_id") or api_data.get("id"),
+        "check_object_union_num": api_data.get("check_no") or api_data.get("check_object_union_num"),
+        "day_num": api_data.get("day_num"),
+        "submission_goods_id": api_data.get("submission_goods_id"),
+        "submission_goods_name": api_data.get("submission_goods_name") or api_data.get("sample_name"),
+        "submission_goods_area": api_data.get("submission_goods_area"),
+        "submission_goods_location": api_data.get("submission_goods_location"),
+        "submission_goods_unit": api_data.get("submission_goods_unit"),
+        "submission_goods_car_number": api_data.get("submission_goods_car_number"),
+        "submission_method": api_data.get("submission_method"),
+        "submission_person": api_data.get("submission_person"),
+        "submission_person_mobile": api_data.get("submission_person_mobile"),
+        "submission_person_company": api_data.get("submission_person_company") or api_data.get("company_name"),
+        "driver": api_data.get("driver"),
+        "driver_mobile": api_data.get("driver_mobile"),
+        "check_type": api_data.get("check_type"),
+        "status": api_data.get("status", 0),
+        "is_receive": api_data.get("is_receive", 1),
+        "check_start_time": legacy_parse_datetime(api_data.get("check_start_time") or api_data.get("sampling_time")),
+        "check_end_time": legacy_parse_datetime(api_data.get("check_end_time")),
+        "check_result": api_data.get("check_result"),
+        "check_result_url": api_data.get("check_result_url") or api_data.get("report_url"),
+        "create_admin": api_data.get("create_admin"),
+    }
+    check_items = []
+    items_data = api_data.get("objectItems") or api_data.get("check_items") or api_data.get("item") or []
+    for item_data in items_data:
+        check_item = item_data.get("checkItem") or item_data
+        check_items.append({
+            "check_object_item_id": item_data.get("check_object_item_id") or item_data.get("id"),
+            "check_item_id": check_item.get("item_id") or check_item.get("check_item_id"),
+            "check_item_name": check_item.get("name") or check_item.get("check_item_name") or check_item.get("item_name"),
+            "unit": check_item.get("reference_values"),
+            "detection_limit": check_item.get("fee"),
+            "check_method": check_item.get("method_name"),
+            "reference_value": check_item.get("reference_value") or check_item.get("reference_values"),
+            "item_indicator": check_item.get("item_indicator"),
+        })
+    parsed["check_items"] = check_items
+    return parsed
+
+
+def make_records(count: int, items: int, seed: int) -> List[Dict]:
+    """Upstream-format records with mixed timestamp formats and some finished checks"""
+    mock = MockClientAPIService(total=count, items_per_object=items, seed=seed, base_date=datetime(2025, 1, 1))
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        record = mock.to_upstream_format(mock.generate_check_object(index))
+        started = mock.sampling_time(index)
+        record["check_start_time"] = started.strftime(rng.choice(TIMESTAMP_FORMATS))
+        if rng.random() < 0.5:
+            record["check_end_time"] = (started + timedelta(hours=rng.randint(1, 48))).strftime("%Y-%m-%d %H:%M:%S")
+        records.append(record)
+    return records
+
+
+def bench(parse: Callable[[Dict], Dict], records: List[Dict], rounds: int) -> float:
+    """Best records/second over rounds"""
+    best = 0.0
+    for _ in range(rounds):
+        field_mapping._parse_string.cache_clear()
+        started = time.perf_counter()
+        for record in records:
+            parse(record)
+        best = max(best, len(records) / (time.perf_counter() - started))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000, help="synthetic records to parse")
+    parser.add_argument("--items", type=int, default=3, help="check items per record")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds per variant, best is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    records = make_records(args.records, args.items, args.seed)
+    service = ClientAPIService()
+    assert all(legacy_parse_check_object(r) == service.parse_check_object(r) for r in records[:1000])
+
+    timestamps = [r["check_start_time"] for r in records] + [r.get("check_end_time") for r in records]
+    results = {
+        "records": args.records,
+        "parse_check_object": {
+            "legacy_records_per_s": round(bench(legacy_parse_check_object, records, args.rounds)),
+            "compiled_records_per_s": round(bench(service.parse_check_object, records, args.rounds)),
+        },
+        "parse_datetime": {
+            "legacy_values_per_s": round(bench(legacy_parse_datetime, timestamps, args.rounds)),
+            "sniffing_values_per_s": round(bench(field_mapping.parse_datetime, timestamps, args.rounds)),
+        },
+    }
+    for name, result in results.items():
+        if isinstance(result, dict):
+            legacy, current = result.values()
+            result["speedup"] = round(current / legacy, 2)
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
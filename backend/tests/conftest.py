@@ -1,4 +1,5 @@
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -7,7 +8,10 @@ from sqlalchemy.pool import StaticPool
 from app.main import app
 from app.database import Base, get_db
 from app.models.user import User
+from app.services import payload_archive
+from app.services.client_api_service import reset_client_api_guards
 from app.utils.security import get_password_hash
+from app.utils.sql_instrumentation import instrument_engine, track_queries
 
 # Create in-memory SQLite database for testing
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -17,6 +21,7 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+instrument_engine(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -119,3 +124,44 @@ def admin_headers(client, test_admin):
     token = response.json()["access_token"]
 
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fail the test if a block executes more than max_queries statements.
+
+    Usage:
+        with assert_max_queries(3):
+            client.get("/api/v1/check-objects", headers=auth_headers)
+    """
+
+    @contextmanager
+    def _assert_max_queries(max_queries: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"Expected at most {max_queries} queries, got {stats.count}:\n"
+            + "\n".join(f"{count}x {statement}" for statement, count in stats.statements.most_common())
+        )
+
+    return _assert_max_queries
+
+
+@pytest.fixture(autouse=True)
+def client_api_guards():
+    """
+    Fresh client API rate limiter and circuit breaker for every test,
+    so failures injected by one test never open the circuit for the next.
+    """
+    reset_client_api_guards()
+    yield
+    reset_client_api_guards()
+
+
+@pytest.fixture(autouse=True)
+def sync_archive(tmp_path, monkeypatch):
+    """Archive upstream pages fetched by a test under its tmp_path"""
+    archive = payload_archive.PayloadArchive(str(tmp_path / "sync_archive"))
+    monkeypatch.setattr(payload_archive, "_payload_archive", archive)
+    return archive
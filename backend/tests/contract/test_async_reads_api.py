@@ -0,0 +1,102 @@
+"""
+Contract tests for the async read endpoints
+Verify async list/detail/sync-logs/download match the sync API contract
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api import async_reads
+from app.database import Base, get_async_db
+from app.models.check_item import CheckObjectItem
+from app.models.check_object import CheckObject
+from app.models.sync_log import SyncLog
+from app.models.user import User
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    """Client for an app serving only the async routers from a SQLite file"""
+    db_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+
+    session = sessionmaker(bind=sync_engine)()
+    session.add(User(username="asyncuser", password_hash="x", name="Async User", role="inspector"))
+    for i in range(1, 16):
+        session.add(CheckObject(
+            check_object_id=1000 + i,
+            check_object_union_num=f"JC{1000 + i:05d}",
+            submission_person_company="甲公司" if i % 2 else "乙公司",
+            status=i % 3,
+        ))
+    session.add(CheckObjectItem(check_object_item_id=1, check_object_id=1001, check_item_id=1, check_item_name="铅"))
+    session.add(SyncLog(sync_type="manual", status="success"))
+    session.add(SyncLog(sync_type="auto", status="error"))
+    session.commit()
+    session.close()
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_reads.router, prefix="/api/v1")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    token = create_access_token({"sub": "asyncuser"})
+    with TestClient(app, headers={"Authorization": f"Bearer {token}"}) as client:
+        yield client
+
+
+class TestAsyncReadsAPI:
+    """Contract tests for async read endpoints"""
+
+    def test_list_filters_and_paginates(self, async_client):
+        """Test list applies filters, ordering and pagination"""
+        response = async_client.get("/api/v1/check-objects?page=2&page_size=5&company=甲")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 8
+        assert data["page"] == 2
+        assert [item["check_object_union_num"] for item in data["items"]] == [
+            "JC01011", "JC01013", "JC01015"
+        ]
+
+    def test_detail_includes_items(self, async_client):
+        """Test detail returns check items"""
+        response = async_client.get("/api/v1/check-objects/1")
+
+        assert response.status_code == 200
+        assert response.json()["check_items"][0]["check_item_name"] == "铅"
+        assert async_client.get("/api/v1/check-objects/999").status_code == 404
+
+    def test_sync_logs(self, async_client):
+        """Test sync logs are filtered and counted"""
+        response = async_client.get("/api/v1/sync/logs?status=error")
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        assert response.json()["items"][0]["sync_type"] == "auto"
+
+    def test_download_without_report(self, async_client):
+        """Test download returns 404 when no report was uploaded"""
+        response = async_client.get("/api/v1/reports/download/JC01001")
+
+        assert response.status_code == 404
+
+    def test_requires_valid_token(self, async_client):
+        """Test invalid tokens are rejected"""
+        response = async_client.get("/api/v1/check-objects", headers={"Authorization": "Bearer invalid"})
+
+        assert response.status_code == 401
@@ -0,0 +1,104 @@
+"""
+Contract tests for automatic result judgement
+Test POST /check-objects/evaluate
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models.check_item import CheckObjectItem
+from app.models.check_object import CheckObject
+
+
+def add_sample(db, check_object_id, status, items):
+    obj = CheckObject(
+        check_object_id=check_object_id,
+        check_object_union_num=f"JC{check_object_id}",
+        status=status
+    )
+    db.add(obj)
+    for index, (name, num, reference_value) in enumerate(items):
+        db.add(CheckObjectItem(
+            check_object_item_id=check_object_id * 100 + index, check_object_id=check_object_id,
+            check_item_id=index, check_item_name=name, num=num, reference_value=reference_value
+        ))
+    db.commit()
+    return obj
+
+
+@pytest.fixture
+def samples(db):
+    return [
+        add_sample(db, 601, 0, [("铅", "0.05", "≤0.2mg/kg"), ("克伦特罗", "未检出", "不得检出")]),
+        add_sample(db, 602, 0, [("镉", "0.3", "≤0.1mg/kg"), ("铅", "0.1", "≤0.2mg/kg")]),
+        add_sample(db, 603, 0, [("铅", None, "≤0.2mg/kg")]),
+        add_sample(db, 604, 2, [("铅", "0.5", "≤0.2mg/kg")]),
+    ]
+
+
+class TestEvaluateEndpoint:
+    """Contract test for POST /check-objects/evaluate"""
+
+    def test_evaluate_without_apply(self, client: TestClient, auth_headers: dict, db, samples):
+        """Test samples are judged without writing anything"""
+        ids = [obj.id for obj in samples]
+        response = client.post(
+            "/api/v1/check-objects/evaluate", json={"ids": ids + [9999]}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["check_result"] for r in data["results"]] == ["合格", "不合格", None, "不合格"]
+        assert [i["result"] for i in data["results"][1]["items"]] == ["不合格", "合格"]
+        assert data["results"][0]["items"][0]["rule"] == "≤0.2"
+        assert data["not_found"] == [9999]
+        assert data["applied_count"] == 0
+        db.expire_all()
+        assert db.query(CheckObjectItem).filter(CheckObjectItem.result.isnot(None)).count() == 0
+
+    def test_evaluate_with_apply(self, client: TestClient, auth_headers: dict, db, samples):
+        """Test determined results are written and submitted samples are left alone"""
+        response = client.post(
+            "/api/v1/check-objects/evaluate",
+            json={"ids": [obj.id for obj in samples], "apply": True},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["applied_count"] == 3
+        db.expire_all()
+        stored = {obj.check_object_id: (obj.status, obj.check_result) for obj in db.query(CheckObject)}
+        assert stored == {601: (1, "合格"), 602: (1, "不合格"), 603: (0, None), 604: (2, None)}
+        assert db.query(CheckObjectItem).filter(CheckObjectItem.check_object_id == 604).one().result is None
+
+    def test_apply_keeps_manual_results(self, client: TestClient, auth_headers: dict, db, samples):
+        """Test apply only fills empty results and reports manual values that disagree"""
+        manual = samples[0]
+        manual.status, manual.check_result = 1, "不合格"
+        lead = db.query(CheckObjectItem).filter(CheckObjectItem.check_object_item_id == 60100).one()
+        lead.result = "不合格"
+        db.commit()
+
+        response = client.post(
+            "/api/v1/check-objects/evaluate", json={"ids": [manual.id], "apply": True}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        sample = data["results"][0]
+        assert (sample["check_result"], sample["current_check_result"], sample["conflict"]) == ("合格", "不合格", True)
+        assert [(i["result"], i["current_result"], i["conflict"]) for i in sample["items"]] == [
+            ("合格", "不合格", True), ("合格", None, False)
+        ]
+        assert (data["applied_count"], data["conflict_count"]) == (1, 1)
+        db.expire_all()
+        assert db.get(CheckObject, manual.id).check_result == "不合格"
+        assert [item.result for item in db.get(CheckObject, manual.id).check_items] == ["不合格", "合格"]
+
+    def test_evaluate_limits_batch_size(self, client: TestClient, auth_headers: dict, monkeypatch):
+        """Test requests above JUDGEMENT_MAX_OBJECTS are rejected"""
+        monkeypatch.setattr(settings, "JUDGEMENT_MAX_OBJECTS", 2)
+
+        response = client.post("/api/v1/check-objects/evaluate", json={"ids": [1, 2, 3]}, headers=auth_headers)
+
+        assert response.status_code == 422
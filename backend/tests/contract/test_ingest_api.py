@@ -0,0 +1,217 @@
+"""
+Contract tests for push ingest
+POST /ingest/check/data verifies the push signature, stores the push in the
+inbox and writes it in the background
+"""
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models.check_object import CheckObject
+from app.models.ingest_inbox import IngestInbox
+from app.services import ingest_service
+from app.services.client_api_service import ClientAPIService
+from app.services.ingest_service import InboxWorker, purge_inbox, push_signature
+from app.services.mock_client_api import MockClientAPIService
+from app.services.sync_service import SyncService
+
+URL = "/api/v1/ingest/check/data"
+INGEST_SECRET = "push-secret"
+
+
+@pytest.fixture(autouse=True)
+def inbox_worker(monkeypatch):
+    """Webhook enabled, fresh inbox worker per test"""
+    monkeypatch.setattr(settings, "INGEST_WEBHOOK_ENABLED", True)
+    monkeypatch.setattr(settings, "INGEST_SECRET", INGEST_SECRET)
+    worker = InboxWorker()
+    monkeypatch.setattr(ingest_service, "_inbox_worker", worker)
+    return worker
+
+
+def upstream_objects(count: int, start: int = 0):
+    mock = MockClientAPIService(total=100, seed=2, base_date=datetime(2025, 1, 1))
+    return [mock.to_upstream_format(mock.generate_check_object(i)) for i in range(start, start + count)]
+
+
+def signed_push(biz) -> dict:
+    """Form fields of a push signed with INGEST_SECRET"""
+    if not isinstance(biz, str):
+        biz = json.dumps(biz, ensure_ascii=False)
+    form = {
+        "app_id": settings.CLIENT_APP_ID,
+        "time": str(int(time.time())),
+        "random_str": uuid.uuid4().hex[:16],
+        "biz": biz,
+    }
+    form["sign"] = push_signature(form["app_id"], form["time"], form["random_str"], biz, INGEST_SECRET)
+    return form
+
+
+def drain(worker: InboxWorker):
+    worker._executor.shutdown(wait=True)
+
+
+class TestPushIngestAPI:
+    """Contract test for POST /ingest/check/data"""
+
+    def test_push_is_stored_then_written(self, client, db, inbox_worker):
+        """Test a signed push is acknowledged with 202 and written by the worker"""
+        response = client.post(URL, data=signed_push({"list": upstream_objects(5)}))
+        drain(inbox_worker)
+
+        assert response.status_code == 202
+        assert response.json()["duplicate"] is False
+        row = db.get(IngestInbox, response.json()["inbox_id"])
+        db.refresh(row)
+        assert (row.status, row.object_count) == ("done", 5)
+        assert db.query(CheckObject).count() == 5
+
+    def test_response_shape_payload(self, client, db, inbox_worker):
+        """Test biz may also carry the objects as data.list like a check/data response"""
+        response = client.post(URL, data=signed_push({"data": {"count": 3, "list": upstream_objects(3)}}))
+        drain(inbox_worker)
+
+        assert response.status_code == 202
+        assert db.query(CheckObject).count() == 3
+
+    def test_redelivery_is_acknowledged_once(self, client, db, inbox_worker):
+        """Test the same signed push is stored and written only once"""
+        form = signed_push({"list": upstream_objects(2)})
+
+        first = client.post(URL, data=form)
+        second = client.post(URL, data=form)
+        drain(inbox_worker)
+
+        assert second.status_code == 202
+        assert second.json()["duplicate"] is True
+        assert second.json()["inbox_id"] == first.json()["inbox_id"]
+        assert db.query(IngestInbox).count() == 1
+
+    @pytest.mark.parametrize("tamper", [
+        {"sign": "0" * 32},
+        {"app_id": "other-app"},
+        {"time": str(int(time.time()) - 3600)},
+    ])
+    def test_rejects_bad_or_stale_signatures(self, client, db, tamper):
+        """Test pushes with a wrong signature, app id or an old signed time get 401"""
+        form = {**signed_push({"list": upstream_objects(1)}), **tamper}
+
+        response = client.post(URL, data=form)
+
+        assert response.status_code == 401
+        assert db.query(IngestInbox).count() == 0
+
+    def test_rejects_swapped_biz(self, client, db):
+        """Test the signature covers biz, so a captured push cannot carry other objects"""
+        form = signed_push({"list": upstream_objects(1)})
+        form["biz"] = json.dumps({"list": upstream_objects(3, start=10)}, ensure_ascii=False)
+
+        response = client.post(URL, data=form)
+
+        assert response.status_code == 401
+        assert db.query(IngestInbox).count() == 0
+
+    def test_rejects_our_outbound_request_signature(self, client, db, monkeypatch):
+        """Test a request we signed for the client API is not accepted as a push"""
+        monkeypatch.setattr(settings, "INGEST_SECRET", settings.CLIENT_SECRET)
+        form = ClientAPIService()._prepare_request_params({"list": upstream_objects(1)})
+
+        response = client.post(URL, data=form)
+
+        assert response.status_code == 401
+        assert db.query(IngestInbox).count() == 0
+
+    def test_rejects_everything_without_secret(self, client, db, monkeypatch):
+        """Test pushes are refused while INGEST_SECRET is not configured"""
+        form = signed_push({"list": upstream_objects(1)})
+        monkeypatch.setattr(settings, "INGEST_SECRET", "")
+
+        assert client.post(URL, data=form).status_code == 401
+
+    @pytest.mark.parametrize("biz", ['not json', '[1, 2]', '{"list": [1]}', '{"items": []}'])
+    def test_rejects_malformed_biz(self, client, db, biz):
+        """Test a biz without a list of objects gets 400 and is not stored"""
+        form = signed_push(biz)
+
+        response = client.post(URL, data=form)
+
+        assert response.status_code == 400
+        assert db.query(IngestInbox).count() == 0
+
+    def test_disabled_by_default(self, client, monkeypatch):
+        """Test the endpoint is off unless INGEST_WEBHOOK_ENABLED is set"""
+        monkeypatch.setattr(settings, "INGEST_WEBHOOK_ENABLED", False)
+
+        assert client.post(URL, data=signed_push({"list": []})).status_code == 404
+
+
+class TestProcessInbox:
+    """Unit test for SyncService.process_inbox"""
+
+    def add_push(self, db, nonce: str, biz: dict) -> IngestInbox:
+        row = IngestInbox(nonce=nonce, payload=json.dumps(biz, ensure_ascii=False), status="pending", attempts=0)
+        db.add(row)
+        db.commit()
+        return row
+
+    def test_push_waits_for_a_running_sync(self, db):
+        """Test pushes stay pending while a sync holds the lock, then are written"""
+        row = self.add_push(db, "a", {"list": upstream_objects(4)})
+
+        SyncService._sync_lock.acquire()
+        try:
+            with pytest.raises(Exception, match="同步正在进行中"):
+                SyncService(db).process_inbox()
+        finally:
+            SyncService._sync_lock.release()
+        assert row.status == "pending"
+
+        result = SyncService(db).process_inbox()
+
+        assert (result["processed"], result["new_count"]) == (1, 4)
+        assert db.query(CheckObject).count() == 4
+
+    def test_empty_inbox_skips_the_sync_lock(self, db):
+        """Test an empty inbox returns without contending for the sync locks"""
+        SyncService._sync_lock.acquire()
+        try:
+            result = SyncService(db).process_inbox()
+        finally:
+            SyncService._sync_lock.release()
+
+        assert (result["processed"], result["failed"], result["new_count"]) == (0, 0, 0)
+
+    def test_failing_rows_are_retried_then_failed(self, db, monkeypatch):
+        """Test a row that cannot be written is retried up to INGEST_MAX_ATTEMPTS"""
+        monkeypatch.setattr(settings, "INGEST_MAX_ATTEMPTS", 2)
+        bad = self.add_push(db, "bad", {"list": [{"checkNo": None, "objectItems": "broken"}]})
+        good = self.add_push(db, "good", {"list": upstream_objects(1)})
+
+        first = SyncService(db).process_inbox()
+        second = SyncService(db).process_inbox()
+
+        assert (first["processed"], first["failed"]) == (1, 1)
+        assert (second["processed"], second["failed"]) == (0, 1)
+        assert (bad.status, bad.attempts) == ("failed", 2)
+        assert bad.error_message
+        assert good.status == "done"
+
+    def test_done_rows_are_purged_after_retention(self, db, monkeypatch):
+        """Test done rows older than INGEST_INBOX_RETENTION_HOURS are deleted, others kept"""
+        monkeypatch.setattr(settings, "INGEST_INBOX_RETENTION_HOURS", 24)
+        now = datetime(2025, 6, 10, 12, 0, 0)
+        old_done = self.add_push(db, "old-done", {"list": []})
+        recent_done = self.add_push(db, "recent-done", {"list": []})
+        old_failed = self.add_push(db, "old-failed", {"list": []})
+        old_done.status, old_done.processed_at = "done", now - timedelta(hours=25)
+        recent_done.status, recent_done.processed_at = "done", now - timedelta(hours=1)
+        old_failed.status, old_failed.processed_at = "failed", now - timedelta(hours=25)
+        db.commit()
+
+        assert purge_inbox(db, now=now) == 1
+        assert sorted(row.nonce for row in db.query(IngestInbox)) == ["old-failed", "recent-done"]
@@ -0,0 +1,63 @@
+"""
+Contract tests for Report Preview API
+Test GET /reports/preview/{check_no}
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.check_object import CheckObject
+from app.services import preview_service
+from app.services.file_service import FileService
+from app.services.preview_service import ReportPreviewService
+
+
+@pytest.fixture
+def report_storage(tmp_path, monkeypatch):
+    upload_dir = tmp_path / "uploads"
+    monkeypatch.setattr("app.api.reports.FileService", lambda: FileService(upload_dir=str(upload_dir)))
+    monkeypatch.setattr(
+        preview_service, "_preview_service",
+        ReportPreviewService(cache_dir=str(upload_dir / "previews"))
+    )
+    return upload_dir
+
+
+class TestReportPreviewEndpoint:
+    """Contract test for GET /reports/preview/{check_no}"""
+
+    def test_preview_returns_thumbnail(self, client: TestClient, auth_headers: dict, db, report_storage):
+        """Test preview returns a PNG with page count header"""
+        if not preview_service.ReportPreviewService().can_render:
+            pytest.skip("PyMuPDF not installed")
+
+        month_dir = report_storage / "reports" / "2025" / "11"
+        month_dir.mkdir(parents=True)
+        document = preview_service.pymupdf.open()
+        document.new_page()
+        document.new_page()
+        document.save(str(month_dir / "report.pdf"))
+        document.close()
+        db.add(CheckObject(
+            check_object_id=1,
+            check_object_union_num="JC0001",
+            check_result_url="/reports/2025/11/report.pdf",
+        ))
+        db.commit()
+
+        response = client.get("/api/v1/reports/preview/JC0001", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["x-page-count"] == "2"
+
+    def test_preview_unknown_check_no(self, client: TestClient, auth_headers: dict, report_storage):
+        """Test preview of unknown check object returns 404"""
+        response = client.get("/api/v1/reports/preview/UNKNOWN", headers=auth_headers)
+
+        assert response.status_code == 404
+
+    def test_preview_requires_authentication(self, client: TestClient):
+        """Test that preview requires authentication"""
+        response = client.get("/api/v1/reports/preview/JC0001")
+
+        assert response.status_code in (401, 403)
@@ -0,0 +1,51 @@
+"""
+Contract tests for Storage API
+Test GET /storage/usage
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import storage_service
+from app.services.storage_service import StorageAccountingService
+
+
+@pytest.fixture
+def accounting(tmp_path, monkeypatch):
+    instance = StorageAccountingService(upload_dir=str(tmp_path / "uploads"))
+    monkeypatch.setattr(storage_service, "_storage_accounting", instance)
+    return instance
+
+
+class TestStorageUsageEndpoint:
+    """Contract test for GET /storage/usage"""
+
+    def test_usage_requires_admin(self, client: TestClient, auth_headers: dict, accounting):
+        """Test that inspectors cannot read storage usage"""
+        response = client.get("/api/v1/storage/usage", headers=auth_headers)
+
+        assert response.status_code == 403
+
+    def test_usage_returns_month_breakdown(self, client: TestClient, admin_headers: dict, accounting, tmp_path):
+        """Test usage response structure"""
+        report = tmp_path / "uploads" / "reports" / "2025" / "11" / "a.pdf"
+        accounting.record_added(str(report), 2048)
+
+        response = client.get("/api/v1/storage/usage", headers=admin_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_bytes"] == 2048
+        assert data["months"] == [{"month": "2025/11", "bytes": 2048, "files": 1}]
+        assert "growth_bytes_per_day" in data
+        assert "days_to_full" in data
+
+    def test_usage_refresh_rescans(self, client: TestClient, admin_headers: dict, accounting, tmp_path):
+        """Test refresh=true re-measures the reports directory"""
+        month_dir = tmp_path / "uploads" / "reports" / "2025" / "10"
+        month_dir.mkdir(parents=True)
+        (month_dir / "a.pdf").write_bytes(b"%PDF" + b"x" * 96)
+
+        response = client.get("/api/v1/storage/usage?refresh=true", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert response.json()["total_bytes"] == 100
@@ -0,0 +1,149 @@
+"""
+Contract tests for background sync jobs
+POST /sync/fetch queues a job; GET /sync/jobs/{id} and /events report progress
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import sync as sync_api
+from app.config import settings
+from app.models.sync_log import SyncLog
+from app.services import sync_job_service
+from app.services.mock_client_api import MockClientAPIService
+from app.services.sync_job_service import SyncJobManager, get_sync_job_manager
+from app.services.sync_service import SyncProgress
+
+
+@pytest.fixture(autouse=True)
+def job_manager(monkeypatch):
+    """Fresh job manager per test (test databases reuse SyncLog ids)"""
+    monkeypatch.setattr(sync_job_service, "_sync_job_manager", SyncJobManager())
+
+
+@pytest.fixture
+def mock_upstream(monkeypatch):
+    # Buffered responses go through fetch_check_objects, which is patched here
+    monkeypatch.setattr(settings, "CLIENT_API_STREAM_RESPONSES", False)
+    mock = MockClientAPIService(total=5, seed=1)
+    with patch(
+        "app.services.client_api_service.ClientAPIService.fetch_check_objects",
+        side_effect=lambda **kwargs: mock.get_mock_check_objects(**kwargs)
+    ):
+        yield mock
+
+
+def run_job(client: TestClient, auth_headers: dict) -> int:
+    response = client.post("/api/v1/sync/fetch", headers=auth_headers)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert get_sync_job_manager().get(job_id).done.wait(10)
+    return job_id
+
+
+class TestSyncJobsAPI:
+    """Contract tests for background sync jobs"""
+
+    def test_fetch_returns_job_and_completes(self, client, auth_headers, db, mock_upstream):
+        """Test manual sync returns a job id and records final counts with end_time"""
+        job_id = run_job(client, auth_headers)
+
+        response = client.get(f"/api/v1/sync/jobs/{job_id}", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert data["pages_fetched"] >= 1
+        assert data["total"] == 5
+        assert data["new_count"] == 5
+        assert data["rows_upserted"] == 5
+        assert data["eta_seconds"] == 0
+
+        db.expire_all()
+        log = db.get(SyncLog, job_id)
+        assert log.status == "success"
+        assert log.operator == "testuser"
+        assert log.new_count == 5
+        assert log.end_time is not None
+
+    def test_job_status_falls_back_to_sync_log(self, client, auth_headers, db):
+        """Test jobs not tracked by this process are reported from SyncLog"""
+        log = SyncLog(sync_type="manual", status="in_progress")
+        db.add(log)
+        db.commit()
+
+        response = client.get(f"/api/v1/sync/jobs/{log.id}", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "running"
+        assert response.json()["end_time"] is None
+
+    def test_unknown_job(self, client, auth_headers):
+        """Test unknown job ids return 404"""
+        response = client.get("/api/v1/sync/jobs/999999", headers=auth_headers)
+
+        assert response.status_code == 404
+
+    def test_events_stream_until_done(self, client, auth_headers, mock_upstream):
+        """Test the event stream ends with a done event carrying final counts"""
+        job_id = run_job(client, auth_headers)
+
+        with client.stream("GET", f"/api/v1/sync/jobs/{job_id}/events", headers=auth_headers) as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+
+        event, data = body.strip().split("\n")
+        assert event == "event: done"
+        assert json.loads(data[len("data: "):])["new_count"] == 5
+
+    def test_events_stream_ends_for_interrupted_job(self, client, auth_headers, db, monkeypatch):
+        """Test a running job whose process died ends the stream instead of polling for an hour"""
+        monkeypatch.setattr(sync_api, "EVENT_POLL_SECONDS", 0.01)
+        monkeypatch.setattr(sync_api, "EVENT_STALE_JOB_SECONDS", 0.05)
+        log = SyncLog(sync_type="manual", status="in_progress")
+        db.add(log)
+        db.commit()
+
+        with client.stream("GET", f"/api/v1/sync/jobs/{log.id}/events", headers=auth_headers) as response:
+            body = "".join(response.iter_text())
+
+        events = [line for line in body.split("\n") if line.startswith("event: ")]
+        assert events == ["event: progress", "event: done"]
+        done = json.loads(body.strip().split("\n")[-1][len("data: "):])
+        assert done["status"] == "error"
+        assert done["message"] == "同步任务已中断"
+
+    def test_fetch_refused_while_sync_running(self, client, auth_headers):
+        """Test a second sync is refused while one is in progress"""
+        with patch("app.services.sync_service.SyncService.is_sync_in_progress", return_value=True):
+            response = client.post("/api/v1/sync/fetch", headers=auth_headers)
+
+        assert response.status_code == 400
+        assert "同步正在进行中" in response.json()["detail"]
+
+    def test_job_requires_authentication(self, client):
+        """Test job endpoints require authentication"""
+        assert client.post("/api/v1/sync/fetch").status_code == 403
+        assert client.get("/api/v1/sync/jobs/1").status_code == 403
+
+
+class TestSyncProgress:
+    """Unit test for SyncProgress snapshots"""
+
+    def test_rate_and_eta(self, monkeypatch):
+        """Test throughput and ETA are derived from processed objects"""
+        clock = iter([100.0, 110.0])
+        monkeypatch.setattr("app.services.sync_service.time.monotonic", lambda: next(clock))
+        progress = SyncProgress(1)
+        progress.start()
+        progress.page_fetched(100, total=250)
+        progress.objects_processed(40, 40, 0)
+
+        snapshot = progress.snapshot()
+
+        assert snapshot["rate_per_second"] == 4.0
+        assert snapshot["eta_seconds"] == 52.5
+        assert snapshot["rows_upserted"] == 40
+        assert snapshot["total"] == 250
@@ -0,0 +1,185 @@
+"""
+Unit tests for Report Archive Service
+Test orphan deletion, month archival and transparent extraction
+"""
+import os
+import time
+import zipfile
+import pytest
+from datetime import datetime
+
+from app.models.check_object import CheckObject
+from app.services import storage_service
+from app.services.archive_service import ReportArchiveService, IOBudget, WindowClosed
+from app.services.file_service import FileService
+from app.services.storage_service import StorageAccountingService
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    upload_dir = tmp_path / "uploads"
+    monkeypatch.setattr(
+        storage_service, "_storage_accounting",
+        StorageAccountingService(upload_dir=str(upload_dir))
+    )
+    return upload_dir
+
+
+@pytest.fixture
+def file_service(upload_dir):
+    return FileService(upload_dir=str(upload_dir))
+
+
+def write_report(upload_dir, year, month, name, age_days=30):
+    month_dir = upload_dir / "reports" / year / month
+    month_dir.mkdir(parents=True, exist_ok=True)
+    path = month_dir / name
+    path.write_bytes(b"%PDF-1.4 " + name.encode() * 10)
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def add_check_object(db, object_id, url):
+    db.add(CheckObject(
+        check_object_id=object_id,
+        check_object_union_num=f"JC{object_id}",
+        check_result_url=url,
+    ))
+    db.commit()
+
+
+class TestReportArchiveService:
+    """Unit test for report archival"""
+
+    def test_delete_orphans_keeps_referenced_and_recent(self, db, upload_dir, file_service):
+        """Test only old unreferenced files are deleted"""
+        referenced = write_report(upload_dir, "2025", "01", "kept.pdf")
+        orphan = write_report(upload_dir, "2025", "01", "orphan.pdf")
+        recent = write_report(upload_dir, "2025", "01", "recent.pdf", age_days=0)
+        add_check_object(db, 1, "/reports/2025/01/kept.pdf")
+
+        service = ReportArchiveService(db, file_service)
+        deleted = service.delete_orphans(service._referenced_files())
+
+        assert deleted == 1
+        assert referenced.exists()
+        assert recent.exists()
+        assert not orphan.exists()
+
+    def test_archive_month_packs_and_removes_originals(self, db, upload_dir, file_service):
+        """Test a month directory is packed into YYYY-MM.zip"""
+        write_report(upload_dir, "2025", "01", "a.pdf")
+        write_report(upload_dir, "2025", "01", "b.pdf")
+
+        service = ReportArchiveService(db, file_service)
+        archived = service.archive_month("2025", "01")
+
+        archive_path = file_service.archive_path_for_month("2025", "01")
+        assert archived == 2
+        with zipfile.ZipFile(archive_path) as archive:
+            assert sorted(archive.namelist()) == ["a.pdf", "b.pdf"]
+        assert not (upload_dir / "reports" / "2025" / "01").exists()
+
+    def test_run_archives_only_old_months(self, db, upload_dir, file_service, monkeypatch):
+        """Test months newer than REPORT_HOT_MONTHS stay as plain files"""
+        monkeypatch.setattr("app.services.archive_service.settings.REPORT_HOT_MONTHS", 6)
+        write_report(upload_dir, "2025", "01", "old.pdf")
+        write_report(upload_dir, "2025", "10", "new.pdf")
+        add_check_object(db, 1, "/reports/2025/01/old.pdf")
+        add_check_object(db, 2, "/reports/2025/10/new.pdf")
+
+        service = ReportArchiveService(db, file_service, now=datetime(2025, 11, 15))
+        result = service.run(enforce_window=False)
+
+        assert result["status"] == "success"
+        assert result["months_archived"] == 1
+        assert os.path.exists(file_service.archive_path_for_month("2025", "01"))
+        assert (upload_dir / "reports" / "2025" / "10" / "new.pdf").exists()
+
+    def test_archived_report_is_resolved_transparently(self, db, upload_dir, file_service):
+        """Test resolve_report_path extracts archived reports on demand"""
+        original = write_report(upload_dir, "2025", "01", "a.pdf")
+        content = original.read_bytes()
+        ReportArchiveService(db, file_service).archive_month("2025", "01")
+
+        restored = file_service.resolve_report_path("/reports/2025/01/a.pdf")
+
+        assert restored is not None
+        assert restored.startswith(file_service.restore_dir)
+        with open(restored, "rb") as f:
+            assert f.read() == content
+        assert file_service.resolve_report_path("/reports/2025/01/missing.pdf") is None
+
+    def test_extended_month_stays_readable_when_interrupted(self, db, upload_dir, file_service, monkeypatch):
+        """Test reports of an archived month resolve while a late file is being added"""
+        write_report(upload_dir, "2025", "01", "a.pdf")
+        ReportArchiveService(db, file_service).archive_month("2025", "01")
+        write_report(upload_dir, "2025", "01", "b.pdf")
+
+        service = ReportArchiveService(db, file_service)
+        partial_path = file_service.archive_path_for_month("2025", "01") + ".partial"
+
+        def close_once_extending():
+            if os.path.exists(partial_path):
+                raise WindowClosed()
+
+        monkeypatch.setattr(service, "_check_window", close_once_extending)
+        with pytest.raises(WindowClosed):
+            service.archive_month("2025", "01")
+
+        assert file_service.resolve_report_path("/reports/2025/01/a.pdf") is not None
+        assert (upload_dir / "reports" / "2025" / "01" / "b.pdf").exists()
+
+        assert ReportArchiveService(db, file_service).archive_month("2025", "01") == 1
+        with zipfile.ZipFile(file_service.archive_path_for_month("2025", "01")) as archive:
+            assert sorted(archive.namelist()) == ["a.pdf", "b.pdf"]
+        assert not os.path.exists(partial_path)
+
+    def test_expire_archives(self, db, upload_dir, file_service, monkeypatch):
+        """Test archives older than REPORT_RETENTION_MONTHS are removed"""
+        monkeypatch.setattr("app.services.archive_service.settings.REPORT_RETENTION_MONTHS", 12)
+        os.makedirs(file_service.archive_dir)
+        for name in ["2023-01.zip", "2025-06.zip"]:
+            with zipfile.ZipFile(os.path.join(file_service.archive_dir, name), "w"):
+                pass
+
+        service = ReportArchiveService(db, file_service, now=datetime(2025, 11, 15))
+
+        assert service.expire_archives() == 1
+        assert os.listdir(file_service.archive_dir) == ["2025-06.zip"]
+
+    def test_expire_sync_archives(self, db, upload_dir, file_service, sync_archive, monkeypatch):
+        """Test payload archive days older than SYNC_ARCHIVE_RETENTION_DAYS are removed and accounted"""
+        monkeypatch.setattr("app.services.archive_service.settings.SYNC_ARCHIVE_RETENTION_DAYS", 30)
+        os.makedirs(sync_archive.directory)
+        for day in ["2025-10-01", "2025-10-16", "2025-11-14"]:
+            with open(sync_archive.path_for(datetime.strptime(day, "%Y-%m-%d").date()), "wb") as f:
+                f.write(b"x" * 10)
+
+        service = ReportArchiveService(db, file_service, now=datetime(2025, 11, 15))
+
+        assert service.expire_sync_archives() == 1
+        assert sorted(os.listdir(sync_archive.directory)) == ["pages-2025-10-16.gz", "pages-2025-11-14.gz"]
+        usage = storage_service.get_storage_accounting().get_usage()
+        assert (usage["sync_archive_bytes"], usage["sync_archive_files"]) == (20, 2)
+
+    def test_run_outside_window_is_partial(self, db, upload_dir, file_service, monkeypatch):
+        """Test run stops immediately outside the archival window"""
+        hour = datetime.now().hour
+        monkeypatch.setattr("app.services.archive_service.settings.ARCHIVE_WINDOW_START_HOUR", (hour + 1) % 24)
+        monkeypatch.setattr("app.services.archive_service.settings.ARCHIVE_WINDOW_END_HOUR", (hour + 2) % 24)
+        write_report(upload_dir, "2020", "01", "a.pdf")
+
+        result = ReportArchiveService(db, file_service).run()
+
+        assert result["status"] == "partial"
+        assert (upload_dir / "reports" / "2020" / "01" / "a.pdf").exists()
+
+    def test_io_budget_throttles(self):
+        """Test IOBudget sleeps when consumption exceeds the budget"""
+        budget = IOBudget(bytes_per_sec=1000)
+        started = time.monotonic()
+        budget.consume(100)
+
+        assert time.monotonic() - started >= 0.09
@@ -0,0 +1,111 @@
+"""
+Unit tests for historical backfill
+Test windowed backfill, checkpointing and resuming after a failure
+"""
+import json
+from datetime import datetime, timedelta
+
+from app.cli.backfill import parse_time
+from app.config import settings
+from app.models.check_object import CheckObject
+from app.models.sync_log import SyncLog
+from app.services.client_api_service import ClientAPIService
+from app.services.mock_client_api import MockClientAPIService
+from app.services.sync_pipeline import WindowCheckpoint
+from app.services.sync_service import SyncService
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 2, 28, 23, 59, 59)
+
+
+class MockClient(ClientAPIService):
+    """Client API backed by a seeded mock dataset, failing after fail_after requests"""
+
+    def __init__(self, fail_after=None):
+        super().__init__()
+        self.use_mock = True
+        self.mock = MockClientAPIService(total=150, seed=3, base_date=START)
+        self.fail_after = fail_after
+        self.windows = []
+
+    def fetch_check_objects(self, page=1, page_size=50, status=None, start_time=None, end_time=None):
+        self.windows.append((start_time, end_time))
+        if self.fail_after is not None and len(self.windows) > self.fail_after:
+            raise Exception("客户端API请求失败: timeout")
+        return self.mock.get_mock_check_objects(page, page_size, start_time, end_time)
+
+
+def backfill(db, client, checkpoint):
+    service = SyncService(db)
+    service.client_api_service = client
+    return service.backfill(
+        START, END, window=timedelta(days=7), fetch_workers=1, page_size=20, checkpoint=checkpoint
+    )
+
+
+class TestBackfill:
+    """Unit test for SyncService.backfill"""
+
+    def test_backfill_checkpoints_every_window(self, db, tmp_path):
+        """Test a backfill ingests the whole range and records every window"""
+        checkpoint = WindowCheckpoint(str(tmp_path / "backfill.json"))
+
+        result = backfill(db, MockClient(), checkpoint)
+
+        assert result["status"] == "success"
+        assert result["new_count"] == 150
+        assert result["windows"] == 9
+        assert db.query(CheckObject).count() == 150
+        with open(tmp_path / "backfill.json") as f:
+            assert len(json.load(f)["done"]) == 9
+        assert db.query(SyncLog).filter(SyncLog.sync_type == "backfill").one().status == "success"
+
+    def test_resume_skips_finished_windows(self, db, tmp_path):
+        """Test an interrupted backfill resumes with only the unfinished windows"""
+        path = str(tmp_path / "backfill.json")
+
+        failed = backfill(db, MockClient(fail_after=12), WindowCheckpoint(path))
+        with open(path) as f:
+            done = [tuple(datetime.fromisoformat(t) for t in window) for window in json.load(f)["done"]]
+        client = MockClient()
+        resumed = backfill(db, client, WindowCheckpoint(path))
+
+        assert failed["status"] == "error"
+        assert 0 < len(done) < 9
+        assert resumed["status"] == "success"
+        assert resumed["skipped_windows"] == len(done)
+        assert db.query(CheckObject).count() == 150
+        # No request of the resumed run falls inside a finished window
+        assert not any(
+            done_start <= start <= done_end
+            for start, _ in client.windows
+            for done_start, done_end in done
+        )
+
+    def test_finished_windows_are_committed(self, db, tmp_path, monkeypatch):
+        """Test a window is only checkpointed after all of its objects are committed"""
+        monkeypatch.setattr(settings, "SYNC_WRITE_BATCH_SIZE", 10)
+        path = str(tmp_path / "backfill.json")
+        backfill(db, MockClient(fail_after=12), WindowCheckpoint(path))
+        db.rollback()
+
+        with open(path) as f:
+            done = [tuple(datetime.fromisoformat(t) for t in window) for window in json.load(f)["done"]]
+        expected = [
+            MockClient().mock.get_mock_check_objects(1, 1, start, end)["data"]["total"] for start, end in done
+        ]
+        stored = [
+            db.query(CheckObject).filter(
+                CheckObject.check_start_time >= start, CheckObject.check_start_time <= end
+            ).count()
+            for start, end in done
+        ]
+
+        assert sum(expected) > 0
+        assert stored == expected
+
+    def test_parse_time(self):
+        """Test bare end dates cover the whole day"""
+        assert parse_time("2024-03-01") == datetime(2024, 3, 1)
+        assert parse_time("2024-03-01", end_of_day=True) == datetime(2024, 3, 1, 23, 59, 59)
+        assert parse_time("2024-03-01 08:30:00") == datetime(2024, 3, 1, 8, 30)
@@ -0,0 +1,75 @@
+"""
+Unit tests for database engine configuration
+Test engine options from settings and pool metrics
+"""
+import logging
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app import database
+from app.database import engine_options
+from app.utils import sql_instrumentation
+from app.utils.sql_instrumentation import (
+    POOL_CHECKED_OUT,
+    POOL_CHECKOUTS,
+    POOL_WAIT,
+    instrument_pool,
+    record_pool_wait,
+)
+
+
+class TestEngineOptions:
+    """Unit test for engine_options"""
+
+    def test_postgres_options_from_settings(self, monkeypatch):
+        """Test pool and driver options follow settings"""
+        monkeypatch.setattr(database.settings, "DB_POOL_SIZE", 3)
+        monkeypatch.setattr(database.settings, "DB_MAX_OVERFLOW", 1)
+        monkeypatch.setattr(database.settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+        monkeypatch.setattr(database.settings, "DB_SERVER_SIDE_CURSORS", True)
+
+        options = engine_options("postgresql+psycopg2://user:pass@db/app")
+
+        assert options["pool_size"] == 3
+        assert options["max_overflow"] == 1
+        assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+        assert options["executemany_mode"] == database.settings.DB_EXECUTEMANY_MODE
+        assert options["execution_options"] == {"stream_results": True}
+
+    def test_sqlite_skips_pool_sizing(self):
+        """Test SQLite gets no QueuePool sizing arguments"""
+        options = engine_options("sqlite:///:memory:")
+
+        assert "pool_size" not in options
+        assert options["connect_args"] == {"check_same_thread": False}
+
+
+class TestPoolMetrics:
+    """Unit test for pool instrumentation"""
+
+    def test_checkout_updates_gauges(self, tmp_path):
+        """Test checkouts are counted and the checked-out gauge follows the pool"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=2)
+        instrument_pool(engine)
+        before = POOL_CHECKOUTS.get()
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert POOL_CHECKED_OUT.get() == 1
+
+        assert POOL_CHECKOUTS.get() == before + 1
+        assert POOL_CHECKED_OUT.get() == 0
+        engine.dispose()
+
+    def test_slow_pool_wait_is_logged(self, monkeypatch, caplog):
+        """Test waits above DB_POOL_WAIT_WARN_MS are observed and logged"""
+        monkeypatch.setattr(sql_instrumentation.settings, "DB_POOL_WAIT_WARN_MS", 50)
+        count = POOL_WAIT.get_count()
+
+        with caplog.at_level(logging.WARNING, logger=sql_instrumentation.__name__):
+            record_pool_wait(database.engine, 0.01)
+            record_pool_wait(database.engine, 0.2)
+
+        assert POOL_WAIT.get_count() == count + 2
+        assert caplog.text.count("waited") == 1
@@ -0,0 +1,90 @@
+"""
+Unit tests for compiled field mapping
+Test alias extraction and the format-sniffing datetime parser
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.client_api_service import ClientAPIService
+from app.utils.field_mapping import compile_mapping, parse_datetime
+
+
+class TestParseDatetime:
+    """Unit test for parse_datetime"""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("2025-01-05 10:20:30", datetime(2025, 1, 5, 10, 20, 30)),
+        ("2025/01/05 10:20:30", datetime(2025, 1, 5, 10, 20, 30)),
+        ("2025-01-05T10:20:30", datetime(2025, 1, 5, 10, 20, 30)),
+        ("2025-01-05", datetime(2025, 1, 5)),
+        ("2025-1-5 3:04:05", datetime(2025, 1, 5, 3, 4, 5)),
+        ("2025-01-05 10:20:30.250", datetime(2025, 1, 5, 10, 20, 30, 250000)),
+        ("2025-01-05T10:20:30Z", datetime(2025, 1, 5, 10, 20, 30, tzinfo=timezone.utc)),
+    ])
+    def test_supported_formats(self, value, expected):
+        """Test fast-path and fallback formats parse to the same values as strptime"""
+        assert parse_datetime(value) == expected
+
+    @pytest.mark.parametrize("value", [
+        None, "", "bad", 20250105, "2025-02-30 00:00:00", "2025-01-+5", "2025-01-05 10-20-30", "2025/01-05 10:20:30",
+    ])
+    def test_invalid_values(self, value):
+        """Test empty, malformed and impossible values return None"""
+        assert parse_datetime(value) is None
+
+    def test_datetime_passthrough(self):
+        """Test datetime objects are returned unchanged"""
+        value = datetime(2025, 1, 5, 10, 20, 30)
+
+        assert parse_datetime(value) is value
+
+
+class TestCompileMapping:
+    """Unit test for compile_mapping"""
+
+    def test_aliases_defaults_and_converters(self):
+        """Test aliases behave like chained `or`, defaults like get(key, default)"""
+        extract = compile_mapping((
+            ("id", ("check_object_id", "id")),
+            ("status", ("status",), {"default": 0}),
+            ("name", ("name",), {"convert": str.upper}),
+            ("item", ("item_id",), {"source": "nested"}),
+        ), sources=("data", "nested"))
+
+        assert extract({"id": 7, "name": "a"}, {"item_id": 3}) == {"id": 7, "status": 0, "name": "A", "item": 3}
+        assert extract({"check_object_id": 0, "status": None, "name": "b"}, {})["id"] is None
+        assert extract({"status": None, "name": "b"}, {})["status"] is None
+
+    def test_invalid_tables(self):
+        """Test tables with unknown sources or ambiguous defaults are rejected"""
+        with pytest.raises(ValueError):
+            compile_mapping((("x", ("a",), {"source": "missing"}),))
+        with pytest.raises(ValueError):
+            compile_mapping((("x", ("a", "b"), {"default": 1}),))
+
+    def test_parse_check_object_upstream_format(self):
+        """Test the compiled extractors read the client API's nested objectItems format"""
+        parsed = ClientAPIService().parse_check_object({
+            "id": 9,
+            "check_no": "JC9",
+            "sample_name": "白菜",
+            "check_start_time": "2025-01-05 10:20:30",
+            "objectItems": [{"id": 900, "checkItem": {"item_id": 1, "name": "铅", "reference_values": "mg/kg"}}],
+        })
+
+        assert parsed["check_object_id"] == 9
+        assert parsed["check_object_union_num"] == "JC9"
+        assert parsed["submission_goods_name"] == "白菜"
+        assert parsed["status"] == 0
+        assert parsed["check_start_time"] == datetime(2025, 1, 5, 10, 20, 30)
+        assert parsed["check_items"] == [{
+            "check_object_item_id": 900,
+            "check_item_id": 1,
+            "check_item_name": "铅",
+            "unit": "mg/kg",
+            "detection_limit": None,
+            "check_method": None,
+            "reference_value": "mg/kg",
+            "item_indicator": None,
+        }]
@@ -0,0 +1,179 @@
+"""
+Unit tests for incremental JSON parsing
+Test iter_json_items over arbitrary chunking and ClientAPIService.stream_check_objects
+"""
+import json
+import random
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.mock_upstream import MockUpstream, create_mock_upstream_app
+from app.services import client_api_service
+from app.services.client_api_service import ClientAPIService
+from app.services.mock_client_api import MockClientAPIService
+from app.utils.json_stream import iter_json_items
+
+DOCUMENT = {
+    "status": 200,
+    "message": "成功",
+    "data": {
+        "count": 3,
+        "list": [
+            {"id": 1, "name": "白菜", "values": [1, 2.5e3, None, True, False]},
+            {"id": 22222, "note": "含 } ] \" 字符"},
+            {"nested": {"list": [{"deep": -1}]}},
+        ],
+        "page": 1,
+    },
+}
+
+
+def chunked(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestIterJsonItems:
+    """Unit test for iter_json_items"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+    def test_items_and_envelope_across_chunk_boundaries(self, size):
+        """Test any chunking yields the same records and envelope as json.loads"""
+        body = json.dumps(DOCUMENT, ensure_ascii=False, indent=1).encode("utf-8")
+        envelope = {}
+
+        items = list(iter_json_items(chunked(body, size), ("data", "list"), envelope))
+
+        assert items == DOCUMENT["data"]["list"]
+        assert envelope == {"status": 200, "message": "成功", "data": {"count": 3, "page": 1}}
+
+    @pytest.mark.parametrize("chunks", [
+        ['{"data":{"list":[1.', '5]}}'],
+        ['{"data":{"list":[1e', '3]}}'],
+        ['{"data":{"list":[2E', '-', '2]}}'],
+        ['{"data":{"list":[-', '0.5]}}'],
+        ['{"total":1', '.25,"data":{"list":[]}}'],
+    ])
+    def test_number_cut_after_decimal_point_or_exponent(self, chunks):
+        """Test numbers split right after "." or an exponent marker decode whole"""
+        body = "".join(chunks)
+        envelope = {}
+
+        items = list(iter_json_items(chunks, ("data", "list"), envelope))
+
+        expected = json.loads(body)
+        assert items == expected["data"].pop("list")
+        assert envelope == expected
+
+    def test_random_chunk_boundaries(self):
+        """Test random splits of documents full of floats match json.loads"""
+        rng = random.Random(43)
+        numbers = [0, -7, 1.5, -0.25, 3e10, 2.5e-7, 1234.5678, -1e-3]
+        for _ in range(2000):
+            document = {
+                "status": rng.choice(numbers),
+                "data": {
+                    "total": rng.choice(numbers),
+                    "list": [
+                        {"id": rng.choice(numbers), "values": rng.sample(numbers, 3)}
+                        if rng.random() < 0.5 else rng.choice(numbers)
+                        for _ in range(rng.randint(0, 4))
+                    ],
+                },
+            }
+            body = json.dumps(document, separators=(",", ":")).encode("utf-8")
+            cuts = sorted(rng.sample(range(1, len(body)), min(len(body) - 1, rng.randint(1, 12))))
+            chunks = [body[i:j] for i, j in zip([0] + cuts, cuts + [len(body)])]
+            envelope = {}
+
+            items = list(iter_json_items(chunks, ("data", "list"), envelope))
+
+            assert items == document["data"].pop("list")
+            assert envelope == document
+
+    def test_records_are_yielded_before_the_body_ends(self):
+        """Test the first record is available after reading only its chunks"""
+        body = json.dumps(DOCUMENT).encode("utf-8")
+        consumed = []
+
+        def chunks():
+            for chunk in chunked(body, 16):
+                consumed.append(chunk)
+                yield chunk
+
+        first = next(iter_json_items(chunks(), ("data", "list")))
+
+        assert first == DOCUMENT["data"]["list"][0]
+        assert sum(len(chunk) for chunk in consumed) < len(body)
+
+    def test_non_array_value_goes_to_envelope(self):
+        """Test a value at the path that is not an array is kept in the envelope"""
+        envelope = {}
+
+        items = list(iter_json_items(['{"data": [1, 2], "status": 200}'], ("data", "list"), envelope))
+
+        assert items == []
+        assert envelope == {"data": [1, 2], "status": 200}
+
+    @pytest.mark.parametrize("body", [
+        '{"data": {"list": [1, 2',
+        '{"data": {"list": [1 2]}}',
+        '[1, 2]',
+        '{"data": {}} trailing',
+        '',
+    ])
+    def test_malformed_documents(self, body):
+        """Test truncated or malformed bodies raise JSONDecodeError"""
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_items([body], ("data", "list")))
+
+
+class TestStreamCheckObjects:
+    """Unit test for ClientAPIService.stream_check_objects"""
+
+    @pytest.fixture
+    def upstream(self, monkeypatch):
+        mock = MockClientAPIService(total=30, seed=5, base_date=datetime(2025, 1, 1))
+        upstream = MockUpstream(mock)
+        mock_app = create_mock_upstream_app(upstream)
+        monkeypatch.setattr(client_api_service.settings, "USE_MOCK_CLIENT_API", False)
+        monkeypatch.setattr(
+            client_api_service.httpx, "Client",
+            lambda timeout=None: TestClient(mock_app, base_url=client_api_service.settings.API_BASE_URL)
+        )
+        return upstream
+
+    def test_matches_buffered_fetch(self, upstream):
+        """Test streamed records, code and total match fetch_check_objects"""
+        service = ClientAPIService()
+        window = {"page_size": 20, "start_time": datetime(2025, 1, 1), "end_time": datetime(2025, 3, 1)}
+
+        with service.stream_check_objects(**window) as page:
+            records = list(page)
+        buffered = service.fetch_check_objects(**window)
+
+        assert records == buffered["data"]["list"]
+        assert (page.code, page.total, page.count) == (0, 30, 20)
+
+    def test_pages_are_archived_unless_disabled(self, upstream, sync_archive):
+        """Test streamed pages go to the payload archive only when record is set"""
+        service = ClientAPIService()
+
+        with service.stream_check_objects(page_size=10, record=False) as page:
+            list(page)
+        assert list(sync_archive.iter_pages()) == []
+
+        with service.stream_check_objects(page_size=10) as page:
+            list(page)
+        assert len(list(sync_archive.iter_pages())) == 1
+
+    def test_error_status(self, upstream):
+        """Test an API error status is reported after iteration like fetch_check_objects"""
+        upstream.secret = "wrong-secret"
+
+        with ClientAPIService().stream_check_objects(page_size=10) as page:
+            records = list(page)
+
+        assert records == []
+        assert page.code == 401
@@ -0,0 +1,143 @@
+"""
+Unit tests for automatic result judgement
+Test limit parsing, item and sample judgement, and the array path matching the loop
+"""
+import math
+import random
+
+import pytest
+
+from app.services import judgement_service
+from app.services.judgement_service import (
+    FAIL, NEGATIVE, NUMERIC, PASS, POSITIVE, Rule,
+    describe_rule, judge_items, parse_measurement, parse_rule, sample_result
+)
+
+
+class TestParseRule:
+    """Unit test for parse_rule"""
+
+    @pytest.mark.parametrize("expression, rule", [
+        ("≤0.2mg/kg", Rule(NUMERIC, -math.inf, 0.2, True, True)),
+        ("<5", Rule(NUMERIC, -math.inf, 5.0, True, False)),
+        ("＜ 5 μg/kg", Rule(NUMERIC, -math.inf, 5.0, True, False)),
+        ("<=30", Rule(NUMERIC, -math.inf, 30.0, True, True)),
+        ("不大于 0.05", Rule(NUMERIC, -math.inf, 0.05, True, True)),
+        ("≥10g/100g", Rule(NUMERIC, 10.0, math.inf, True, True)),
+        ("大于1", Rule(NUMERIC, 1.0, math.inf, False, True)),
+        ("1.0-2.5", Rule(NUMERIC, 1.0, 2.5, True, True)),
+        ("6.5～8.5", Rule(NUMERIC, 6.5, 8.5, True, True)),
+        ("阴性", Rule(NEGATIVE, -math.inf, 0.0, True, True)),
+        ("阳性", Rule(POSITIVE, 0.0, math.inf, False, True)),
+    ])
+    def test_expressions(self, expression, rule):
+        """Test bounds, ranges and qualitative limits compile to intervals"""
+        assert parse_rule(expression) == rule
+
+    def test_detection_limit_bounds_not_detected(self):
+        """Test 不得检出 passes below the detection limit when one is known"""
+        assert parse_rule("不得检出", "0.5μg/kg") == Rule(NEGATIVE, -math.inf, 0.5, True, False)
+        assert parse_rule("不得检出", None) == Rule(NEGATIVE, -math.inf, 0.0, True, True)
+
+    @pytest.mark.parametrize("expression, detection_limit, rule", [
+        ("≤检出限", "0.01", Rule(NEGATIVE, -math.inf, 0.01, True, True)),
+        ("<检出限", "0.01", Rule(NEGATIVE, -math.inf, 0.01, True, False)),
+        ("低于检出限", "0.01", Rule(NEGATIVE, -math.inf, 0.01, True, False)),
+        ("检出限以下", "0.01", Rule(NEGATIVE, -math.inf, 0.01, True, False)),
+        ("≤检出限", None, Rule(NEGATIVE, -math.inf, 0.0, True, True)),
+    ])
+    def test_below_detection_limit(self, expression, detection_limit, rule):
+        """Test "≤/</低于检出限" limits are bounded by the detection limit, not read as 检出"""
+        assert parse_rule(expression, detection_limit) == rule
+
+    @pytest.mark.parametrize("expression", [None, "", "见标准", "5-1"])
+    def test_unknown_expressions(self, expression):
+        """Test expressions that are not understood compile to no rule"""
+        assert parse_rule(expression) is None
+
+    def test_describe_rule(self):
+        """Test compiled rules have a readable form"""
+        assert describe_rule(parse_rule("≤0.2mg/kg")) == "≤0.2"
+        assert describe_rule(parse_rule("1-2.5")) == "[1, 2.5]"
+        assert describe_rule(None) is None
+
+
+class TestJudgeItems:
+    """Unit test for judge_items"""
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    @pytest.mark.parametrize("item, result", [
+        (("0.15", None, "≤0.2mg/kg", None), PASS),
+        (("0.2", None, "≤0.2mg/kg", None), PASS),
+        (("0.25mg/kg", None, "≤0.2mg/kg", None), FAIL),
+        (("5", "<5", "≤10", None), FAIL),  # item_indicator takes precedence
+        (("5", "见标准", "≤10", None), PASS),  # falls back to reference_value
+        (("未检出", None, "≤0.2", None), PASS),
+        (("<0.01", None, "≥1", None), FAIL),
+        (("检出", None, "≤0.2", None), None),  # detected, amount unknown
+        (("ND", None, "不得检出", "0.5"), PASS),
+        (("0.3", None, "不得检出", "0.5"), PASS),
+        (("0.6", None, "不得检出", "0.5"), FAIL),
+        (("0", None, "不得检出", None), PASS),
+        (("低于检出限", None, "不得检出", "0.01"), PASS),
+        (("<检出限", None, "不得检出", "0.01"), PASS),
+        (("检出限以下", None, "≤0.2", None), PASS),
+        (("0.5", None, "≤检出限", None), FAIL),
+        (("0.005", None, "≤检出限", "0.01"), PASS),
+        (("0.01", None, "≤检出限", "0.01"), PASS),
+        (("0.01", None, "<检出限", "0.01"), FAIL),
+        (("0.02", None, "低于检出限", "0.01"), FAIL),
+        (("阳性", None, "阴性", None), FAIL),
+        (("阳性", None, "阳性", None), PASS),
+        (("阴性", None, "阳性", None), FAIL),
+        (("7.0", None, "6.5~8.5", None), PASS),
+        (("9", None, "6.5~8.5", None), FAIL),
+        ((None, None, "≤0.2", None), None),
+        (("0.1", None, None, None), None),
+    ])
+    def test_item_results(self, item, result, vectorized):
+        """Test item results from measured values and limits"""
+        if vectorized and judgement_service.numpy is None:
+            pytest.skip("NumPy is not installed")
+        assert judge_items([item], vectorized=vectorized)[0].result == result
+
+    def test_arrays_match_loop(self):
+        """Test the NumPy path judges a large mixed batch exactly like the loop"""
+        if judgement_service.numpy is None:
+            pytest.skip("NumPy is not installed")
+        rng = random.Random(7)
+        nums = ["0", "0.1", "0.2", "0.5", "1", "2.5", "30", "未检出", "ND", "<0.01", "检出", "阳性", "阴性", "", "x"]
+        limits = ["≤0.2mg/kg", "<0.5", "≥1", "1-2.5", "不得检出", "阴性", "阳性", "≤30mg/kg", "见标准", None]
+        items = [
+            (rng.choice(nums), rng.choice([None, rng.choice(limits)]), rng.choice(limits), rng.choice([None, "0.5"]))
+            for _ in range(2000)
+        ]
+
+        assert judge_items(items, vectorized=True) == judge_items(items, vectorized=False)
+
+    def test_empty_batch(self):
+        """Test an empty batch judges nothing"""
+        assert judge_items([]) == []
+
+
+class TestSampleResult:
+    """Unit test for sample_result"""
+
+    def test_sample_result(self):
+        """Test any failed item fails the sample and all passed items pass it"""
+        assert sample_result([PASS, PASS]) == PASS
+        assert sample_result([PASS, FAIL, None]) == FAIL
+        assert sample_result([PASS, None]) is None
+        assert sample_result([]) is None
+
+
+class TestParseMeasurement:
+    """Unit test for parse_measurement"""
+
+    def test_measurements(self):
+        """Test numbers, not detected and detected values"""
+        assert parse_measurement("0.05mg/kg") == (0.05, False)
+        assert parse_measurement("未检出") == (-math.inf, True)
+        assert parse_measurement("＜0.01") == (-math.inf, True)
+        assert parse_measurement("阳性") == (math.inf, True)
+        assert math.isnan(parse_measurement("/").value)
@@ -0,0 +1,163 @@
+"""
+Unit tests for distributed lease locks
+Test acquisition, stale-lock recovery, renewal, sync exclusion and leader-only jobs
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.distributed_lock import DistributedLock
+from app.services import lock_service
+from app.services.lock_service import LeaseLock, LockNotAcquired, lease_is_held
+from app.services.sync_service import SyncService
+from app.tasks import scheduler
+
+
+@pytest.fixture
+def session_factory(db):
+    return sessionmaker(bind=db.get_bind())
+
+
+class TestLeaseLock:
+    """Unit test for LeaseLock"""
+
+    def test_acquire_is_exclusive(self, session_factory):
+        """Test a held lease cannot be taken by another owner"""
+        first = LeaseLock("job", session_factory, heartbeat=False)
+        second = LeaseLock("job", session_factory, heartbeat=False)
+
+        assert first.acquire() is True
+        assert second.acquire() is False
+
+        first.release()
+        assert second.acquire() is True
+
+    def test_stale_lease_is_recovered(self, db, session_factory):
+        """Test an expired lease from a crashed owner is taken over"""
+        db.add(DistributedLock(
+            name="job",
+            owner="crashed-node:1:deadbeef",
+            acquired_at=datetime.utcnow() - timedelta(minutes=10),
+            expires_at=datetime.utcnow() - timedelta(minutes=5)
+        ))
+        db.commit()
+
+        lock = LeaseLock("job", session_factory, heartbeat=False)
+
+        assert lock.acquire() is True
+        db.expire_all()
+        assert db.get(DistributedLock, "job").owner == lock.owner
+
+    def test_expiry_follows_database_clock(self, db, session_factory, monkeypatch):
+        """Test a node whose clock runs ahead cannot take over an unexpired lease"""
+        holder = LeaseLock("job", session_factory, ttl_seconds=30, heartbeat=False)
+        assert holder.acquire() is True
+
+        class FastClock(datetime):
+            @classmethod
+            def utcnow(cls):
+                return datetime.utcnow() + timedelta(hours=1)
+
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + timedelta(hours=1)
+
+        monkeypatch.setattr(lock_service, "datetime", FastClock)
+
+        assert LeaseLock("job", session_factory, heartbeat=False).acquire() is False
+        assert lease_is_held("job", db) is True
+
+    def test_renew_extends_and_detects_loss(self, db, session_factory):
+        """Test renew extends expiry and fails once another owner took over"""
+        lock = LeaseLock("job", session_factory, ttl_seconds=30, heartbeat=False)
+        lock.acquire()
+
+        assert lock.renew() is True
+
+        db.get(DistributedLock, "job").owner = "other"
+        db.commit()
+        assert lock.renew() is False
+
+    def test_release_keeps_foreign_lease(self, db, session_factory):
+        """Test release never deletes a lease owned by someone else"""
+        lock = LeaseLock("job", session_factory, heartbeat=False)
+        lock.acquire()
+        db.get(DistributedLock, "job").owner = "other"
+        db.commit()
+
+        lock.release()
+
+        db.expire_all()
+        assert db.get(DistributedLock, "job") is not None
+
+    def test_hold_context_manager(self, session_factory):
+        """Test hold raises when the lease is taken and releases on exit"""
+        with LeaseLock("job", session_factory, heartbeat=False).hold():
+            with pytest.raises(LockNotAcquired):
+                with LeaseLock("job", session_factory, heartbeat=False).hold():
+                    pass
+
+        assert LeaseLock("job", session_factory, heartbeat=False).acquire() is True
+
+
+class TestDistributedSync:
+    """Unit test for sync exclusion across processes"""
+
+    def test_sync_refused_while_other_node_syncs(self, db, session_factory):
+        """Test sync_data refuses to start while another owner holds the sync lease"""
+        other = LeaseLock("sync", session_factory, heartbeat=False)
+        other.acquire()
+
+        with pytest.raises(Exception, match="同步正在进行中"):
+            SyncService(db).sync_data()
+
+        # The in-process lock was released again
+        assert SyncService._sync_lock.acquire(blocking=False)
+        SyncService._sync_lock.release()
+
+
+class TestLeaderElection:
+    """Unit test for scheduler leader election"""
+
+    @pytest.fixture(autouse=True)
+    def local_sessions(self, session_factory, monkeypatch):
+        monkeypatch.setattr(scheduler, "SessionLocal", session_factory)
+        monkeypatch.setattr(scheduler, "_leader_lock", None)
+        monkeypatch.setattr(scheduler, "_is_leader", False)
+
+    def test_only_leader_runs_jobs(self, session_factory):
+        """Test jobs run on the lease holder and are skipped elsewhere"""
+        calls = []
+        job = scheduler.leader_job(lambda: calls.append(1) or {"status": "success"}, "test_job")
+
+        assert job()["status"] == "skipped"
+
+        assert scheduler.leader_election_task() is True
+        assert job()["status"] == "success"
+        assert calls == [1]
+
+    def test_follower_takes_over_expired_leadership(self, db, session_factory):
+        """Test another node becomes leader once the leader's lease expires"""
+        db.add(DistributedLock(
+            name="scheduler-leader",
+            owner="other-node:1:cafebabe",
+            acquired_at=datetime.utcnow(),
+            expires_at=datetime.utcnow() + timedelta(minutes=1)
+        ))
+        db.commit()
+
+        assert scheduler.leader_election_task() is False
+
+        db.get(DistributedLock, "scheduler-leader").expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+        assert scheduler.leader_election_task() is True
+
+    def test_job_skipped_while_previous_run_holds_lease(self, session_factory):
+        """Test a job still running elsewhere is not started again"""
+        scheduler.leader_election_task()
+        LeaseLock("job:test_job", session_factory, heartbeat=False).acquire()
+
+        job = scheduler.leader_job(lambda: {"status": "success"}, "test_job")
+
+        assert job()["message"] == "already running"
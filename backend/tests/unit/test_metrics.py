@@ -0,0 +1,133 @@
+"""
+Unit tests for metrics registry and request instrumentation
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.utils.metrics import MetricsRegistry
+from app.middleware.performance import REQUEST_COUNT, REQUEST_LATENCY, RESPONSE_SIZE
+
+
+class TestMetricsRegistry:
+    """Unit test for Prometheus text rendering"""
+
+    @pytest.fixture
+    def registry(self):
+        return MetricsRegistry()
+
+    def test_counter_render(self, registry):
+        """Test counter renders HELP/TYPE and labelled samples"""
+        counter = registry.counter("jobs_total", "Jobs run", ["job"])
+        counter.inc("sync")
+        counter.inc("sync", amount=2)
+
+        text = registry.render()
+
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{job="sync"} 3' in text
+
+    def test_gauge_inc_dec_set(self, registry):
+        """Test gauge moves both ways"""
+        gauge = registry.gauge("in_flight", "In flight")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        assert gauge.get() == 1
+
+        gauge.set(value=7)
+        assert "in_flight 7" in registry.render()
+
+    def test_histogram_cumulative_buckets(self, registry):
+        """Test histogram buckets are cumulative with +Inf, sum and count"""
+        histogram = registry.histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+        histogram.observe("/a", value=0.05)
+        histogram.observe("/a", value=0.5)
+        histogram.observe("/a", value=5)
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+        assert 'latency_seconds_count{route="/a"} 3' in text
+        assert histogram.get_sum("/a") == pytest.approx(5.55)
+
+    def test_label_values_are_escaped(self, registry):
+        """Test quotes in label values are escaped"""
+        counter = registry.counter("odd_total", "Odd", ["name"])
+        counter.inc('a"b')
+
+        assert 'odd_total{name="a\\"b"} 1' in registry.render()
+
+    def test_register_is_idempotent(self, registry):
+        """Test registering the same name returns the same metric"""
+        assert registry.counter("x_total", "X") is registry.counter("x_total", "X")
+        with pytest.raises(ValueError):
+            registry.gauge("x_total", "X")
+
+    def test_wrong_label_count_rejected(self, registry):
+        """Test label arity is validated"""
+        counter = registry.counter("y_total", "Y", ["a", "b"])
+        with pytest.raises(ValueError):
+            counter.inc("only-one")
+
+
+class TestRequestMetrics:
+    """Unit test for PerformanceMiddleware metrics"""
+
+    def test_route_template_label(self, client: TestClient, auth_headers: dict):
+        """Test requests are labelled by route template, not concrete path"""
+        route = "/api/v1/check-objects/{check_object_id}"
+        before = REQUEST_COUNT.get("GET", route, 404)
+
+        client.get("/api/v1/check-objects/987654", headers=auth_headers)
+
+        assert REQUEST_COUNT.get("GET", route, 404) == before + 1
+        assert REQUEST_LATENCY.get_count("GET", route) >= 1
+
+    def test_unmatched_paths_share_label(self, client: TestClient):
+        """Test unknown paths do not create one label per path"""
+        before = REQUEST_COUNT.get("GET", "<unmatched>", 404)
+
+        client.get("/no/such/path/1")
+        client.get("/no/such/path/2")
+
+        assert REQUEST_COUNT.get("GET", "<unmatched>", 404) == before + 2
+
+    def test_metrics_endpoint(self, client: TestClient, monkeypatch):
+        """Test /metrics exposes Prometheus text format"""
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+        client.get("/health")
+
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert "http_requests_in_progress" in response.text
+
+    def test_metrics_endpoint_requires_token(self, client: TestClient, monkeypatch):
+        """Test /metrics is refused without the configured bearer token"""
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+        assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 401
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Basic scrape-token"}).status_code == 401
+
+    def test_process_time_header(self, client: TestClient):
+        """Test X-Process-Time header is still set"""
+        response = client.get("/health")
+
+        assert float(response.headers["X-Process-Time"]) >= 0
+
+    def test_response_size_counts_body_bytes(self, client: TestClient):
+        """Test response size is measured from the bytes actually sent"""
+        before = RESPONSE_SIZE.get_sum("GET", "/health")
+
+        response = client.get("/health")
+
+        assert RESPONSE_SIZE.get_sum("GET", "/health") == before + len(response.content)
@@ -0,0 +1,67 @@
+"""
+Unit tests for Mock Client API Service
+Test seeded dataset generation, pagination and time windows
+"""
+from datetime import datetime, timedelta
+
+from app.services.client_api_service import ClientAPIService
+from app.services.mock_client_api import MockClientAPIService
+
+
+class TestMockClientAPIService:
+    """Unit test for MockClientAPIService"""
+
+    def test_default_dataset(self):
+        """Test default dataset keeps 25 objects with 3 items each"""
+        response = MockClientAPIService().get_mock_check_objects(page=1, page_size=50)
+
+        assert response["code"] == 0
+        assert response["data"]["total"] == 25
+        assert len(response["data"]["list"]) == 25
+        assert all(len(obj["check_items"]) == 3 for obj in response["data"]["list"])
+
+    def test_seeded_generation_is_deterministic(self):
+        """Test the same seed and index always produce the same object"""
+        first = MockClientAPIService(total=1000, seed=7)
+        second = MockClientAPIService(total=1000, seed=7, base_date=first.base_date)
+
+        assert first.generate_check_object(500) == second.generate_check_object(500)
+        assert list(first.generate_check_objects(10, 5)) == [
+            second.generate_check_object(i) for i in range(10, 15)
+        ]
+
+    def test_pagination_covers_dataset(self):
+        """Test pages cover the configured dataset without overlap"""
+        mock = MockClientAPIService(total=250, items_per_object=5, seed=1)
+
+        ids = []
+        for page in range(1, 4):
+            ids.extend(obj["check_object_id"] for obj in mock.get_mock_check_objects(page, 100)["data"]["list"])
+
+        assert len(ids) == 250
+        assert len(set(ids)) == 250
+        assert len(mock.generate_check_object(0)["check_items"]) == 5
+
+    def test_time_window_filters_by_sampling_time(self):
+        """Test windowed queries return only objects sampled inside the window"""
+        mock = MockClientAPIService(total=200, seed=5, base_date=datetime(2025, 1, 1))
+        start, end = datetime(2025, 1, 10), datetime(2025, 1, 19, 23, 59, 59)
+
+        response = mock.get_mock_check_objects(1, 500, start_time=start, end_time=end)
+
+        objects = response["data"]["list"]
+        assert response["data"]["total"] == len(objects) > 0
+        assert all(start <= datetime.fromisoformat(obj["sampling_time"]) <= end for obj in objects)
+        assert mock.get_mock_check_objects(1, 5, start_time=start, end_time=end)["data"]["total"] == len(objects)
+        before = mock.get_mock_check_objects(1, 500, end_time=start - timedelta(seconds=1))["data"]["total"]
+        after = mock.get_mock_check_objects(1, 500, start_time=end + timedelta(seconds=1))["data"]["total"]
+        assert before + len(objects) + after == 200
+
+    def test_generated_objects_parse(self):
+        """Test generated objects map onto model fields"""
+        mock = MockClientAPIService(total=1, seed=3)
+        parsed = ClientAPIService().parse_check_object(mock.generate_check_object(0))
+
+        assert parsed["check_object_union_num"] == "JC10000"
+        assert parsed["check_start_time"] is not None
+        assert all(item["check_item_name"] for item in parsed["check_items"])
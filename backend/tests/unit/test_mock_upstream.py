@@ -0,0 +1,113 @@
+"""
+Unit tests for the mock upstream server
+Test signature validation, pagination, fault injection and end-to-end sync
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.mock_upstream import MockUpstream, create_mock_upstream_app
+from app.models.check_object import CheckObject
+from app.services import client_api_service
+from app.services.client_api_service import ClientAPIService
+from app.services.mock_client_api import MockClientAPIService
+from app.services.sync_service import SyncService
+
+DATA_URL = "/admin/api/test/check/data"
+FEEDBACK_URL = "/admin/api/test/check/feedback"
+
+
+def make_upstream(total=250, **kwargs):
+    mock = MockClientAPIService(total=total, seed=42, base_date=datetime(2025, 1, 1))
+    return MockUpstream(mock, **kwargs)
+
+
+def signed(biz):
+    return ClientAPIService()._prepare_request_params(biz)
+
+
+@pytest.fixture
+def upstream():
+    return make_upstream()
+
+
+@pytest.fixture
+def upstream_client(upstream):
+    return TestClient(create_mock_upstream_app(upstream))
+
+
+class TestMockUpstream:
+    """Unit test for the mock upstream server"""
+
+    def test_rejects_invalid_signature(self, upstream, upstream_client):
+        """Test requests with a wrong signature are rejected"""
+        params = signed({"limit": 10})
+        params["sign"] = "0" * 32
+
+        response = upstream_client.post(DATA_URL, data=params)
+
+        assert response.json()["status"] == 401
+        assert upstream.stats["rejected_signatures"] == 1
+
+    def test_paginates_by_sampling_time(self, upstream_client):
+        """Test pages are disjoint and count covers the time window"""
+        window = {"start_time": "2025-01-01 00:00:00", "end_time": "2025-12-31 23:59:59", "limit": 100}
+        pages = [
+            upstream_client.post(DATA_URL, data=signed({**window, "page": page})).json()["data"]
+            for page in (1, 2, 3)
+        ]
+
+        check_nos = [obj["check_no"] for page in pages for obj in page["list"]]
+        assert pages[0]["count"] == 250
+        assert len(check_nos) == 250
+        assert len(set(check_nos)) == 250
+        times = [obj["check_start_time"] for page in pages for obj in page["list"]]
+        assert times == sorted(times)
+
+    def test_time_window_filters(self, upstream_client):
+        """Test only objects sampled inside the window are returned"""
+        biz = {"start_time": "2025-01-10 00:00:00", "end_time": "2025-01-10 23:59:59", "limit": 1000}
+        data = upstream_client.post(DATA_URL, data=signed(biz)).json()["data"]
+
+        assert 0 < data["count"] < 250
+        assert all(obj["check_start_time"].startswith("2025-01-10") for obj in data["list"])
+
+    def test_injects_errors(self):
+        """Test error_rate=1 fails every request with a 5xx"""
+        client = TestClient(create_mock_upstream_app(make_upstream(error_rate=1.0)))
+
+        response = client.post(DATA_URL, data=signed({"limit": 10}))
+
+        assert response.status_code >= 500
+
+    def test_feedback_is_recorded(self, upstream, upstream_client):
+        """Test submitted results are validated and stored per check_no"""
+        biz = {"check_no_join": "JC10000", "check_num": 1, "goods": [{"check_no": "JC10000", "check_result": "合格"}]}
+
+        response = upstream_client.post(FEEDBACK_URL, data=signed(biz))
+        empty = upstream_client.post(FEEDBACK_URL, data=signed({"goods": []}))
+
+        assert response.json()["status"] == 200
+        assert upstream.feedback["JC10000"]["check_result"] == "合格"
+        assert empty.json()["status"] == 400
+
+    def test_sync_end_to_end(self, db, upstream, monkeypatch):
+        """Test SyncService ingests objects served over HTTP by the mock upstream"""
+        mock_app = create_mock_upstream_app(upstream)
+        monkeypatch.setattr(client_api_service.settings, "USE_MOCK_CLIENT_API", False)
+        monkeypatch.setattr(
+            client_api_service.httpx, "Client",
+            lambda timeout=None: TestClient(mock_app, base_url=client_api_service.settings.API_BASE_URL)
+        )
+
+        result = SyncService(db).sync_data()
+
+        assert result["status"] == "success"
+        assert result["new_count"] == 250
+        assert db.query(CheckObject).count() == 250
+        obj = db.query(CheckObject).first()
+        assert len(obj.check_items) == 3
+        assert obj.check_items[0].check_item_name
+        # Windows holding more than one page were split and re-fetched
+        assert upstream.stats["data_requests"] > 1
@@ -0,0 +1,138 @@
+"""
+Unit tests for the raw upstream payload archive
+Test append-only gzip members, partial pages and replay without upstream calls
+"""
+import gzip
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cli import replay
+from app.mock_upstream import MockUpstream, create_mock_upstream_app
+from app.models.check_object import CheckObject
+from app.models.sync_log import SyncLog
+from app.services import client_api_service
+from app.services.mock_client_api import MockClientAPIService
+from app.services.payload_archive import PayloadArchive
+from app.services.sync_service import SyncService
+
+
+def record_page(archive: PayloadArchive, body: bytes, chunk_size: int = 7, **metadata):
+    with archive.record(**metadata) as recorder:
+        for _ in recorder.tee(body[i:i + chunk_size] for i in range(0, len(body), chunk_size)):
+            pass
+
+
+class TestPayloadArchive:
+    """Unit test for PayloadArchive"""
+
+    def test_pages_round_trip(self, tmp_path):
+        """Test pages are appended as gzip members and read back in order"""
+        archive = PayloadArchive(str(tmp_path))
+        record_page(archive, b'{"status": 200, "data": {"list": [1]}}', start_time="a")
+        record_page(archive, "中文 body".encode("utf-8"), start_time="b")
+
+        pages = list(archive.iter_pages())
+
+        assert [(meta["start_time"], body) for meta, body in pages] == [
+            ("a", b'{"status": 200, "data": {"list": [1]}}'),
+            ("b", "中文 body".encode("utf-8")),
+        ]
+        assert "fetched_at" in pages[0][0]
+        # Plain gzip tools read the concatenated members
+        with gzip.open(archive.files()[0]) as f:
+            assert f.read().count(b"\n") == 2
+
+    def test_incomplete_pages_are_dropped(self, tmp_path):
+        """Test pages that were not fully read, or failed, are not archived"""
+        archive = PayloadArchive(str(tmp_path))
+        with archive.record(start_time="partial") as recorder:
+            next(recorder.tee(iter([b"abc", b"def"])))
+        with pytest.raises(RuntimeError):
+            with archive.record(start_time="failed") as recorder:
+                list(recorder.tee([b"abc"]))
+                raise RuntimeError("parse error")
+
+        assert list(archive.iter_pages()) == []
+
+    def test_truncated_last_member_is_ignored(self, tmp_path):
+        """Test a member cut short by a crash does not hide earlier pages"""
+        archive = PayloadArchive(str(tmp_path))
+        record_page(archive, b"first", start_time="a")
+        record_page(archive, b"second" * 100, start_time="b")
+        path = archive.files()[0]
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data[:-10])
+
+        assert [body for _, body in archive.iter_pages()] == [b"first"]
+
+    def test_files_filtered_by_fetch_day(self, tmp_path):
+        """Test since/until select archive files by their fetch day"""
+        for day in ("2025-06-01", "2025-06-02", "2025-06-03"):
+            (tmp_path / f"pages-{day}.gz").write_bytes(b"")
+        (tmp_path / "notes.txt").write_text("x")
+
+        files = PayloadArchive(str(tmp_path)).files(since=date(2025, 6, 2), until=date(2025, 6, 3))
+
+        assert [path.rsplit("/", 1)[-1] for path in files] == ["pages-2025-06-02.gz", "pages-2025-06-03.gz"]
+
+
+class TestReplayArchive:
+    """Unit test for SyncService.replay_archive"""
+
+    @pytest.fixture
+    def upstream(self, monkeypatch):
+        mock = MockClientAPIService(total=120, seed=8, base_date=datetime(2025, 1, 1))
+        upstream = MockUpstream(mock)
+        mock_app = create_mock_upstream_app(upstream)
+        monkeypatch.setattr(client_api_service.settings, "USE_MOCK_CLIENT_API", False)
+        monkeypatch.setattr(client_api_service.settings, "SYNC_PAGE_SIZE", 50)
+        monkeypatch.setattr(client_api_service.settings, "CLIENT_API_RATE_LIMIT_PER_SECOND", 0)
+        monkeypatch.setattr(
+            client_api_service.httpx, "Client",
+            lambda timeout=None: TestClient(mock_app, base_url=client_api_service.settings.API_BASE_URL)
+        )
+        return upstream
+
+    def test_replay_rebuilds_data_without_upstream_calls(self, db, upstream, sync_archive):
+        """Test replaying archived pages re-derives every object with no new requests"""
+        assert SyncService(db).sync_data()["new_count"] == 120
+        db.query(CheckObject).delete()
+        db.commit()
+        requests = upstream.stats["data_requests"]
+
+        result = SyncService(db).replay_archive(sync_archive)
+
+        assert result["status"] == "success"
+        assert result["new_count"] == 120
+        assert result["skipped_pages"] > 0
+        assert result["pages"] + result["skipped_pages"] == requests
+        assert db.query(CheckObject).count() == 120
+        assert upstream.stats["data_requests"] == requests
+        assert db.query(SyncLog).filter(SyncLog.sync_type == "replay").one().status == "success"
+
+    def test_replay_uses_current_parser(self, db, upstream, sync_archive, monkeypatch):
+        """Test replay applies mapping fixes made after the pages were fetched"""
+        SyncService(db).sync_data()
+        parse = client_api_service.ClientAPIService.parse_check_object
+
+        def fixed_parse(self, api_data):
+            parsed = parse(self, api_data)
+            parsed["submission_goods_area"] = "修正后"
+            return parsed
+
+        monkeypatch.setattr(client_api_service.ClientAPIService, "parse_check_object", fixed_parse)
+        result = SyncService(db).replay_archive(sync_archive)
+
+        assert result["updated_count"] == 120
+        assert {area for (area,) in db.query(CheckObject.submission_goods_area)} == {"修正后"}
+
+    def test_cli_lists_archive_files(self, tmp_path, capsys):
+        """Test the replay command can list what it would replay"""
+        (tmp_path / "pages-2025-06-01.gz").write_bytes(b"")
+
+        assert replay.main(["--archive-dir", str(tmp_path), "--list"]) == 0
+        assert "pages-2025-06-01.gz" in capsys.readouterr().out
@@ -0,0 +1,86 @@
+"""
+Unit tests for Report Preview Service
+Test thumbnail generation, page count and LRU eviction
+"""
+import os
+import pytest
+
+from app.services import preview_service
+from app.services.preview_service import ReportPreviewService
+
+
+def make_pdf(path, pages=1):
+    """Create a minimal PDF with the given number of pages"""
+    if preview_service.pymupdf is None:
+        body = b"".join(b"<< /Type /Page >>\n" for _ in range(pages))
+        path.write_bytes(b"%PDF-1.4\n<< /Type /Pages >>\n" + body)
+        return path
+    document = preview_service.pymupdf.open()
+    for i in range(pages):
+        page = document.new_page()
+        page.insert_text((72, 72), f"page {i + 1}")
+    document.save(str(path))
+    document.close()
+    return path
+
+
+class TestReportPreviewService:
+    """Unit test for report previews"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        return ReportPreviewService(cache_dir=str(tmp_path / "previews"), max_cache_bytes=10 * 1024 * 1024)
+
+    def test_generate_records_page_count(self, service, tmp_path):
+        """Test generated preview has the report page count"""
+        pdf = make_pdf(tmp_path / "abc.pdf", pages=3)
+
+        preview = service.get_preview(str(pdf))
+
+        assert preview["page_count"] == 3
+        if service.can_render:
+            assert preview["thumbnail_path"].endswith("abc.png")
+            with open(preview["thumbnail_path"], "rb") as f:
+                assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    def test_preview_is_served_from_cache(self, service, tmp_path):
+        """Test a cached preview survives removal of the source PDF"""
+        pdf = make_pdf(tmp_path / "cached.pdf")
+        service.generate(str(pdf))
+        os.remove(pdf)
+
+        assert service.get_preview(str(pdf))["page_count"] == 1
+
+    def test_invalid_pdf_has_no_preview(self, service, tmp_path):
+        """Test non-PDF content yields no preview"""
+        bogus = tmp_path / "bogus.pdf"
+        bogus.write_bytes(b"not a pdf")
+
+        assert service.get_preview(str(bogus)) is None
+
+    def test_lru_eviction(self, tmp_path):
+        """Test least recently used previews are evicted over budget"""
+        pdfs = [make_pdf(tmp_path / f"r{i}.pdf") for i in range(3)]
+        probe = ReportPreviewService(cache_dir=str(tmp_path / "probe"))
+        probe.generate(str(pdfs[0]))
+        entry_size = probe._entry_size("r0")
+
+        service = ReportPreviewService(
+            cache_dir=str(tmp_path / "previews"),
+            max_cache_bytes=entry_size * 2 + entry_size // 2
+        )
+        service.generate(str(pdfs[0]))
+        service.generate(str(pdfs[1]))
+        service.get_preview(str(pdfs[0]))  # r0 becomes most recently used
+        service.generate(str(pdfs[2]))
+
+        assert list(service._entries) == ["r0", "r2"]
+        assert not os.path.exists(service._metadata_path("r1"))
+
+    def test_index_rebuilt_from_disk(self, service, tmp_path):
+        """Test a new instance picks up existing cache entries"""
+        service.generate(str(make_pdf(tmp_path / "persisted.pdf")))
+
+        reloaded = ReportPreviewService(cache_dir=service.cache_dir)
+
+        assert "persisted" in reloaded._entries
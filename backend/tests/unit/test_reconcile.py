@@ -0,0 +1,97 @@
+"""
+Unit tests for reconciliation with upstream
+Test per-day digest comparison, targeted repairs and drift reporting
+"""
+from datetime import datetime
+
+from app.config import settings
+from app.models.check_object import CheckObject
+from app.models.sync_log import SyncLog
+from app.services.client_api_service import ClientAPIService
+from app.services.mock_client_api import MockClientAPIService
+from app.services.reconcile_service import RECONCILE_DRIFT
+from app.services.sync_service import SyncService
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 2, 5, 23, 59, 59)
+
+
+class MockClient(ClientAPIService):
+    """Client API backed by a seeded mock dataset"""
+
+    def __init__(self):
+        super().__init__()
+        self.use_mock = True
+        self.mock = MockClientAPIService(total=120, seed=4, base_date=START)
+        self.requests = 0
+
+    def fetch_check_objects(self, page=1, page_size=50, status=None, start_time=None, end_time=None):
+        self.requests += 1
+        return self.mock.get_mock_check_objects(page, page_size, start_time, end_time)
+
+
+def reconcile(db):
+    service = SyncService(db)
+    service.client_api_service = MockClient()
+    return service.reconcile(START, END)
+
+
+class TestReconcile:
+    """Unit test for SyncService.reconcile"""
+
+    def test_empty_database_is_filled(self, db):
+        """Test every upstream object is reported missing and written"""
+        result = reconcile(db)
+
+        assert result["status"] == "success"
+        assert result["days"] == 36
+        assert (result["missing"], result["new_count"]) == (120, 120)
+        assert db.query(CheckObject).count() == 120
+        assert db.query(SyncLog).filter(SyncLog.sync_type == "reconcile").one().new_count == 120
+
+    def test_only_drifted_rows_are_repaired(self, db):
+        """Test missing and changed rows are repaired, others only reported"""
+        reconcile(db)
+        objects = db.query(CheckObject).order_by(CheckObject.id).all()
+        for obj in objects[:3]:
+            db.delete(obj)
+        objects[3].submission_goods_name = "本地改动"
+        objects[4].submission_goods_name = "已提交改动"
+        objects[4].status = 2
+        objects[5].status = 1
+        objects[5].check_result = "合格"
+        db.add(CheckObject(
+            check_object_id=99999, check_object_union_num="LOCAL1", check_start_time=datetime(2025, 1, 10)
+        ))
+        db.commit()
+
+        result = reconcile(db)
+
+        assert {kind: result[kind] for kind in ("missing", "changed", "local_only", "unreflected")} == {
+            "missing": 3, "changed": 1, "local_only": 1, "unreflected": 1
+        }
+        assert (result["new_count"], result["updated_count"]) == (3, 1)
+        assert db.query(CheckObject).count() == 121
+        db.expire_all()
+        assert objects[3].submission_goods_name != "本地改动"
+        assert objects[4].submission_goods_name == "已提交改动"
+        assert RECONCILE_DRIFT.get("missing") == 3
+
+    def test_second_run_finds_no_drift(self, db):
+        """Test a repaired range reconciles clean without writes"""
+        reconcile(db)
+
+        result = reconcile(db)
+
+        assert [result[kind] for kind in ("missing", "changed", "local_only", "unreflected")] == [0, 0, 0, 0]
+        assert result["fetched_count"] == 0
+        assert (result["upstream_count"], result["local_count"]) == (120, 120)
+
+    def test_busy_days_are_split(self, db, monkeypatch):
+        """Test days holding more objects than a page are fetched in sub-windows"""
+        monkeypatch.setattr(settings, "SYNC_PAGE_SIZE", 2)
+
+        result = reconcile(db)
+
+        assert result["requests"] > result["days"]
+        assert result["missing"] == 120
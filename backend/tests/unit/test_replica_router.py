@@ -0,0 +1,85 @@
+"""
+Unit tests for read replica routing
+Test lag-aware replica selection, fallback to primary and get_read_db
+"""
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.database import Base, ReplicaRouter
+from app.models.check_object import CheckObject
+
+
+def make_router(tmp_path, count=2, max_lag=5.0, check_interval=60.0):
+    urls = [f"sqlite:///{tmp_path / f'replica{i}.db'}" for i in range(count)]
+    return ReplicaRouter(urls, max_lag_seconds=max_lag, check_interval=check_interval)
+
+
+class TestReplicaRouter:
+    """Unit test for ReplicaRouter"""
+
+    def test_no_replicas_uses_primary(self):
+        """Test reads go to the primary when no replicas are configured"""
+        assert ReplicaRouter([], max_lag_seconds=5, check_interval=10).choose() is None
+
+    def test_round_robin_between_healthy_replicas(self, tmp_path):
+        """Test healthy replicas are used in turn"""
+        router = make_router(tmp_path)
+
+        chosen = [router.choose() for _ in range(4)]
+
+        factories = [replica.session_factory for replica in router.replicas]
+        assert chosen == factories * 2
+
+    def test_lagging_replica_is_skipped(self, tmp_path, monkeypatch):
+        """Test replicas beyond max lag are skipped, falling back to the primary"""
+        router = make_router(tmp_path)
+        lags = {router.replicas[0].name: 30.0, router.replicas[1].name: 1.0}
+        monkeypatch.setattr(router, "measure_lag", lambda replica: lags[replica.name])
+
+        assert router.choose() is router.replicas[1].session_factory
+
+        lags[router.replicas[1].name] = 30.0
+        router.replicas[1].checked_at = 0.0
+        router.replicas[0].checked_at = 0.0
+        assert router.choose() is None
+
+    def test_unreachable_replica_falls_back(self, tmp_path):
+        """Test a replica that cannot be reached is not used"""
+        router = ReplicaRouter(
+            [f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"],
+            max_lag_seconds=5, check_interval=60
+        )
+
+        assert router.choose() is None
+        assert router.replicas[0].lag is None
+
+    def test_lag_is_cached_between_checks(self, tmp_path, monkeypatch):
+        """Test lag is measured at most once per check interval"""
+        router = make_router(tmp_path, count=1)
+        calls = []
+        monkeypatch.setattr(router, "measure_lag", lambda replica: calls.append(replica) or 0.0)
+
+        for _ in range(5):
+            router.choose()
+
+        assert len(calls) == 1
+
+
+class TestGetReadDb:
+    """Unit test for the get_read_db dependency"""
+
+    def test_list_served_from_replica(self, client, auth_headers, tmp_path, monkeypatch):
+        """Test read-only endpoints query the chosen replica"""
+        router = make_router(tmp_path, count=1)
+        replica_engine = router.replicas[0].engine
+        Base.metadata.create_all(bind=replica_engine)
+        session = sessionmaker(bind=replica_engine)()
+        session.add(CheckObject(check_object_id=1, check_object_union_num="REPLICA001"))
+        session.commit()
+        session.close()
+        monkeypatch.setattr(deps, "get_replica_router", lambda: router)
+
+        response = client.get("/api/v1/check-objects", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert [item["check_object_union_num"] for item in response.json()["items"]] == ["REPLICA001"]
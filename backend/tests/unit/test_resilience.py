@@ -0,0 +1,157 @@
+"""
+Unit tests for rate limiting and circuit breaking
+Test TokenBucket, CircuitBreaker and their use in ClientAPIService
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.mock_upstream import MockUpstream, create_mock_upstream_app
+from app.services import client_api_service
+from app.services.client_api_service import ClientAPIService, get_client_api_circuit_breaker
+from app.services.mock_client_api import MockClientAPIService
+from app.utils.resilience import (
+    CLOSED, HALF_OPEN, OPEN,
+    CircuitBreaker, CircuitOpenError, RateLimitExceeded, TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Unit test for TokenBucket"""
+
+    def test_burst_then_steady_rate(self):
+        """Test a full bucket allows a burst, then one call per 1/rate seconds"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            bucket.acquire()
+        assert clock.now == 0
+
+        bucket.acquire()
+        bucket.acquire()
+        assert clock.now == pytest.approx(1.0)
+
+    def test_timeout_raises(self):
+        """Test acquire gives up when the wait would exceed the timeout"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+
+        with pytest.raises(RateLimitExceeded):
+            bucket.acquire(timeout=0.5)
+
+    def test_zero_rate_disables_limit(self):
+        """Test a rate of 0 never blocks"""
+        bucket = TokenBucket(rate=0, sleep=lambda seconds: pytest.fail("should not sleep"))
+
+        for _ in range(100):
+            bucket.acquire()
+
+
+class TestCircuitBreaker:
+    """Unit test for CircuitBreaker"""
+
+    def make_breaker(self, clock):
+        return CircuitBreaker("test", failure_threshold=3, recovery_timeout=10, clock=clock)
+
+    def test_opens_after_consecutive_failures(self):
+        """Test the circuit opens at the threshold and rejects calls"""
+        breaker = self.make_breaker(FakeClock())
+
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure()
+        breaker.before_call()
+        breaker.record_success()
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_probe_closes_on_success(self):
+        """Test one probe is admitted after the cool-down and closes the circuit"""
+        clock = FakeClock()
+        breaker = self.make_breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock.now = 10
+        assert breaker.state == HALF_OPEN
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        breaker.before_call()
+
+    def test_half_open_probe_failure_reopens(self):
+        """Test a failed probe re-opens the circuit for another cool-down"""
+        clock = FakeClock()
+        breaker = self.make_breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock.now = 10
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.retry_after() == 10
+
+
+class TestClientAPIGuards:
+    """Unit test for the guards around ClientAPIService._make_request"""
+
+    @pytest.fixture
+    def upstream(self, monkeypatch):
+        mock = MockClientAPIService(total=10, seed=1, base_date=datetime(2025, 1, 1))
+        upstream = MockUpstream(mock, error_rate=1.0)
+        mock_app = create_mock_upstream_app(upstream)
+        monkeypatch.setattr(client_api_service.settings, "USE_MOCK_CLIENT_API", False)
+        monkeypatch.setattr(client_api_service.settings, "CLIENT_API_BREAKER_FAILURE_THRESHOLD", 3)
+        monkeypatch.setattr(
+            client_api_service.httpx, "Client",
+            lambda timeout=None: TestClient(mock_app, base_url=client_api_service.settings.API_BASE_URL)
+        )
+        return upstream
+
+    def test_outage_fails_fast(self, upstream):
+        """Test repeated upstream errors open the circuit and stop further requests"""
+        service = ClientAPIService()
+
+        for _ in range(3):
+            with pytest.raises(Exception):
+                service.fetch_check_objects(page_size=10)
+
+        with pytest.raises(CircuitOpenError):
+            service.fetch_check_objects(page_size=10)
+        assert upstream.stats["data_requests"] == 3
+        assert get_client_api_circuit_breaker().state == OPEN
+
+    def test_client_errors_do_not_open_circuit(self, upstream):
+        """Test answered requests (even API-level errors) keep the circuit closed"""
+        upstream.error_rate = 0
+        upstream.secret = "wrong-secret"
+        service = ClientAPIService()
+
+        for _ in range(5):
+            assert service.fetch_check_objects(page_size=10)["code"] == 401
+
+        assert get_client_api_circuit_breaker().state == CLOSED
@@ -63,8 +63,11 @@ class TestScheduler:
             # Execute the task
             result = auto_sync_task()
 
-            # Verify sync_data was called with auto type
-            mock_instance.sync_data.assert_called_once_with(sync_type="auto")
+            # Verify sync_data was called with auto type, incrementally
+            mock_instance.sync_data.assert_called_once_with(
+                sync_type="auto",
+                start_time=mock_instance.incremental_start_time.return_value
+            )
 
     def test_scheduler_start(self):
         """Test scheduler starts without error"""
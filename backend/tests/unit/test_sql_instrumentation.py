@@ -0,0 +1,104 @@
+"""
+Unit tests for SQL query instrumentation
+Test per-request query stats, N+1 detection and Server-Timing
+"""
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.utils import sql_instrumentation
+from app.utils.sql_instrumentation import (
+    QueryStats,
+    current_query_stats,
+    describe_parameters,
+    report_request_queries,
+    track_queries,
+)
+
+
+class TestQueryStats:
+    """Unit test for QueryStats"""
+
+    def test_repeated_statements(self):
+        """Test statements at or above the threshold are reported, most repeated first"""
+        stats = QueryStats()
+        for _ in range(3):
+            stats.record("SELECT a", 0.001)
+        for _ in range(5):
+            stats.record("SELECT b", 0.001)
+        stats.record("SELECT c", 0.001)
+
+        assert stats.count == 9
+        assert stats.repeated_statements(3) == [("SELECT b", 5), ("SELECT a", 3)]
+
+    def test_server_timing(self):
+        """Test Server-Timing value carries query count and DB time"""
+        stats = QueryStats()
+        stats.record("SELECT 1", 0.0125)
+        stats.record("SELECT 1", 0.0025)
+
+        assert stats.server_timing() == 'db;dur=15.0;desc="2 queries"'
+
+    def test_describe_parameters_hides_values(self):
+        """Test only the parameter shape is described"""
+        assert describe_parameters({"username": "secret", "id": 1}) == "dict(id, username)"
+        assert describe_parameters(("secret", 1)) == "tuple[2]"
+        assert describe_parameters([{"id": 1}, {"id": 2}]) == "2 x dict(id)"
+
+
+class TestQueryInstrumentation:
+    """Unit test for engine instrumentation"""
+
+    def test_track_queries_counts_statements(self, db):
+        """Test queries executed on the instrumented engine are tracked"""
+        with track_queries() as stats:
+            db.execute(text("SELECT 1"))
+            db.execute(text("SELECT 1"))
+
+        assert stats.count == 2
+        assert stats.statements["SELECT 1"] == 2
+
+    def test_current_query_stats_is_recorded(self, db):
+        """Test the context-local stats receive queries in the same context"""
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            db.execute(text("SELECT 1"))
+        finally:
+            current_query_stats.reset(token)
+
+        assert stats.count == 1
+
+    def test_failing_statement_is_not_timed(self, db):
+        """Test a failing statement leaves no start time on the connection"""
+        with track_queries() as stats:
+            with pytest.raises(OperationalError):
+                db.execute(text("SELECT * FROM no_such_table"))
+            db.rollback()
+            db.execute(text("SELECT 1"))
+
+        assert stats.count == 1
+        assert "query_start_time" not in db.connection().info
+
+    def test_report_request_queries_warns_on_nplusone(self, monkeypatch, caplog):
+        """Test repeated statements in one request are flagged as N+1"""
+        monkeypatch.setattr(sql_instrumentation.settings, "SQL_NPLUSONE_THRESHOLD", 3)
+        stats = QueryStats()
+        for _ in range(4):
+            stats.record("SELECT * FROM check_object_items WHERE check_object_id = ?", 0.001)
+        before = sql_instrumentation.NPLUSONE_DETECTED.get("/test/{id}")
+
+        with caplog.at_level(logging.WARNING, logger=sql_instrumentation.__name__):
+            report_request_queries(stats, "GET", "/test/1", "/test/{id}")
+
+        assert "Possible N+1" in caplog.text
+        assert sql_instrumentation.NPLUSONE_DETECTED.get("/test/{id}") == before + 1
+
+    def test_request_has_server_timing_header(self, client, assert_max_queries):
+        """Test responses expose DB timing and stay within a query budget"""
+        with assert_max_queries(0):
+            response = client.get("/health")
+
+        assert response.headers["Server-Timing"].startswith('db;dur=0.0;desc="0 queries"')
@@ -0,0 +1,121 @@
+"""
+Unit tests for Storage Accounting Service
+Test incremental accounting, rescan and growth projection
+"""
+import pytest
+from datetime import date
+
+from app.services.storage_service import StorageAccountingService
+
+
+class TestStorageAccountingService:
+    """Unit test for storage accounting"""
+
+    @pytest.fixture
+    def upload_dir(self, tmp_path):
+        return tmp_path / "uploads"
+
+    @pytest.fixture
+    def accounting(self, upload_dir):
+        return StorageAccountingService(upload_dir=str(upload_dir))
+
+    def _write_report(self, upload_dir, year, month, name, size):
+        target = upload_dir / "reports" / year / month
+        target.mkdir(parents=True, exist_ok=True)
+        path = target / name
+        path.write_bytes(b"x" * size)
+        return path
+
+    def test_month_key_for_path(self, accounting, upload_dir):
+        """Test month key is derived from reports/YYYY/MM"""
+        path = upload_dir / "reports" / "2025" / "11" / "a.pdf"
+        assert accounting.month_key_for_path(str(path)) == "2025/11"
+
+        outside = upload_dir / "other" / "a.pdf"
+        assert accounting.month_key_for_path(str(outside)) is None
+
+    def test_record_added_and_removed(self, accounting, upload_dir):
+        """Test incremental add/remove adjusts the month bucket"""
+        path = upload_dir / "reports" / "2025" / "11" / "a.pdf"
+
+        accounting.record_added(str(path), 100)
+        accounting.record_added(str(path), 50)
+        usage = accounting.get_usage()
+        assert usage["total_bytes"] == 150
+        assert usage["total_files"] == 2
+        assert usage["months"][0] == {"month": "2025/11", "bytes": 150, "files": 2}
+
+        accounting.record_removed(str(path), 100)
+        accounting.record_removed(str(path), 50)
+        assert accounting.get_usage()["months"] == []
+
+    def test_ledger_persists_across_instances(self, accounting, upload_dir):
+        """Test ledger is reloaded by a new instance"""
+        path = upload_dir / "reports" / "2025" / "10" / "a.pdf"
+        accounting.record_added(str(path), 42)
+
+        other = StorageAccountingService(upload_dir=str(upload_dir))
+        assert other.get_usage()["total_bytes"] == 42
+
+    def test_rescan_replaces_ledger(self, accounting, upload_dir):
+        """Test rescan measures month directories and corrects drift"""
+        self._write_report(upload_dir, "2025", "10", "a.pdf", 10)
+        self._write_report(upload_dir, "2025", "11", "b.pdf", 20)
+        self._write_report(upload_dir, "2025", "11", "c.pdf", 30)
+
+        # Drifted incremental value
+        accounting.record_added(str(upload_dir / "reports" / "2024" / "01" / "x.pdf"), 999)
+
+        months = accounting.rescan()
+
+        assert months == {
+            "2025/10": {"bytes": 10, "files": 1},
+            "2025/11": {"bytes": 50, "files": 2},
+        }
+        usage = accounting.get_usage()
+        assert usage["total_bytes"] == 60
+        assert usage["last_scan"] is not None
+
+    def test_rescan_measures_sync_archive(self, upload_dir, tmp_path):
+        """Test rescan measures the payload archive and counts it in the totals"""
+        archive_dir = tmp_path / "sync_archive"
+        archive_dir.mkdir()
+        (archive_dir / "pages-2025-11-01.gz").write_bytes(b"x" * 40)
+        self._write_report(upload_dir, "2025", "11", "a.pdf", 10)
+        accounting = StorageAccountingService(upload_dir=str(upload_dir), sync_archive_dir=str(archive_dir))
+
+        accounting.rescan()
+
+        usage = accounting.get_usage()
+        assert (usage["sync_archive_bytes"], usage["sync_archive_files"]) == (40, 1)
+        assert usage["total_bytes"] == 50
+
+    def test_rescan_missing_directory(self, accounting):
+        """Test rescan of a missing reports directory is empty"""
+        assert accounting.rescan() == {}
+
+    def test_growth_from_history(self):
+        """Test growth rate uses daily history samples"""
+        history = [("2025-11-01", 1000), ("2025-11-11", 11000)]
+        growth = StorageAccountingService.estimate_growth_bytes_per_day(
+            {}, history, today=date(2025, 11, 12)
+        )
+        assert growth == 1000
+
+    def test_growth_falls_back_to_current_month(self):
+        """Test growth rate falls back to month-to-date average"""
+        months = {"2025/11": {"bytes": 5000, "files": 5}}
+        growth = StorageAccountingService.estimate_growth_bytes_per_day(
+            months, [], today=date(2025, 11, 10)
+        )
+        assert growth == 500
+
+    def test_usage_projects_days_to_full(self, accounting, upload_dir):
+        """Test days_to_full is projected from growth rate"""
+        today = date.today()
+        path = upload_dir / "reports" / str(today.year) / f"{today.month:02d}" / "a.pdf"
+        accounting.record_added(str(path), 1024 * 1024)
+
+        usage = accounting.get_usage()
+        assert usage["growth_bytes_per_day"] > 0
+        assert usage["days_to_full"] is not None
@@ -0,0 +1,168 @@
+"""
+Unit tests for idempotent submission
+Test payload-hash short-circuiting, per-check_no leases and safe retries
+"""
+import httpx
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.check_item import CheckObjectItem
+from app.models.check_object import CheckObject
+from app.services.lock_service import LeaseLock
+from app.services.submit_service import SubmitService
+
+
+@pytest.fixture
+def check_object(db):
+    obj = CheckObject(
+        check_object_id=501,
+        check_object_union_num="JC501",
+        status=1,
+        check_result="合格",
+        check_result_url="/reports/2025/01/JC501.pdf"
+    )
+    db.add(obj)
+    db.add(CheckObjectItem(
+        check_object_item_id=50100, check_object_id=501, check_item_id=1,
+        check_item_name="农药残留", num="0.01", result="合格"
+    ))
+    db.commit()
+    return obj
+
+
+class Upstream:
+    """Records feedback calls; raises the queued errors first"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = []
+
+    def __call__(self, check_objects):
+        self.calls.append(check_objects)
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"status": 200, "message": "提交成功"}
+
+
+def submit_service(db, upstream: Upstream) -> SubmitService:
+    service = SubmitService(db)
+    service.base_retry_delay = 0
+    service.client_api_service.submit_check_result = upstream
+    return service
+
+
+class TestIdempotentSubmit:
+    """Unit test for SubmitService.submit_check_object idempotency"""
+
+    def test_identical_resubmit_is_short_circuited(self, db, check_object):
+        """Test resubmitting the confirmed payload succeeds without calling upstream"""
+        upstream = Upstream()
+        service = submit_service(db, upstream)
+
+        first = service.submit_check_object(check_object.id)
+        second = service.submit_check_object(check_object.id)
+
+        assert first["success"] and not first.get("duplicate")
+        assert second["success"] and second["duplicate"]
+        assert len(upstream.calls) == 1
+        assert check_object.status == 2
+        assert check_object.submit_payload_hash == service.payload_hash(service.build_check_object_data(check_object))
+        assert check_object.submitted_at is not None
+
+    def test_changed_result_is_not_short_circuited(self, db, check_object):
+        """Test a different result version of a submitted object is not treated as a duplicate"""
+        upstream = Upstream()
+        service = submit_service(db, upstream)
+        service.submit_check_object(check_object.id)
+
+        check_object.check_result = "不合格"
+        db.commit()
+        result = service.submit_check_object(check_object.id)
+
+        assert not result["success"]
+        assert "不能重复提交" in result["message"]
+        assert len(upstream.calls) == 1
+
+    def test_concurrent_submit_is_rejected(self, db, check_object):
+        """Test a submit of an object whose lease is held elsewhere sends nothing"""
+        upstream = Upstream()
+        other = LeaseLock("submit:JC501", session_factory=sessionmaker(bind=db.get_bind()), heartbeat=False)
+        assert other.acquire()
+        try:
+            result = submit_service(db, upstream).submit_check_object(check_object.id)
+        finally:
+            other.release()
+
+        assert not result["success"]
+        assert result["in_progress"]
+        assert upstream.calls == []
+        assert check_object.status == 1
+
+    def test_connect_errors_are_retried(self, db, check_object):
+        """Test failures before the request was sent are retried"""
+        connect_error = Exception("提交检测结果失败: refused")
+        connect_error.__cause__ = httpx.ConnectError("refused")
+        upstream = Upstream(connect_error)
+
+        result = submit_service(db, upstream).submit_check_object(check_object.id)
+
+        assert result["success"]
+        assert len(upstream.calls) == 2
+
+    def test_read_timeouts_are_not_retried(self, db, check_object):
+        """Test an ambiguous timeout is not resent, the feedback may have arrived"""
+        timeout = Exception("提交检测结果失败: timed out")
+        timeout.__cause__ = httpx.ReadTimeout("timed out")
+        upstream = Upstream(timeout)
+
+        result = submit_service(db, upstream).submit_check_object(check_object.id)
+
+        assert not result["success"]
+        assert len(upstream.calls) == 1
+        assert check_object.status == 3
+        assert check_object.submit_payload_hash is None
+
+    def test_resubmit_after_timeout_needs_confirmation(self, db, check_object):
+        """Test the payload of a timed out submit is not resent without confirmation"""
+        timeout = Exception("提交检测结果失败: timed out")
+        timeout.__cause__ = httpx.ReadTimeout("timed out")
+        upstream = Upstream(timeout)
+        service = submit_service(db, upstream)
+        service.submit_check_object(check_object.id)
+
+        retried = service.submit_check_object(check_object.id)
+
+        assert not retried["success"]
+        assert retried["needs_confirmation"]
+        assert len(upstream.calls) == 1
+        assert check_object.pending_payload_hash == service.payload_hash(service.build_check_object_data(check_object))
+
+        confirmed = service.submit_check_object(check_object.id, confirm=True)
+
+        assert confirmed["success"]
+        assert len(upstream.calls) == 2
+        assert check_object.status == 2
+        assert check_object.pending_payload_hash is None
+
+    def test_changed_result_after_timeout_is_sent(self, db, check_object):
+        """Test a corrected result is sent after a timeout without confirmation"""
+        timeout = Exception("提交检测结果失败: timed out")
+        timeout.__cause__ = httpx.WriteTimeout("timed out")
+        upstream = Upstream(timeout)
+        service = submit_service(db, upstream)
+        service.submit_check_object(check_object.id)
+
+        check_object.check_result = "不合格"
+        db.commit()
+
+        assert service.submit_check_object(check_object.id)["success"]
+        assert len(upstream.calls) == 2
+
+    def test_failed_submit_can_be_resent(self, db, check_object):
+        """Test an unconfirmed payload is sent again on resubmit"""
+        upstream = Upstream(Exception("提交检测结果失败: 500"))
+        service = submit_service(db, upstream)
+
+        assert not service.submit_check_object(check_object.id)["success"]
+        assert service.submit_check_object(check_object.id)["success"]
+        assert len(upstream.calls) == 2
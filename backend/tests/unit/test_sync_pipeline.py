@@ -0,0 +1,149 @@
+"""
+Unit tests for the pipelined sync
+Test window splitting, batched writes, partial failure and submitted objects
+"""
+from datetime import datetime
+
+import pytest
+
+from app.models.check_item import CheckObjectItem
+from app.models.check_object import CheckObject
+from app.services.client_api_service import ClientAPIService
+from app.services.mock_client_api import MockClientAPIService
+from app.services.sync_pipeline import SyncPipeline
+from app.services.sync_service import SyncService
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 2, 28, 23, 59, 59)
+
+
+class MockClient(ClientAPIService):
+    """Client API backed by a seeded mock dataset, recording requested windows"""
+
+    def __init__(self, total=120, fail_after=None, error_code=None, items_per_object=3):
+        super().__init__()
+        self.use_mock = True
+        self.mock = MockClientAPIService(
+            total=total, items_per_object=items_per_object, seed=11, base_date=START
+        )
+        self.fail_after = fail_after
+        self.error_code = error_code
+        self.windows = []
+
+    def fetch_check_objects(self, page=1, page_size=50, status=None, start_time=None, end_time=None):
+        self.windows.append((start_time, end_time))
+        if self.error_code is not None:
+            return {"code": self.error_code, "msg": "签名错误", "data": {"list": [], "total": 0}}
+        if self.fail_after is not None and len(self.windows) > self.fail_after:
+            raise Exception("客户端API请求失败: timeout")
+        return self.mock.get_mock_check_objects(page, page_size, start_time, end_time)
+
+
+def make_pipeline(db, client, **kwargs):
+    options = {"start_time": START, "end_time": END, "page_size": 20, "fetch_workers": 3, "batch_size": 25}
+    options.update(kwargs)
+    return SyncPipeline(db, client, **options)
+
+
+class TestSyncPipeline:
+    """Unit test for SyncPipeline"""
+
+    def test_full_windows_are_split_until_complete(self, db):
+        """Test windows over one page are split so every object is ingested once"""
+        client = MockClient(total=120)
+
+        counts = make_pipeline(db, client).run()
+
+        assert counts == {"fetched_count": 120, "new_count": 120, "updated_count": 0}
+        assert db.query(CheckObject).count() == 120
+        assert db.query(CheckObjectItem).count() == 360
+        assert len(client.windows) > 2
+
+    def test_resync_updates_and_replaces_items(self, db):
+        """Test a second run updates existing objects without duplicating items"""
+        make_pipeline(db, MockClient(total=40)).run()
+
+        counts = make_pipeline(db, MockClient(total=40)).run()
+
+        assert counts["new_count"] == 0
+        assert counts["updated_count"] == 40
+        assert db.query(CheckObjectItem).count() == 120
+
+    def test_submitted_objects_are_not_updated(self, db):
+        """Test objects with status=2 (提交成功) are left untouched"""
+        make_pipeline(db, MockClient(total=10)).run()
+        submitted = db.query(CheckObject).first()
+        submitted.status = 2
+        submitted.submission_goods_name = "已提交"
+        db.commit()
+
+        counts = make_pipeline(db, MockClient(total=10)).run()
+
+        db.refresh(submitted)
+        assert counts["updated_count"] == 9
+        assert submitted.submission_goods_name == "已提交"
+
+    def test_resync_preserves_lab_results(self, db):
+        """Test re-syncing an in-progress sample keeps entered results and skips unchanged items"""
+        make_pipeline(db, MockClient(total=5)).run()
+        item = db.query(CheckObjectItem).first()
+        item_pk = item.id
+        item.num = "0.12"
+        item.result = "合格"
+        db.commit()
+
+        pipeline = make_pipeline(db, MockClient(total=5))
+        pipeline.run()
+
+        item = db.get(CheckObjectItem, item_pk)
+        assert (item.num, item.result) == ("0.12", "合格")
+        assert pipeline.items_inserted == 0
+        assert pipeline.items_updated == 0
+
+    def test_dropped_items_are_soft_removed(self, db):
+        """Test items dropped upstream get status=0 and come back when re-sent"""
+        make_pipeline(db, MockClient(total=5, items_per_object=3)).run()
+
+        make_pipeline(db, MockClient(total=5, items_per_object=2)).run()
+
+        removed = db.query(CheckObjectItem).filter(CheckObjectItem.status == 0).all()
+        assert len(removed) == 5
+        assert all(item.check_object_item_id % 100 == 2 for item in removed)
+        assert db.query(CheckObjectItem).filter(CheckObjectItem.is_active).count() == 10
+
+        pipeline = make_pipeline(db, MockClient(total=5, items_per_object=4))
+        pipeline.run()
+
+        assert pipeline.items_updated == 5
+        assert pipeline.items_inserted == 5
+        assert db.query(CheckObjectItem).filter(CheckObjectItem.is_active).count() == 20
+
+    def test_failure_keeps_committed_batches(self, db):
+        """Test a fetch error mid-run keeps batches committed before it"""
+        client = MockClient(total=120, fail_after=6)
+        pipeline = make_pipeline(db, client, fetch_workers=1, batch_size=5)
+
+        with pytest.raises(Exception, match="timeout"):
+            pipeline.run()
+
+        db.rollback()
+        assert pipeline.new_count > 0
+        assert db.query(CheckObject).count() == pipeline.new_count
+
+    def test_upstream_error_code(self, db):
+        """Test a non-zero API code stops the sync with the API message"""
+        sync_service = SyncService(db)
+        sync_service.client_api_service = MockClient(error_code=401)
+
+        result = sync_service.sync_data()
+
+        assert result["status"] == "error"
+        assert result["message"] == "签名错误"
+
+    def test_windows_cover_range(self, db):
+        """Test initial windows are contiguous and cover the whole range"""
+        windows = list(make_pipeline(db, MockClient()).windows())
+
+        assert windows[0][0] == START
+        assert windows[-1][1] == END
+        assert all((b[0] - a[1]).total_seconds() == 1 for a, b in zip(windows, windows[1:]))
@@ -0,0 +1,145 @@
+"""
+Unit tests for the adaptive auto sync interval
+Test interval adaptation within bounds, rescheduling of the auto sync job
+and the incremental range it requests
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.config import settings
+from app.models.sync_log import SyncLog
+from app.services import sync_schedule
+from app.services.client_api_service import ClientAPIService
+from app.services.sync_schedule import AdaptiveSyncInterval
+from app.tasks import scheduler as scheduler_module
+
+DAY = datetime(2025, 6, 2, 10, 0)
+NIGHT = datetime(2025, 6, 2, 23, 0)
+BUSY = {"status": "success", "new_count": 50}
+QUIET = {"status": "success", "new_count": 3}
+EMPTY = {"status": "success", "new_count": 0}
+ERROR = {"status": "error", "message": "客户端API请求失败: timeout"}
+
+
+def interval():
+    return AdaptiveSyncInterval(
+        base_minutes=30, min_minutes=5, max_minutes=240, busy_new_count=20,
+        business_start_hour=8, business_end_hour=20
+    )
+
+
+class TestAdaptiveSyncInterval:
+    """Unit test for AdaptiveSyncInterval"""
+
+    def test_starts_at_base_interval(self):
+        """Test the first interval is the configured base"""
+        assert interval().minutes == 30
+
+    def test_busy_business_hours_shorten_down_to_minimum(self):
+        """Test many new records during business hours halve the interval until the minimum"""
+        adaptive = interval()
+
+        assert [adaptive.update(BUSY, DAY) for _ in range(4)] == [15, 7, 5, 5]
+
+    def test_empty_or_failed_syncs_back_off_up_to_maximum(self):
+        """Test empty and failed syncs double the interval until the maximum"""
+        adaptive = interval()
+
+        assert [adaptive.update(result, DAY) for result in (EMPTY, ERROR, EMPTY, ERROR, EMPTY)] == [
+            60, 120, 240, 240, 240
+        ]
+
+    def test_moderate_activity_returns_to_base(self):
+        """Test a sync with a few new records returns to the base interval"""
+        adaptive = interval()
+        adaptive.update(BUSY, DAY)
+
+        assert adaptive.update(QUIET, DAY) == 30
+        adaptive.update(EMPTY, DAY)
+        assert adaptive.update(QUIET, DAY) == 30
+
+    def test_no_speedup_outside_business_hours(self):
+        """Test busy syncs at night never go below the base interval"""
+        adaptive = interval()
+        adaptive.update(BUSY, DAY)
+
+        assert adaptive.update(BUSY, NIGHT) == 30
+
+    def test_backoff_ends_at_business_hours(self):
+        """Test a long overnight interval is cut short at the start of business hours"""
+        adaptive = interval()
+        for _ in range(3):
+            adaptive.update(EMPTY, NIGHT)
+
+        now = datetime(2025, 6, 3, 6, 30)
+        minutes = adaptive.update(EMPTY, now)
+
+        assert adaptive.minutes == 240
+        assert now + timedelta(minutes=minutes) == datetime(2025, 6, 3, 8, 1)
+
+    def test_configured_base_interval(self):
+        """Test a changed base interval (SystemConfig) is picked up"""
+        adaptive = interval()
+
+        assert adaptive.update(QUIET, DAY, base_minutes=60) == 60
+
+
+class TestRescheduleAutoSync:
+    """Unit test for reschedule_auto_sync"""
+
+    def test_job_follows_the_adapted_interval(self, monkeypatch):
+        """Test the auto sync job trigger is replaced with the adapted interval"""
+        adaptive = interval()
+        adaptive.business_start_hour, adaptive.business_end_hour = 0, 24
+        monkeypatch.setattr(sync_schedule, "_sync_interval", adaptive)
+        monkeypatch.setattr(scheduler_module, "_scheduler", BackgroundScheduler())
+        scheduler = scheduler_module.get_scheduler()
+        scheduler_module.setup_scheduler(scheduler)
+
+        assert scheduler.get_job("auto_sync_job").trigger.interval == timedelta(minutes=30)
+        assert scheduler_module.reschedule_auto_sync(BUSY) == 15
+        assert scheduler.get_job("auto_sync_job").trigger.interval == timedelta(minutes=15)
+        assert scheduler_module.reschedule_auto_sync(ERROR) == 30
+        assert scheduler.get_job("auto_sync_job").trigger.interval == timedelta(minutes=30)
+
+
+class TestIncrementalAutoSync:
+    """Unit test for the sampling-time range requested by auto syncs"""
+
+    def requested_windows(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "CLIENT_API_STREAM_RESPONSES", False)
+        monkeypatch.setattr(settings, "SYNC_INCREMENTAL_OVERLAP_MINUTES", 60)
+        windows = []
+
+        def fetch(**kwargs):
+            windows.append((kwargs["start_time"], kwargs["end_time"]))
+            return {"code": 0, "msg": "", "data": {"list": [], "total": 0}}
+
+        with patch.object(ClientAPIService, "fetch_check_objects", side_effect=fetch):
+            result = scheduler_module._auto_sync(db)
+        assert result["status"] == "success"
+        return windows
+
+    def test_first_auto_sync_covers_full_range(self, db, monkeypatch):
+        """Test an auto sync with no earlier successful sync requests from SYNC_START_TIME"""
+        windows = self.requested_windows(db, monkeypatch)
+
+        assert min(start for start, _ in windows) == ClientAPIService.default_start_time()
+
+    def test_auto_sync_starts_before_last_successful_sync(self, db, monkeypatch):
+        """Test auto syncs only request from the last successful sync minus the overlap"""
+        last = datetime.now().replace(microsecond=0) - timedelta(hours=2)
+        db.add(SyncLog(sync_type="manual", status="success", start_time=last))
+        db.add(SyncLog(sync_type="auto", status="error", start_time=last + timedelta(hours=1)))
+        db.add(SyncLog(sync_type="backfill", status="success", start_time=last + timedelta(hours=1)))
+        db.commit()
+
+        windows = self.requested_windows(db, monkeypatch)
+
+        assert windows == [(last - timedelta(minutes=60), ClientAPIService.default_end_time())]
+
+        # The next run continues from this one
+        this_run = db.query(SyncLog).filter(SyncLog.sync_type == "auto", SyncLog.status == "success").one()
+        assert self.requested_windows(db, monkeypatch)[0][0] == this_run.start_time - timedelta(minutes=60)
@@ -186,12 +186,24 @@ export async function uploadReport(file: File): Promise<{ file_url: string; file
 /**
  * Submit check result to client API
  * T131: Submit result to client system
+ * confirm: resend a result whose last submit timed out (the API answers 428 otherwise)
  */
-export async function submitResult(id: number): Promise<{ success: boolean; message: string }> {
-  const response = await api.post<{ success: boolean; message: string }>(`/submit/${id}`);
+export async function submitResult(id: number, confirm = false): Promise<{ success: boolean; message: string }> {
+  const response = await api.post<{ success: boolean; message: string }>(
+    `/submit/${id}`,
+    null,
+    { params: confirm ? { confirm: true } : undefined }
+  );
   return response.data;
 }
 
+/**
+ * Whether a submit error asks to confirm resending (last submit timed out)
+ */
+export function needsSubmitConfirmation(error: any): boolean {
+  return error?.response?.status === 428;
+}
+
 /**
  * Get status text
  * 需求2.3: 4种状态（待检测、已检测、提交成功、提交失败）
@@ -241,6 +253,25 @@ export async function downloadReport(checkNo: string): Promise<Blob> {
   return response.data;
 }
 
+/**
+ * Get first-page thumbnail of a PDF report by check_no
+ * The page count is returned in the X-Page-Count header
+ */
+export interface ReportPreview {
+  thumbnail: Blob;
+  pageCount: number;
+}
+
+export async function getReportPreview(checkNo: string): Promise<ReportPreview> {
+  const response = await api.get(`/reports/preview/${checkNo}`, {
+    responseType: 'blob',
+  });
+  return {
+    thumbnail: response.data,
+    pageCount: Number(response.headers['x-page-count'] || 0),
+  };
+}
+
 /**
  * Export check results to Excel
  * T152: Export Excel with query filters
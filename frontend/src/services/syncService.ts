@@ -4,12 +4,29 @@
  */
 import api from './api';
 
-export interface SyncResponse {
+export interface SyncJob {
+  job_id: number;
   status: string;
+  message: string;
+}
+
+export interface SyncJobStatus {
+  job_id: number;
+  sync_type: string;
+  status: 'queued' | 'running' | 'success' | 'error';
+  pages_fetched: number | null;
+  total: number | null;
   fetched_count: number;
+  processed_count: number | null;
   new_count: number;
   updated_count: number;
-  message: string;
+  rows_upserted: number;
+  rate_per_second: number | null;
+  eta_seconds: number | null;
+  elapsed_seconds: number | null;
+  message: string | null;
+  start_time: string | null;
+  end_time: string | null;
 }
 
 export interface SyncLog {
@@ -31,13 +48,39 @@ export interface SyncLogList {
 }
 
 /**
- * Trigger manual data synchronization
+ * Trigger manual data synchronization (queued as a background job)
+ */
+export async function fetchData(): Promise<SyncJob> {
+  const response = await api.post<SyncJob>('/sync/fetch');
+  return response.data;
+}
+
+/**
+ * Get progress of a sync job
  */
-export async function fetchData(): Promise<SyncResponse> {
-  const response = await api.post<SyncResponse>('/sync/fetch');
+export async function getSyncJob(jobId: number): Promise<SyncJobStatus> {
+  const response = await api.get<SyncJobStatus>(`/sync/jobs/${jobId}`);
   return response.data;
 }
 
+/**
+ * Poll a sync job until it finishes, reporting progress along the way
+ */
+export async function waitForSyncJob(
+  jobId: number,
+  onProgress?: (status: SyncJobStatus) => void,
+  intervalMs = 1000
+): Promise<SyncJobStatus> {
+  for (;;) {
+    const status = await getSyncJob(jobId);
+    onProgress?.(status);
+    if (status.status === 'success' || status.status === 'error') {
+      return status;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
+
 /**
  * Get sync logs with pagination
  */
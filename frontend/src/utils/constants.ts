@@ -31,11 +31,17 @@ export const CHECK_RESULT = {
 export const SYNC_TYPE = {
   AUTO: 'auto',
   MANUAL: 'manual',
+  REPLAY: 'replay',
+  BACKFILL: 'backfill',
+  RECONCILE: 'reconcile',
 } as const;
 
 export const SYNC_TYPE_TEXT: Record<string, string> = {
   [SYNC_TYPE.AUTO]: '自动同步',
   [SYNC_TYPE.MANUAL]: '手动同步',
+  [SYNC_TYPE.REPLAY]: '归档回放',
+  [SYNC_TYPE.BACKFILL]: '历史回填',
+  [SYNC_TYPE.RECONCILE]: '数据对账',
 };
 
 // Sync status mappings